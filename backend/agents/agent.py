@@ -1,20 +1,33 @@
 import sys
+import time
 import ollama
+from collections import deque
 from langchain.agents import initialize_agent, AgentType
 from langchain.tools import Tool
-from langchain_ollama import OllamaLLM  # ✅ LangChain Ollama 지원 LLM 추가
 from langchain.prompts import PromptTemplate
 from langchain.agents.agent import AgentExecutor
+from langchain_core.callbacks import BaseCallbackHandler
 from agents.data_tool import data_tool
 from agents.rag_tool import rag_tool
 from agents.both_tool import both_tool
 from agents.unknown_tool import unknown_tool
-
-llm_context = OllamaLLM(model="mistral")  
-llm_response = OllamaLLM(model="gemma:7b")
+from agents.router import route_query
+from core.concurrency import run_blocking, async_stage_limit
+from core.config import ROUTER_ENABLED, ANSWER_CACHE_ENABLED, LLM_CONTEXT_MODEL, LLM_RESPONSE_MODEL
+from core.answer_cache import answer_cache
+from core import query_embeddings, tracing
+from core.tracing import span
+from core.context_packer import estimate_tokens
+from core.context_compressor import compress_context
+from core.registry import get_llm
+
+# ✅ LangChain Ollama LLM (LLM_BACKEND=fake면 오프라인 벤치마크용 LLM, LLM_SINGLE_MODEL이면 두 단계가 같은 모델)
+llm_context = get_llm(LLM_CONTEXT_MODEL)
+llm_response = get_llm(LLM_RESPONSE_MODEL)
 
 # ✅ 2️⃣ LangChain Tool 설정
 tools = [data_tool, rag_tool, both_tool, unknown_tool]
+tools_by_name = {tool.name: tool for tool in tools}
 
 context_agent = initialize_agent(
     tools=tools,
@@ -23,6 +36,7 @@ context_agent = initialize_agent(
     verbose=True,
     handle_parsing_errors=True,
     max_iterations=5,
+    return_intermediate_steps=True,
     allow_ask_for_clarification=False
 )
 
@@ -121,24 +135,214 @@ response_prompt = PromptTemplate(
 # ✅ 응답 생성 전용 Agent
 response_agent = response_prompt | llm_response
 
-# ✅ 두 Agent를 연결하는 함수
+# ✅ 답변 캐시의 유사 질문 조회에 질문 임베딩 캐시 사용 (라우터/RAG 검색과 같은 임베딩 재사용)
+answer_cache.embed_query = query_embeddings.embed_query
+
+# ✅ LLM 호출 횟수 / 토큰 수 집계 (요청마다 새로 만들어 callbacks로 전달)
+class TokenUsageHandler(BaseCallbackHandler):
+    """🧮 Ollama 응답의 prompt_eval_count/eval_count 기준 (없으면 글자 수로 추정)"""
+
+    run_inline = True  # 비동기 스트리밍에서도 같은 스레드에서 바로 집계
+
+    def __init__(self, model: str):
+        self.model = model
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._prompts = {}
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._prompts[run_id] = prompts
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        prompts = self._prompts.pop(run_id, [])
+        for i, generations in enumerate(response.generations):
+            for generation in generations:
+                info = generation.generation_info or {}
+                prompt_tokens = info.get("prompt_eval_count") or estimate_tokens(prompts[i] if i < len(prompts) else "")
+                completion_tokens = info.get("eval_count") or estimate_tokens(generation.text)
+                self.prompt_tokens += prompt_tokens
+                self.completion_tokens += completion_tokens
+                tracing.LLM_TOKENS.inc(prompt_tokens, model=self.model, kind="prompt")
+                tracing.LLM_TOKENS.inc(completion_tokens, model=self.model, kind="completion")
+        self.calls += 1
+
+    def totals(self) -> dict:
+        return {"llm_calls": self.calls, "prompt_tokens": self.prompt_tokens, "completion_tokens": self.completion_tokens}
+
+# ✅ 사전 라우터로 도구를 바로 실행 (신뢰도가 낮으면 None → context_agent 사용)
+def run_routed_tool(prompt: str):
+    with span("route") as attrs:
+        route = route_query(prompt)
+        attrs.update(tool=route["tool"], method=route["method"])
+    print(f"🚦 라우터 결과: {route}")
+    if not route["tool"]:
+        return route, None
+    return route, tools_by_name[route["tool"]].run(prompt)
+
+# ✅ Step 1: 문맥 수집 (사전 라우터 → 필요할 때만 context_agent)
+async def collect_context(prompt: str) -> dict:
+    route, context = None, None
+    if ROUTER_ENABLED:
+        route, context = await run_blocking("tool", run_routed_tool, prompt)
+
+    if context is not None:
+        tools_used = [route["tool"]]
+        outputs, note = [context], ""
+    else:
+        usage = TokenUsageHandler(llm_context.model)
+        with span("context_agent") as attrs:
+            context_result = await run_blocking("context", context_agent.invoke, {
+                "input": prompt,
+            }, config={"callbacks": [usage]})
+            context = context_result["output"] if isinstance(context_result, dict) and "output" in context_result else str(context_result)
+            steps = context_result.get("intermediate_steps", []) if isinstance(context_result, dict) else []
+            tools_used = [action.tool for action, _ in steps if action.tool in tools_by_name]
+            attrs.update(steps=len(steps), **usage.totals())
+        tracing.AGENT_ITERATIONS.observe(usage.calls, agent="context")
+        # 도구 관찰 결과(원문)를 압축 대상으로, 에이전트 최종 답변은 짧은 메모로
+        outputs, note = [str(observation) for action, observation in steps if action.tool in tools_by_name], context
+
+    # ✅ 응답 모델에 넘기기 전 압축 (센서 통계 + 중복 제거된 문서 발췌, 출처 파일명 유지)
+    with span("compress") as attrs:
+        context, compress_stats = compress_context(outputs, note)
+        attrs.update(tokens_in=compress_stats["tokens_in"], tokens_out=compress_stats["tokens_out"])
+    print(f"🗜️ 컨텍스트 압축: {compress_stats['tokens_in']} → {compress_stats['tokens_out']} 토큰")
+
+    print(f"📄문맥 (앞부분): {context[:500]}")
+    tracing.annotate(tools=tools_used, routed=bool(route and route["tool"]))
+    return {"context": context, "route": route, "tools": tools_used}
+
+# ✅ 답변 캐시 조회 → (캐시 항목 또는 None, 질문 임베딩)
+async def lookup_answer_cache(prompt: str):
+    if not ANSWER_CACHE_ENABLED:
+        return None, None
+    with span("answer_cache") as attrs:
+        cached, query_embedding = await run_blocking("embed", answer_cache.lookup, prompt)
+        attrs["hit"] = cached is not None
+    tracing.annotate(cached=cached is not None)
+    return cached, query_embedding
+
+# ✅ 채팅 1회 동안 질문 임베딩 인코딩/캐시 적중 횟수 집계
+def finish_embedding_tracking(counter: dict):
+    query_embeddings.finish_chat_tracking(counter)
+    print(f"🧮 질문 임베딩: 인코딩 {counter['encodes']}회 / 캐시 적중 {counter['hits']}회")
+
+# ✅ 두 Agent를 연결하는 함수 (블로킹 LLM 호출은 스레드 풀에서 실행 → 여러 채팅 동시 처리)
 async def query_dual_agent(prompt: str) -> str:
+    counter = query_embeddings.start_chat_tracking()
+    trace = tracing.start_trace("chat")
+    try:
+        return await answer_prompt(prompt)
+    finally:
+        finish_embedding_tracking(counter)
+        tracing.finish_trace(trace, embed_encodes=counter["encodes"])
+
+async def answer_prompt(prompt: str) -> str:
+    start = time.perf_counter()
+
+    # Step 0: 반복/유사 질문이면 캐시된 답변 반환
+    cached, query_embedding = await lookup_answer_cache(prompt)
+    if cached:
+        print(f"💾 답변 캐시 적중: {cached['prompt']}")
+        return cached["answer"]
+
     try:
         # Step 1: context 수집
-        context_result = context_agent.invoke({
-            "input": prompt,
-        })
-        context = context_result["output"] if isinstance(context_result, dict) and "output" in context_result else str(context_result)
-        print(f"📄문맥 (앞부분): {context[:500]}")
+        collected = await collect_context(prompt)
+        context = collected["context"]
     except Exception as e:
         return f"❌ context_agent 오류: {e}"
 
     try:
         # Step 2: 응답 생성
-        response_text = response_agent.invoke({
-            "context": context,
-            "prompt": prompt
-        })
+        usage = TokenUsageHandler(llm_response.model)
+        with span("response") as attrs:
+            response_text = await run_blocking("response", response_agent.invoke, {
+                "context": context,
+                "prompt": prompt
+            }, config={"callbacks": [usage]})
+            attrs.update(usage.totals())
+        if ANSWER_CACHE_ENABLED:
+            answer_cache.store(prompt, response_text, time.perf_counter() - start, collected["tools"], query_embedding)
         return response_text
     except Exception as e:
-        return f"❌ response_agent 오류: {e}"
\ No newline at end of file
+        return f"❌ response_agent 오류: {e}"
+
+# ✅ 스트리밍 응답 지표 (최근 요청 기준 첫 토큰까지 걸린 시간)
+recent_ttft = deque(maxlen=200)
+
+def get_streaming_stats() -> dict:
+    """⏱️ 최근 스트리밍 요청의 첫 토큰 지연(TTFT) 통계"""
+    samples = sorted(recent_ttft)
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "ttft_avg_sec": round(sum(samples) / len(samples), 3),
+        "ttft_p50_sec": round(samples[len(samples) // 2], 3),
+        "ttft_p95_sec": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+    }
+
+# ✅ 토큰 단위 스트리밍 버전 (context 단계 이벤트 → 응답 토큰 → 완료 이벤트 순서)
+async def stream_dual_agent(prompt: str, include_stages: bool = True):
+    counter = query_embeddings.start_chat_tracking()
+    trace = tracing.start_trace("chat_stream")
+    try:
+        async for event in stream_answer(prompt, include_stages):
+            yield event
+    finally:
+        finish_embedding_tracking(counter)
+        tracing.finish_trace(trace, embed_encodes=counter["encodes"])
+
+async def stream_answer(prompt: str, include_stages: bool):
+    start = time.perf_counter()
+
+    cached, query_embedding = await lookup_answer_cache(prompt)
+    if cached:
+        recent_ttft.append(time.perf_counter() - start)
+        yield {"type": "token", "text": cached["answer"]}
+        yield {"type": "done", "cached": True, "ttft_sec": round(time.perf_counter() - start, 3),
+               "total_sec": round(time.perf_counter() - start, 3)}
+        return
+
+    if include_stages:
+        yield {"type": "stage", "stage": "context", "status": "start"}
+    try:
+        collected = await collect_context(prompt)
+    except Exception as e:
+        yield {"type": "error", "message": f"❌ context_agent 오류: {e}"}
+        return
+    context = collected["context"]
+    if include_stages:
+        yield {"type": "stage", "stage": "context", "status": "done", "route": collected["route"],
+               "elapsed_sec": round(time.perf_counter() - start, 3)}
+
+    ttft = None
+    tokens = []
+    usage = TokenUsageHandler(llm_response.model)
+    try:
+        with span("response") as attrs:
+            async with async_stage_limit("response"):
+                async for token in response_agent.astream({"context": context, "prompt": prompt},
+                                                          config={"callbacks": [usage]}):
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+                        recent_ttft.append(ttft)
+                        attrs["ttft_sec"] = round(ttft, 3)
+                    tokens.append(token)
+                    yield {"type": "token", "text": token}
+            attrs.update(usage.totals())
+    except Exception as e:
+        yield {"type": "error", "message": f"❌ response_agent 오류: {e}"}
+        return
+
+    if ANSWER_CACHE_ENABLED:
+        answer_cache.store(prompt, "".join(tokens), time.perf_counter() - start, collected["tools"], query_embedding)
+
+    yield {
+        "type": "done",
+        "cached": False,
+        "ttft_sec": round(ttft, 3) if ttft is not None else None,
+        "total_sec": round(time.perf_counter() - start, 3),
+    }
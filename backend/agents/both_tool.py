@@ -1,17 +1,63 @@
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from agents.data_tool import data_tool  # 센서 데이터 Agent
 from agents.rag_tool import rag_tool  # 문서 검색 Agent
 from langchain.tools import Tool
+from core.config import BOTH_DATA_TIMEOUT, BOTH_RAG_TIMEOUT
+from core.tracing import traced
 
-# ✅ 1️⃣ BOTH 유형 분석 함수
+# ✅ 센서/문서 검색을 동시에 실행할 스레드 풀 (요청당 2개 분기)
+branch_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="both")
+
+def timed_call(func, prompt: str):
+    """ 분기 함수 실행 + 자체 소요 시간 측정 """
+    start = time.perf_counter()
+    result = func(prompt)
+    return result, time.perf_counter() - start
+
+# ✅ 1️⃣ 두 분기를 병렬 실행 (분기별 제한 시간 + 부분 결과 허용)
+def run_both_branches(prompt: str) -> dict:
+    """ 센서 데이터 검색과 문서 검색을 동시에 실행하고 분기별 결과/소요 시간 반환 """
+    branches = {
+        "sensor": (data_tool.run, BOTH_DATA_TIMEOUT),
+        "rag": (rag_tool.run, BOTH_RAG_TIMEOUT),
+    }
+    start = time.perf_counter()
+    futures = {
+        name: branch_executor.submit(contextvars.copy_context().run, timed_call, func, prompt)
+        for name, (func, _) in branches.items()
+    }
+
+    results = {}
+    for name in sorted(futures, key=lambda name: branches[name][1]):  # 제한 시간이 짧은 분기부터 확인
+        timeout = branches[name][1]
+        remaining = timeout - (time.perf_counter() - start)  # 분기별 제한 시간은 시작 시점 기준
+        try:
+            result, elapsed = futures[name].result(timeout=max(remaining, 0))
+            results[name] = {"status": "ok", "result": result, "elapsed_sec": round(elapsed, 3)}
+        except FutureTimeoutError:
+            print(f"⏱️ BOTH {name} 분기 제한 시간 초과 ({timeout}초)")
+            results[name] = {"status": "timeout", "result": None, "elapsed_sec": timeout}
+        except Exception as e:
+            print(f"❌ BOTH {name} 분기 오류: {e}")
+            results[name] = {"status": "error", "result": None, "error": str(e),
+                             "elapsed_sec": round(time.perf_counter() - start, 3)}
+
+    results["total_sec"] = round(time.perf_counter() - start, 3)
+    return results
+
+# ✅ 2️⃣ BOTH 유형 분석 함수
+@traced
 def query_both_data(prompt: str) -> str:
     """ 센서 데이터 + 문서 검색을 동시에 수행하여 결과 비교 """
-    
-    # ✅ 현재 센서 데이터 가져오기
-    sensor_data = data_tool.run(prompt)
-    
-    # ✅ 문서에서 최적 기준 검색
-    rag_data = rag_tool.run(prompt)
-    
+    branches = run_both_branches(prompt)
+    sensor, rag = branches["sensor"], branches["rag"]
+
+    # ✅ 현재 센서 데이터 / 문서에서 최적 기준 (실패한 분기는 상태만 표시)
+    sensor_data = sensor["result"] or (f"⚠️ 센서 데이터 검색 실패 ({sensor['status']})" if sensor["status"] != "ok" else "")
+    rag_data = rag["result"] or (f"⚠️ 문서 검색 실패 ({rag['status']})" if rag["status"] != "ok" else "")
+
     if not sensor_data and not rag_data:
         return "❌ 관련 데이터를 찾을 수 없습니다."
     
@@ -19,12 +65,14 @@ def query_both_data(prompt: str) -> str:
     response = "📊 [BOTH 분석 결과]\n"
     response += f"🌡️ 현재 센서 데이터:\n{sensor_data}\n\n"
     response += f"📄 문서 검색 결과:\n{rag_data}\n\n"
+    response += (f"⏱️ 처리 시간: 센서 {sensor['elapsed_sec']}초({sensor['status']}) / "
+                 f"문서 {rag['elapsed_sec']}초({rag['status']}) / 전체 {branches['total_sec']}초\n")
     
     return response
 
-# ✅ 2️⃣ LangChain 기반 BOTH Agent 정의
+# ✅ 3️⃣ LangChain 기반 BOTH Agent 정의
 both_tool = Tool(
     name="SmartFarmBOTH",
     func=query_both_data,
     description="스마트팜 센서 데이터와 문서를 동시에 검색하여 최적 상태인지 분석합니다."
-)
\ No newline at end of file
+)
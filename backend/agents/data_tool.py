@@ -1,16 +1,16 @@
-import chromadb
 import re
-import pandas as pd
+import datetime
 from langchain.tools import Tool
-from sentence_transformers import SentenceTransformer
-from data.today_data import get_today_data  # ✅ 오늘 날짜 데이터 가져오는 함수 불러오기
+from data.today_data import get_today_date, format_row
+from core.concurrency import stage_limit
+from core.registry import get_collection
+from core.query_embeddings import embed_query
+from core.config import DATA_SAMPLE_ROWS, DATA_VECTOR_TOP_K
+from core.tracing import span, traced
+from data import sensor_store
 
-# ✅ 1️⃣ ChromaDB 설정
-chroma_client = chromadb.HttpClient(host="localhost", port=8000)
-collection = chroma_client.get_or_create_collection(name="data_files")  # 센서 데이터 저장 컬렉션
-
-# ✅ 2️⃣ 임베딩 모델 (문서 검색용)
-embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+# ✅ 1️⃣ ChromaDB(data_files 컬렉션) / 2️⃣ 임베딩 모델은 core.registry 공용 인스턴스 사용
+#    (data_files는 업로드 시 bge-m3로 임베딩되므로 질문도 같은 모델로 임베딩해야 함)
 
 # ✅ 3️⃣ 사용자 질문에서 필요한 데이터 필터링
 def extract_matching_columns(prompt: str, column_names: list) -> dict:
@@ -28,52 +28,65 @@ def extract_matching_columns(prompt: str, column_names: list) -> dict:
 
     return matched_columns
 
-# ✅ 4️⃣ 데이터 필터링 기능
-def filter_growth_data(raw_data: list, prompt: str) -> list:
-    if not raw_data:
+# ✅ 4️⃣ 데이터 필터링 + 집계 (센서 저장소에서 조건에 맞는 행을 읽지 않고 SQL로 요약)
+def summarize_growth_data(prompt: str, start=None, end=None) -> list:
+    column_names = sensor_store.all_column_names()
+    if not column_names:
         return []
 
-    processed_data = [dict(entry.split(": ") for entry in doc.split(", ")) for doc in raw_data]
-    df = pd.DataFrame(processed_data)
-    column_names = df.columns.tolist()
-
     matching_filters = extract_matching_columns(prompt, column_names)
     print(f"🔍 필터링 조건: {matching_filters}")
 
-    for col, value in matching_filters.items():
-        if col in df.columns and value is not None:
-            df = df[df[col].astype(str) == value]
-
-    for col, value in matching_filters.items():
-        if col in df.columns and value is None:
-            df = df[df[col].notna()]
-
-    if df.empty:
-        return processed_data
-
-    return df.to_dict(orient="records")
-
-# ✅ 5️⃣ ChromaDB에서 데이터 검색
+    with span("sensor_summary", filters=len(matching_filters)):
+        summaries = sensor_store.summarize(matching_filters, DATA_SAMPLE_ROWS, start, end)
+        if not summaries and matching_filters:
+            return sensor_store.summarize({}, DATA_SAMPLE_ROWS, start, end)  # 조건에 맞는 행이 없으면 전체 데이터 기준
+
+    return summaries
+
+def format_summary(summary: dict) -> str:
+    """테이블 요약 → 에이전트에 넘길 짧은 텍스트 (센서별 한 줄 + 최근 행 몇 개)"""
+    period = f" ({summary['first']} ~ {summary['last']})" if summary["first"] else ""
+    lines = [f"📄 {summary['filename']}: 조건에 맞는 {summary['rows']}행{period}"]
+    for col, stat in summary["sensors"].items():
+        lines.append(f"- {col}: 최소 {stat['min']}, 최대 {stat['max']}, 평균 {stat['mean']}, 최신 {stat['latest']}")
+    if summary["recent"]:
+        lines.append(f"최근 {len(summary['recent'])}행:")
+        lines.extend(f"  {format_row(row)}" for row in summary["recent"])
+    return "\n".join(lines)
+
+def format_rows(filename: str, rows: list) -> str:
+    """벡터 검색으로 찾은 원본 행 → 파일명 + 행 목록 (응답 전에 core.context_compressor가 통계로 요약)"""
+    return "\n".join([f"📄 {filename}: 관련 행 {len(rows)}개"] + [f"  {row}" for row in rows])
+
+# ✅ 5️⃣ 센서 데이터 검색 (센서 저장소 요약 → 없으면 ChromaDB 벡터 검색 상위 몇 개)
+@traced
 def search_growth_data_in_chromadb(prompt: str) -> list:
     try:
-        # ✅ "오늘", "현재", "지금"이 포함된 질문이면 today_data.py 사용
+        # ✅ "오늘", "현재", "지금"이 포함된 질문이면 오늘 날짜 범위만 집계
         if any(keyword in prompt for keyword in ["오늘", "현재", "지금"]):
             print("📅 오늘 날짜 데이터 검색 실행")
-            return get_today_data()
-        
-        raw_data = collection.get()["documents"]
-
-        # ✅ 일반적인 데이터 검색
-        filtered_data = filter_growth_data(raw_data, prompt)
-
-        if filtered_data and len(filtered_data) < 1000:
-            return filtered_data
-
-        query_embedding = embedding_model.encode(prompt).tolist()
-        results = collection.query(query_embeddings=[query_embedding], n_results=500)
+            start = datetime.date.fromisoformat(get_today_date())
+            summaries = summarize_growth_data(prompt, start, start + datetime.timedelta(days=1))
+            return [format_summary(summary) for summary in summaries] or ["❌ 오늘 날짜 데이터가 없습니다."]
+
+        # ✅ 일반적인 데이터 검색 (센서 저장소 조건 조회 + 집계)
+        summaries = summarize_growth_data(prompt)
+        if summaries:
+            return [format_summary(summary) for summary in summaries]
+
+        # ✅ 센서 저장소에 없는 데이터 (숫자 테이블이 아닌 파일 등) → 가까운 행만 (파일별로 묶어 출처 유지)
+        query_embedding = embed_query(prompt)
+        with stage_limit("chroma"), span("chroma_query"):
+            results = get_collection("data_files").query(query_embeddings=[query_embedding], n_results=DATA_VECTOR_TOP_K,
+                                                         include=["documents", "metadatas"])
         retrieved_docs = results.get("documents", [[]])[0]
+        metadatas = (results.get("metadatas") or [[]])[0] or [{}] * len(retrieved_docs)
 
-        return retrieved_docs if retrieved_docs else []
+        rows_by_file = {}
+        for doc, meta in zip(retrieved_docs, metadatas):
+            rows_by_file.setdefault((meta or {}).get("filename", "알 수 없는 파일"), []).append(doc)
+        return [format_rows(filename, rows) for filename, rows in rows_by_file.items()]
     except Exception as e:
         print(f"❌ ChromaDB 데이터 검색 오류: {e}")
         return []
@@ -81,7 +94,7 @@ def search_growth_data_in_chromadb(prompt: str) -> list:
 # ✅ 6️⃣ LangChain 기반 Data Agent 생성
 def query_smartfarm_data(prompt: str) -> str:
     results = search_growth_data_in_chromadb(prompt)
-    context = f"📊 검색된 데이터:\n{results}" if results else "❌ 관련 데이터를 찾을 수 없습니다."
+    context = "📊 검색된 데이터:\n" + "\n".join(results) if results else "❌ 관련 데이터를 찾을 수 없습니다."
     return context
 
 data_tool = Tool(
@@ -1,104 +1,168 @@
-import chromadb
 import numpy as np
 import re
-from googlesearch import search
-import requests
-from bs4 import BeautifulSoup
-from langchain.embeddings import HuggingFaceEmbeddings
+import threading
 from sklearn.metrics.pairwise import cosine_similarity
 from langchain.tools import Tool
+from core.concurrency import stage_limit
+from core.registry import get_collection
+from core.query_embeddings import embed_query
+from core.config import RAG_HYBRID, RAG_RRF_K, RAG_CONTEXT_TOKENS, WEB_SEARCH_RESULTS
+from core.context_packer import pack_passages, estimate_tokens
+from core import reranker
+from core.tracing import span, traced
+from data import lexical_index
+from agents.web_search import web_searcher
+
+# ✅ 1️⃣ ChromaDB 컬렉션 / 2️⃣ 임베딩 모델은 core.registry에서 처음 사용할 때 로드
+
+# ✅ 컨텍스트 크기 통계 (요청당 문서 컨텍스트 토큰 수, 재정렬/예산 적용 전후)
+rag_stats = {"requests": 0, "tokens_in": 0, "tokens_out": 0, "passages_in": 0, "passages_out": 0}
+_stats_lock = threading.Lock()
+
+# ✅ 3️⃣ ChromaDB(벡터) + BM25(키워드) 하이브리드 문서 검색
+def vector_candidates(query: str, n_results: int) -> list:
+    """🧭 벡터 검색 후보 → [(id, 문서, 유사도, 파일명)] 유사도 내림차순"""
+    query_embedding = embed_query(query)  # 이미 정규화됨 (같은 질문은 캐시 사용)
+    with stage_limit("chroma"), span("chroma_query"):
+        results = get_collection("documents").query(
+            query_embeddings=[query_embedding],
+            n_results=n_results,
+            include=["documents", "metadatas", "distances"]
+        )
+
+    candidates = []
+    for doc_id, doc, dist, meta in zip(results.get("ids", [[]])[0], results.get("documents", [[]])[0],
+                                       results.get("distances", [[]])[0], results.get("metadatas", [[]])[0]):
+        candidates.append((doc_id, doc, 1 - dist, meta["filename"]))  # cosine distance → similarity
+    return sorted(candidates, key=lambda x: x[2], reverse=True)
+
+def lexical_candidates(query: str, n_results: int, known: dict) -> list:
+    """🔤 BM25 후보 → [(id, 문서, 유사도 또는 None, 파일명)] BM25 점수 내림차순"""
+    with span("bm25"):
+        hits = lexical_index.search(query, top_k=n_results)
+    missing = [doc_id for doc_id, _ in hits if doc_id not in known]
+    if missing:  # 벡터 검색에 없던 문서는 본문만 추가로 가져옴
+        with stage_limit("chroma"), span("chroma_get"):
+            fetched = get_collection("documents").get(ids=missing, include=["documents", "metadatas"])
+        for doc_id, doc, meta in zip(fetched["ids"], fetched["documents"], fetched["metadatas"]):
+            known[doc_id] = (doc_id, doc, None, meta["filename"])
+    return [known[doc_id] for doc_id, _ in hits if doc_id in known]
+
+def select_vector_only(query: str, candidates: list, top_k_final: int, threshold: float) -> list:
+    """기존 방식: 유사도 threshold + 상위 후보 내 키워드 보조 필터"""
+    filtered_docs = [c for c in candidates if c[2] >= threshold]
 
-# ✅ 1️⃣ ChromaDB 클라이언트 설정
-chroma_client = chromadb.HttpClient(host="localhost", port=8000)
-collection = chroma_client.get_or_create_collection(name="documents")
-
-# ✅ 2️⃣ 임베딩 모델 (문서 검색용)
-embedding_model = HuggingFaceEmbeddings(
-    model_name="BAAI/bge-m3",
-    encode_kwargs={"normalize_embeddings": True}
-)
-
-# ✅ 3️⃣ ChromaDB에서 유사 문서 검색
-def search_rag_data(query: str, top_k_final: int = 20, threshold: float = 0.5, min_docs: int = 3):
-    """ 🔍 개선된 RAG 문서 검색: cosine 유사도 기반 + 보조 필터 + 최소 확보 """
-
-    # ✅ 1. cosine similarity 기반 임베딩 생성
-    query_embedding = embedding_model.embed_query(query)  # 이미 정규화됨
-    results = collection.query(
-        query_embeddings=[query_embedding],
-        n_results=top_k_final * 2,  # 후보 넉넉히 확보
-        include=["documents", "metadatas", "distances"]
-    )
-
-    retrieved_docs = results.get("documents", [[]])[0]
-    retrieved_scores = results.get("distances", [[]])[0]
-    retrieved_metadata = results.get("metadatas", [[]])[0]
-
-    if not retrieved_docs:
-        print("❌ No documents retrieved.")
-        return "❌ 관련 문서를 찾을 수 없습니다."
-
-    # ✅ 2. cosine 유사도 계산 (score는 distance가 아니라 similarity)
-    all_docs = []
-    for doc, dist, meta in zip(retrieved_docs, retrieved_scores, retrieved_metadata):
-        similarity = 1 - dist  # cosine distance → similarity
-        all_docs.append((doc, similarity, meta["filename"]))
-
-    # ✅ 3. threshold 필터 및 유사도 정렬
-    sorted_docs = sorted(all_docs, key=lambda x: x[1], reverse=True)
-    filtered_docs = [(doc, sim, meta) for doc, sim, meta in sorted_docs if sim >= threshold]
-
-    # ✅ 4. 키워드 보조 필터 (보완용)
     keywords = [kw for kw in re.findall(r"\b\w{2,}\b", query)]
-    seen_meta = set(meta for _, _, meta in filtered_docs)
-
-    for doc, sim, meta in sorted_docs:
+    seen_meta = set(c[3] for c in filtered_docs)
+    for c in candidates:
         if len(filtered_docs) >= top_k_final:
             break
-        if meta not in seen_meta and any(kw.lower() in doc.lower() for kw in keywords):
-            print(f"📌 키워드 기반 보조 포함: {meta}")
-            filtered_docs.append((doc, sim, meta))
-            seen_meta.add(meta)
-
-    # ✅ 5. 최소 확보 보장
-    for doc, sim, meta in sorted_docs:
+        if c[3] not in seen_meta and any(kw.lower() in c[1].lower() for kw in keywords):
+            print(f"📌 키워드 기반 보조 포함: {c[3]}")
+            filtered_docs.append(c)
+            seen_meta.add(c[3])
+    return filtered_docs
+
+def select_hybrid(query: str, candidates: list, top_k_final: int, threshold: float) -> list:
+    """RRF 결합: threshold를 넘은 벡터 결과와 BM25 결과의 순위를 합산 (rrf_score = Σ 1/(k + 순위))"""
+    known = {c[0]: c for c in candidates}
+    vector_ranked = [c for c in candidates if c[2] >= threshold]
+    lexical_ranked = lexical_candidates(query, top_k_final * 2, known)
+
+    scores = {}
+    for ranked in (vector_ranked, lexical_ranked):
+        for rank, c in enumerate(ranked, start=1):
+            scores[c[0]] = scores.get(c[0], 0.0) + 1 / (RAG_RRF_K + rank)
+
+    fused = sorted(scores, key=scores.get, reverse=True)[:top_k_final]
+    return [known[doc_id] for doc_id in fused]
+
+def retrieve_documents(query: str, top_k_final: int = 20, threshold: float = 0.5, min_docs: int = 3,
+                       hybrid: bool = RAG_HYBRID, fill_empty: bool = True) -> list:
+    """📚 검색된 문서 조각 목록 [(id, 문서, 유사도, 파일명)] (hybrid=False면 벡터 검색만 사용, 컬렉션이 비었으면 None)
+
+    fill_empty=False면 threshold/키워드를 통과한 후보가 하나도 없을 때 min_docs를 채우지 않고 빈 목록 (웹 검색 폴백용)
+    """
+    candidates = vector_candidates(query, top_k_final * 2)  # 후보 넉넉히 확보
+    if not candidates:
+        return None
+    if hybrid:
+        try:
+            filtered_docs = select_hybrid(query, candidates, top_k_final, threshold)
+        except Exception as e:
+            print(f"❌ BM25 검색 오류 (벡터 검색만 사용): {e}")
+            filtered_docs = select_vector_only(query, candidates, top_k_final, threshold)
+    else:
+        filtered_docs = select_vector_only(query, candidates, top_k_final, threshold)
+
+    if not filtered_docs and not fill_empty:
+        return []
+
+    # ✅ 최소 확보 보장
+    seen_meta = set(c[3] for c in filtered_docs)
+    for c in candidates:
         if len(filtered_docs) >= min_docs:
             break
-        if meta not in seen_meta:
-            filtered_docs.append((doc, sim, meta))
-            seen_meta.add(meta)
+        if c[3] not in seen_meta:
+            filtered_docs.append(c)
+            seen_meta.add(c[3])
+    return filtered_docs
+
+def build_rag_context(query: str, passages: list, token_budget: int = RAG_CONTEXT_TOKENS) -> str:
+    """📦 재정렬 → 중복/겹침 제거 → 토큰 예산 안에서 "📄 문서: 파일명" 블록 구성 (예산 0이면 검색 결과 그대로)"""
+    if token_budget <= 0:
+        sections = [(meta, doc) for _, doc, _, meta in passages]
+        tokens = sum(estimate_tokens(doc) for _, doc in sections)
+        stats = {"passages_in": len(passages), "passages_out": len(passages), "tokens_in": tokens, "tokens_out": tokens}
+    else:
+        with span("rerank", passages=len(passages)):
+            ranked = reranker.rerank(query, passages)
+        sections, stats = pack_passages(ranked, token_budget)
+        stats["passages_in"] = len(passages)  # 재정렬 전 기준
+        stats["tokens_in"] = sum(estimate_tokens(doc) for _, doc, _, _ in passages)
+
+    with _stats_lock:
+        rag_stats["requests"] += 1
+        for key in ("tokens_in", "tokens_out", "passages_in", "passages_out"):
+            rag_stats[key] += stats[key]
+
+    return "\n\n".join([f"📄 문서: {meta}\n{doc}" for meta, doc in sections])
+
+@traced
+def search_rag_data(query: str, top_k_final: int = 20, threshold: float = 0.5, min_docs: int = 3):
+    """ 🔍 RAG 문서 검색: 벡터 유사도 + BM25 키워드 검색(RRF 결합) + 최소 확보 → 재정렬/토큰 예산 적용 (관련 문서가 없으면 웹 검색) """
+    filtered_docs = retrieve_documents(query, top_k_final, threshold, min_docs, fill_empty=False)
 
-    if not filtered_docs:
+    if filtered_docs is None:
+        print("❌ No documents retrieved.")
+        return "❌ 관련 문서를 찾을 수 없습니다."
+    if not filtered_docs:  # 관련 있는 문서 조각이 하나도 없음 → 웹 검색
+        print("🌍 관련 문서 없음 → 웹 검색")
         return search_web(query)
 
-    # ✅ 6. 출력 정리
-    formatted_docs = "\n\n".join([f"📄 문서: {meta}\n{doc}" for doc, _, meta in filtered_docs])
+    # ✅ 출력 정리
+    formatted_docs = build_rag_context(query, filtered_docs)
     return f"📚 검색된 문서 데이터:\n{formatted_docs}"
 
-# ✅ 4️⃣ Google 검색 실행
-def search_web(query: str, num_results=2):
-    """ Google 검색을 수행하여 관련 웹 페이지 링크 가져오기 """
-    try:
-        search_results = list(search(query, num_results=num_results, lang="ko"))
-        if search_results:
-            return extract_text_from_url(search_results[0])  # ✅ 첫 번째 웹페이지 크롤링 후 반환
-        return "❌ 웹 검색 결과가 없습니다."
-    except Exception as e:
-        return f"❌ Google 검색 중 오류 발생: {e}"
-
-# ✅ 5️⃣ 웹페이지 크롤링 기능
-def extract_text_from_url(url: str):
-    """ 웹페이지 주요 텍스트 크롤링 """
-    try:
-        response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-        soup = BeautifulSoup(response.text, "html.parser")
-        paragraphs = soup.find_all("p")
-        extracted_text = " ".join([p.get_text() for p in paragraphs])
-        return f"🌍 [출처: {url}]\n" + extracted_text[:5000]  
-    except Exception as e:
-        return f"❌ {url} 크롤링 중 오류 발생: {e}"
-
-# ✅ 6️⃣ LangChain 기반 RAG Agent 정의
+def get_rag_stats() -> dict:
+    """📈 요청당 평균 문서 컨텍스트 토큰 수 (재정렬/예산 적용 전 → 후) 및 재정렬/웹 검색 통계"""
+    with _stats_lock:
+        stats = dict(rag_stats)
+    requests = stats["requests"]
+    for key in ("tokens_in", "tokens_out", "passages_in", "passages_out"):
+        stats[f"avg_{key}"] = round(stats.pop(key) / requests, 1) if requests else 0.0
+    stats["token_budget"] = RAG_CONTEXT_TOKENS
+    stats["reranker"] = reranker.get_stats()
+    stats["web_search"] = web_searcher.get_stats()
+    return stats
+
+# ✅ 4️⃣ Google 검색 실행 (제한 시간 + 디스크 캐시 + 차단기, agents.web_search)
+@traced
+def search_web(query: str, num_results=WEB_SEARCH_RESULTS):
+    """ Google 검색 후 후보 웹페이지를 동시에 가져와 가장 순위가 높은 페이지 본문 반환 """
+    return web_searcher.search(query, num_results)
+
+# ✅ 5️⃣ LangChain 기반 RAG Agent 정의
 rag_tool = Tool(
     name="SmartFarmRAG",
     func=search_rag_data,
@@ -0,0 +1,126 @@
+import re
+import time
+import threading
+import numpy as np
+from core.config import ROUTER_MIN_CONFIDENCE
+from core.registry import get_embedding_model
+from core.query_embeddings import embed_query
+
+# ✅ 도구 이름 (context_agent의 도구와 동일)
+DATA, RAG, BOTH, UNKNOWN = "SmartFarmData", "SmartFarmRAG", "SmartFarmBOTH", "SmartFarmUnknown"
+
+# ✅ 1️⃣ 키워드 규칙 (prompt_template의 도구 선택 규칙과 동일한 기준)
+TIME_KEYWORDS = ["오늘", "현재", "지금", "실시간"]
+SENSOR_KEYWORDS = ["온도", "습도", "CO2", "CO₂", "이산화탄소", "조도", "일사량", "토양 수분", "토양수분", "수분", "센서", "EC", "pH"]
+AGRI_KEYWORDS = ["품종", "병해충", "해충", "병해", "재배", "비료", "생장", "생육", "수확", "파종", "육묘", "정식",
+                 "작물", "딸기", "고추", "토마토", "상추", "오이", "파프리카", "농업", "농사"]
+COMPARE_KEYWORDS = ["적절", "적합", "적당", "괜찮", "최적", "알맞", "맞아", "비교"]
+MEASURE_KEYWORDS = ["데이터", "측정", "기록", "수치", "값", "몇", "얼마"]  # 시점 없이도 센서 값 조회로 볼 수 있는 표현
+
+# ✅ 2️⃣ 임베딩 분류기용 예시 질문
+EXAMPLE_QUERIES = {
+    RAG: [
+        "딸기 품종 알려줘", "고추 병해충은 뭐가 있어?", "토마토 재배 방법 알려줘", "상추는 언제 파종해?",
+        "오이 흰가루병 방제 방법", "파프리카 비료 주는 시기", "딸기 잿빛곰팡이병 증상", "토마토 적정 생육 온도는?",
+    ],
+    DATA: [
+        "오늘 온도 알려줘", "현재 습도는 몇이야?", "지금 CO2 농도 보여줘", "오늘 조도 데이터 알려줘",
+        "현재 토양 수분 상태", "지금 센서 값 알려줘", "온실 온도 25도인 데이터 보여줘", "오늘 측정된 데이터 보여줘",
+    ],
+    BOTH: [
+        "지금 온도가 토마토 생장에 적절해?", "현재 습도가 딸기 재배에 괜찮아?", "오늘 CO2 농도가 고추에 적합해?",
+        "지금 조도가 상추 생육에 충분해?", "현재 토양 수분이 오이 재배 기준에 맞아?",
+    ],
+    UNKNOWN: [
+        "GPT는 뇌가 있나요?", "내일 뭐 할까?", "안녕하세요", "오늘 점심 뭐 먹지?", "너는 누구야?", "재미있는 이야기 해줘",
+    ],
+}
+EMBED_TEMPERATURE = 0.05  # 유사도 → 확률 변환 시 온도 (작을수록 확신이 강해짐)
+
+_example_lock = threading.Lock()
+_example_embeddings = {}  # 도구 이름 → (예시 수, 임베딩 차원) 배열
+
+# ✅ 라우터 통계 (적중률, 지연 시간)
+router_stats = {"total": 0, "keyword": 0, "embedding": 0, "fallback": 0, "latency_ms_total": 0.0}
+_stats_lock = threading.Lock()
+
+
+def keyword_route(prompt: str):
+    """🔑 키워드 규칙으로 도구 선택 → (도구, 신뢰도) 또는 (None, 0.0)"""
+    has_time = any(k in prompt for k in TIME_KEYWORDS)
+    has_sensor = any(k in prompt for k in SENSOR_KEYWORDS)
+    has_agri = any(k in prompt for k in AGRI_KEYWORDS)
+    has_compare = any(k in prompt for k in COMPARE_KEYWORDS)
+    has_measure = any(k in prompt for k in MEASURE_KEYWORDS) or bool(re.search(r"(?<![A-Za-z])\d", prompt))  # 숫자/날짜 포함 (CO2의 2 제외)
+
+    if (has_time or has_sensor) and has_agri and has_compare:
+        return BOTH, 0.9 if has_time else 0.6  # 시점 없는 "토마토 적정 온도"는 지식 질문일 수 있음
+    if has_time and has_sensor:
+        return DATA, 0.95
+    if has_agri and not has_time and not has_sensor:
+        return RAG, 0.9
+    if has_sensor and has_agri:
+        return RAG, 0.6
+    if has_sensor and has_measure:
+        return DATA, 0.8
+    if has_sensor:  # "온도 관리 방법은?", "딸기 수분(受粉) 방법" 같은 지식 질문일 수 있음
+        return DATA, 0.5
+    return None, 0.0
+
+
+def _load_example_embeddings() -> dict:
+    with _example_lock:
+        if not _example_embeddings:
+            for tool_name, examples in EXAMPLE_QUERIES.items():
+                _example_embeddings[tool_name] = np.array(get_embedding_model().embed_documents(examples))
+    return _example_embeddings
+
+
+def embedding_route(prompt: str):
+    """🧭 예시 질문과의 코사인 유사도로 도구 선택 → (도구, 신뢰도)"""
+    examples = _load_example_embeddings()
+    query = np.array(embed_query(prompt))  # 정규화된 임베딩 → 내적 = 코사인 유사도
+
+    tool_names = list(examples)
+    best_scores = np.array([float(np.max(examples[name] @ query)) for name in tool_names])
+    probs = np.exp((best_scores - best_scores.max()) / EMBED_TEMPERATURE)
+    probs /= probs.sum()
+
+    best = int(np.argmax(probs))
+    return tool_names[best], float(probs[best])
+
+
+def route_query(prompt: str, min_confidence: float = ROUTER_MIN_CONFIDENCE) -> dict:
+    """🚦 키워드 규칙 → 임베딩 분류기 순서로 도구 선택. 신뢰도가 낮으면 tool=None (LLM 에이전트로 폴백)"""
+    start = time.perf_counter()
+
+    tool_name, confidence = keyword_route(prompt)
+    method = "keyword"
+    if confidence < min_confidence:
+        try:
+            tool_name, confidence = embedding_route(prompt)
+            method = "embedding"
+        except Exception as e:
+            print(f"❌ 임베딩 라우터 오류: {e}")
+            tool_name, confidence = None, 0.0
+
+    if confidence < min_confidence:
+        tool_name, method = None, "fallback"
+
+    latency_ms = (time.perf_counter() - start) * 1000
+    with _stats_lock:
+        router_stats["total"] += 1
+        router_stats[method] += 1
+        router_stats["latency_ms_total"] += latency_ms
+
+    return {"tool": tool_name, "confidence": round(confidence, 3), "method": method, "latency_ms": round(latency_ms, 2)}
+
+
+def get_router_stats() -> dict:
+    """📈 라우터 적중률(에이전트 호출 생략 비율) 및 평균 지연 시간"""
+    with _stats_lock:
+        stats = dict(router_stats)
+    total = stats["total"]
+    stats["hit_rate"] = round((stats["keyword"] + stats["embedding"]) / total, 3) if total else 0.0
+    stats["avg_latency_ms"] = round(stats.pop("latency_ms_total") / total, 2) if total else 0.0
+    return stats
@@ -0,0 +1,340 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import threading
+import concurrent.futures
+from urllib.parse import unquote, urlsplit
+import httpx
+from bs4 import BeautifulSoup, SoupStrainer
+from googlesearch.user_agents import get_useragent
+from core.answer_cache import normalize_prompt
+from core.config import (STORAGE_DIR, WEB_SEARCH_URL, WEB_SEARCH_RESULTS, WEB_CONNECT_TIMEOUT, WEB_FETCH_TIMEOUT,
+                         WEB_SEARCH_DEADLINE, WEB_MAX_BYTES, WEB_TEXT_CHARS, WEB_MAX_CONNECTIONS, WEB_CACHE_TTL,
+                         WEB_BREAKER_FAILURES, WEB_BREAKER_COOLDOWN)
+
+# ✅ 웹 검색 폴백 (문서 검색 결과가 없을 때 SmartFarmRAG가 사용)
+#    - 전용 이벤트 루프 스레드의 공용 httpx.AsyncClient (연결 재사용) → 후보 페이지를 동시에 가져옴
+#    - 검색/페이지 요청마다 WEB_FETCH_TIMEOUT, 전체 WEB_SEARCH_DEADLINE 제한 → 느린 사이트가 채팅 워커를 붙잡지 않음
+#    - 페이지는 WEB_MAX_BYTES까지만 받고 <p> 태그만 파싱, 본문 WEB_TEXT_CHARS자에서 중단
+#    - 검색 결과(질문 → URL 목록)와 페이지 본문(URL → 텍스트)을 SQLite에 TTL 캐시 (서버 재시작 후에도 유지)
+#    - 검색 엔진/사이트별 차단기: 연속 실패가 쌓이면 잠시 호출하지 않고 바로 실패 응답
+WEB_CACHE_DB_PATH = os.path.join(STORAGE_DIR, "web_cache.db")
+SEARCH_COOKIES = {"CONSENT": "PENDING+987", "SOCS": "CAESHAgBEhIaAB"}  # googlesearch와 같은 동의 페이지 우회 쿠키
+
+try:
+    import lxml  # noqa: F401  (있으면 html.parser보다 빠른 파서 사용)
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+# ✅ 1️⃣ 디스크 캐시 (searches: 정규화된 질문 → URL 목록, pages: URL → 본문)
+def get_connection() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(WEB_CACHE_DB_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(WEB_CACHE_DB_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for table in ("searches", "pages"):
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, fetched_at REAL NOT NULL)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_fetched ON {table} (fetched_at)")
+        _local.conn = conn
+    return conn
+
+
+def cache_get(table: str, key: str):
+    """TTL 안의 캐시 값 (없거나 만료되면 None)"""
+    row = get_connection().execute(f"SELECT value FROM {table} WHERE key = ? AND fetched_at >= ?",
+                                   (key, time.time() - WEB_CACHE_TTL)).fetchone()
+    return row[0] if row else None
+
+
+def cache_put(table: str, key: str, value: str):
+    now = time.time()
+    with _write_lock:
+        conn = get_connection()
+        conn.execute(f"INSERT OR REPLACE INTO {table} (key, value, fetched_at) VALUES (?, ?, ?)", (key, value, now))
+        conn.execute(f"DELETE FROM {table} WHERE fetched_at < ?", (now - WEB_CACHE_TTL,))  # 만료 항목 정리
+        conn.commit()
+
+
+# ✅ 2️⃣ 차단기
+class CircuitBreaker:
+    """🔌 연속 실패가 failures번 쌓이면 cooldown 동안 호출 차단 → 이후 1건만 시험 호출 (성공하면 복구, 실패하면 다시 차단)"""
+
+    def __init__(self, failures: int = WEB_BREAKER_FAILURES, cooldown: float = WEB_BREAKER_COOLDOWN):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.consecutive = 0
+        self.opened_at = None
+        self.trial = False  # 시험 호출 진행 중
+        self.trips = 0
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.trial = True
+            return True
+
+    def record(self, ok: bool):
+        with self.lock:
+            if ok:
+                self.consecutive, self.opened_at, self.trial = 0, None, False
+                return
+            self.consecutive += 1
+            if self.trial or (self.opened_at is None and self.consecutive >= self.failures):
+                self.opened_at, self.trial = time.monotonic(), False
+                self.trips += 1
+
+    def release(self):
+        """결과 없이 끝난 호출 (취소 등) → 시험 호출 자리만 반납 (다음 호출이 다시 시험)"""
+        with self.lock:
+            self.trial = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+
+# ✅ 3️⃣ HTML 파싱 (CPU 작업 → 이벤트 루프 밖 스레드에서 실행)
+def parse_search_results(html: str, num_results: int) -> list:
+    """검색 결과 페이지 → URL 목록 (Google 결과 블록이 없으면 페이지의 모든 외부 링크)"""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    links = [block.find("a", href=True) for block in soup.find_all("div", class_="ezO2md")] or soup.find_all("a", href=True)
+    search_host = urlsplit(WEB_SEARCH_URL).hostname
+    urls = []
+    for link in links:
+        href = link["href"] if link else ""
+        if href.startswith("/url?q="):  # Google 리다이렉트 링크
+            href = unquote(href[len("/url?q="):].split("&")[0])
+        if href.startswith(("http://", "https://")) and urlsplit(href).hostname != search_host and href not in urls:
+            urls.append(href)
+        if len(urls) >= num_results:
+            break
+    return urls
+
+
+def extract_paragraphs(body: bytes, encoding: str = None, max_chars: int = WEB_TEXT_CHARS) -> str:
+    """<p> 태그 본문만 파싱 (max_chars를 채우면 중단)"""
+    soup = BeautifulSoup(body, HTML_PARSER, parse_only=SoupStrainer("p"), from_encoding=encoding)
+    parts, size = [], 0
+    for paragraph in soup.find_all("p"):
+        text = paragraph.get_text()
+        parts.append(text)
+        size += len(text) + 1
+        if size >= max_chars:
+            break
+    return " ".join(parts)[:max_chars]
+
+
+def describe_error(e: Exception) -> str:
+    """한 줄 오류 설명 (시간 초과 예외는 메시지가 비어 있음)"""
+    message = str(e).splitlines()[0] if str(e) else ""
+    return f"{type(e).__name__}: {message}" if message else type(e).__name__
+
+
+# ✅ 4️⃣ 비동기 검색/수집
+class WebSearcher:
+    """🌍 제한 시간/캐시/차단기가 적용된 웹 검색 (동기 코드에서는 search(), 이벤트 루프에서는 asearch())"""
+
+    def __init__(self):
+        self.loop = None
+        self.client = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self.search_breaker = CircuitBreaker()
+        self.host_breakers = {}  # 사이트(host)별 차단기
+        self.stats = {"searches": 0, "search_cache_hits": 0, "page_cache_hits": 0, "fetches": 0, "fetch_errors": 0,
+                      "search_errors": 0, "timeouts": 0, "breaker_rejections": 0, "no_result": 0, "total_sec": 0.0}
+
+    # ✅ 전용 이벤트 루프 (처음 사용할 때 시작, 공용 클라이언트는 이 루프에 묶임)
+    def _ensure_loop(self):
+        with self.lock:
+            if self.loop is None:
+                loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(target=loop.run_forever, name="web-search", daemon=True)
+                self.thread.start()
+                self.loop = loop
+            return self.loop
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                timeout=httpx.Timeout(WEB_FETCH_TIMEOUT, connect=WEB_CONNECT_TIMEOUT),
+                limits=httpx.Limits(max_connections=WEB_MAX_CONNECTIONS, max_keepalive_connections=WEB_MAX_CONNECTIONS),
+                headers={"User-Agent": "Mozilla/5.0"}, cookies=SEARCH_COOKIES, follow_redirects=True, max_redirects=5,
+            )
+        return self.client
+
+    def search(self, query: str, num_results: int = WEB_SEARCH_RESULTS) -> str:
+        """🔍 워커 스레드용: 전용 루프에서 asearch 실행 (WEB_SEARCH_DEADLINE 안에 반드시 반환)"""
+        future = asyncio.run_coroutine_threadsafe(self.asearch(query, num_results), self._ensure_loop())
+        try:
+            return future.result(timeout=WEB_SEARCH_DEADLINE + 1)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            self._count("timeouts")
+            return "❌ 웹 검색 시간이 초과되었습니다."
+
+    async def asearch(self, query: str, num_results: int = WEB_SEARCH_RESULTS) -> str:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + WEB_SEARCH_DEADLINE
+        try:
+            urls = await self._search_urls(query, num_results, deadline)
+            if isinstance(urls, str):  # 오류 메시지
+                return urls
+            if not urls:
+                self._count("no_result")
+                return "❌ 웹 검색 결과가 없습니다."
+            url, text = await self._first_page(urls, deadline)
+            if url is None:
+                self._count("no_result")
+                return "❌ 검색된 웹페이지를 제한 시간 안에 가져오지 못했습니다."
+            return f"🌍 [출처: {url}]\n" + text
+        finally:
+            with self.lock:
+                self.stats["searches"] += 1
+                self.stats["total_sec"] += loop.time() - start
+
+    async def _search_urls(self, query: str, num_results: int, deadline: float):
+        key = f"{num_results}:{normalize_prompt(query)}"
+        cached = cache_get("searches", key)
+        if cached is not None:
+            self._count("search_cache_hits")
+            return json.loads(cached)
+        if not self.search_breaker.allow():
+            self._count("breaker_rejections")
+            return "❌ 웹 검색 실패가 반복되어 잠시 사용하지 않습니다."
+
+        timeout = max(0.0, min(WEB_FETCH_TIMEOUT, deadline - asyncio.get_running_loop().time()))
+        try:
+            response = await asyncio.wait_for(self._get_client().get(
+                WEB_SEARCH_URL, params={"q": query, "num": num_results + 2, "hl": "ko"},
+                headers={"User-Agent": get_useragent(), "Accept": "*/*"}), timeout)
+            response.raise_for_status()
+            urls = await asyncio.to_thread(parse_search_results, response.text, num_results)
+        except asyncio.CancelledError:  # 전체 제한 시간 초과 → 성공/실패 없이 시험 호출만 반납
+            self.search_breaker.release()
+            raise
+        except Exception as e:
+            self.search_breaker.record(False)
+            self._count("timeouts" if isinstance(e, (asyncio.TimeoutError, httpx.TimeoutException)) else "search_errors")
+            return f"❌ Google 검색 중 오류 발생: {describe_error(e)}"
+        self.search_breaker.record(True)
+        cache_put("searches", key, json.dumps(urls))
+        return urls
+
+    async def _first_page(self, urls: list, deadline: float) -> tuple:
+        """후보 페이지를 동시에 가져와 검색 순위가 가장 높은, 본문이 있는 페이지 반환 (나머지는 취소)"""
+        loop = asyncio.get_running_loop()
+        tasks = [asyncio.create_task(self._page_text(url)) for url in urls]
+        try:
+            for url, task in zip(urls, tasks):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    self._count("timeouts")
+                    break
+                try:
+                    text = await asyncio.wait_for(task, remaining)
+                except asyncio.TimeoutError:
+                    self._count("timeouts")
+                    break
+                if text:
+                    return url, text
+            return None, None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _page_text(self, url: str) -> str:
+        """페이지 본문 (캐시 → 사이트 차단기 → 다운로드, 실패하면 빈 문자열)"""
+        cached = cache_get("pages", url)
+        if cached is not None:
+            self._count("page_cache_hits")
+            return cached
+        breaker = self._host_breaker(urlsplit(url).hostname or "")
+        if not breaker.allow():
+            self._count("breaker_rejections")
+            return ""
+
+        self._count("fetches")
+        try:
+            body, encoding = await asyncio.wait_for(self._download(url), WEB_FETCH_TIMEOUT)
+            text = await asyncio.to_thread(extract_paragraphs, body, encoding)
+        except asyncio.CancelledError:  # 더 높은 순위 페이지를 찾았거나 전체 제한 시간 초과
+            breaker.release()
+            raise
+        except Exception as e:
+            breaker.record(False)
+            self._count("timeouts" if isinstance(e, (asyncio.TimeoutError, httpx.TimeoutException)) else "fetch_errors")
+            print(f"❌ {url} 크롤링 중 오류 발생: {describe_error(e)}")
+            return ""
+        breaker.record(True)
+        cache_put("pages", url, text)  # 본문이 없는 페이지도 캐시 (다시 받지 않도록)
+        return text
+
+    async def _download(self, url: str) -> tuple:
+        async with self._get_client().stream("GET", url) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "")
+            if content_type and "html" not in content_type and not content_type.startswith("text/"):
+                raise ValueError(f"HTML이 아닌 응답 ({content_type})")
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) >= WEB_MAX_BYTES:  # 큰 페이지는 앞부분만
+                    break
+            return bytes(body[:WEB_MAX_BYTES]), response.charset_encoding
+
+    def _host_breaker(self, host: str) -> CircuitBreaker:
+        with self.lock:
+            breaker = self.host_breakers.get(host)
+            if breaker is None:
+                if len(self.host_breakers) >= 1000:  # 정상 상태 차단기는 버려도 됨
+                    self.host_breakers = {h: b for h, b in self.host_breakers.items() if b.is_open}
+                breaker = self.host_breakers[host] = CircuitBreaker()
+            return breaker
+
+    def _count(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+            open_hosts = sum(breaker.is_open for breaker in self.host_breakers.values())
+        total_sec, searches = stats.pop("total_sec"), stats["searches"]
+        stats["avg_sec"] = round(total_sec / searches, 3) if searches else 0.0
+        stats["search_breaker_open"] = int(self.search_breaker.is_open)
+        stats["search_breaker_trips"] = self.search_breaker.trips
+        stats["open_host_breakers"] = open_hosts
+        return stats
+
+    def close(self):
+        """서버 종료 시 연결 정리 + 루프 중지"""
+        with self.lock:
+            loop, self.loop = self.loop, None
+        if loop is None:
+            return
+        if self.client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self.client.aclose(), loop).result(timeout=2)
+            except Exception as e:
+                print(f"❌ 웹 검색 클라이언트 종료 오류: {e}")
+            self.client = None
+        loop.call_soon_threadsafe(loop.stop)
+        self.thread.join(timeout=2)
+
+
+web_searcher = WebSearcher()
@@ -0,0 +1,55 @@
+import sys
+import json
+import time
+import statistics
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# ✅ /chat 동시 사용자 부하 측정 (requests/sec, 지연 시간)
+#    실행: 서버 기동 후 cd backend && python -m bench.chat_load [서버 URL]
+
+QUERIES = [
+    "딸기 품종 알려줘",
+    "고추 병해충은 뭐가 있어?",
+    "오늘 온도 알려줘",
+    "지금 온도가 토마토 생장에 적절해?",
+]
+
+def send_chat(base_url: str, message: str) -> float:
+    request = urllib.request.Request(
+        f"{base_url}/chat",
+        data=json.dumps({"message": message}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=600) as response:
+        response.read()
+    return time.perf_counter() - start
+
+def run_level(base_url: str, users: int, requests_per_user: int) -> dict:
+    """동시 사용자 users명이 각각 requests_per_user번 질문"""
+    messages = [QUERIES[i % len(QUERIES)] for i in range(users * requests_per_user)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        latencies = list(pool.map(lambda message: send_chat(base_url, message), messages))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "users": users,
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 3),
+        "p50_sec": round(statistics.median(latencies), 3),
+        "p95_sec": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+    }
+
+def run(base_url: str = "http://localhost:7000", levels=(1, 2, 4, 8), requests_per_user: int = 3):
+    results = []
+    for users in levels:
+        result = run_level(base_url, users, requests_per_user)
+        results.append(result)
+        print(f"👥 users={result['users']:>3} | {result['rps']:>7.3f} req/s | p50 {result['p50_sec']:>7.3f}s | p95 {result['p95_sec']:>7.3f}s")
+    return results
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else "http://localhost:7000")
@@ -0,0 +1,114 @@
+import io
+import os
+import re
+import sys
+import json
+import time
+import tempfile
+import statistics
+import contextlib
+
+# ✅ 응답 모델 컨텍스트 압축 측정 (오프라인: 메모리 ChromaDB + 해시 임베딩 + 가짜 LLM)
+#    실행: cd backend && python -m bench.context_compress_bench [반복 횟수]
+#    - offline_bench와 같은 고정 파일(TXT/PDF/DOCX/CSV)을 올린 뒤 질문 유형별 도구 결과를 만들고
+#      압축 전(도구 결과를 이어 붙인 그대로 = 기존 context 에이전트 관찰 결과) / 압축 후 응답 프롬프트를 비교
+#    - 가짜 LLM 입력 토큰당 지연 PREFILL_SEC (CPU 7B 모델 프롬프트 처리 속도 수준) → 프롬프트가 줄어든 만큼 응답 지연 감소
+#    - 압축 전 컨텍스트에 있던 출처 파일명이 압축 후에도 모두 남아 있는지 확인
+
+PREFILL_SEC = 0.01
+TOKEN_SEC = 0.005
+SOURCE_PATTERN = re.compile(r"^(?:📄 문서: (.+)|📄 (.+?): (?:조건에 맞는 \d+행|관련 행 \d+개).*)$", re.MULTILINE)
+
+
+def sources_in(text: str) -> set:
+    return {doc or data for doc, data in SOURCE_PATTERN.findall(text)}
+
+
+def vector_rows(csv_bytes: bytes, count: int) -> str:
+    """센서 저장소에 맞는 데이터가 없을 때 data_tool 벡터 검색 결과 (파일별 원본 행) 재현"""
+    import pandas as pd
+    from agents.data_tool import format_rows
+    df = pd.read_csv(io.BytesIO(csv_bytes)).tail(count)
+    rows = [", ".join(f"{col}: {value}" for col, value in row.items()) for _, row in df.iterrows()]
+    return "📊 검색된 데이터:\n" + format_rows("sensors.csv", rows)
+
+
+def scenarios(csv_bytes: bytes) -> dict:
+    """질문 유형 → (질문, 도구 결과 목록) (ReAct가 비슷한 문서 검색을 두 번 한 경우 포함)"""
+    from agents.data_tool import data_tool
+    from agents.rag_tool import rag_tool
+    from agents.both_tool import both_tool
+    from core.config import DATA_VECTOR_TOP_K
+    return {
+        "data": ("오늘 온도 알려줘", [data_tool.run("오늘 온도 알려줘")]),
+        "rag": ("딸기 잿빛곰팡이병 방제", [rag_tool.run("딸기 잿빛곰팡이병 방제")]),
+        "rag_repeat": ("딸기 곰팡이병 관리", [rag_tool.run("딸기 잿빛곰팡이병 방제"), rag_tool.run("딸기 곰팡이병 환기")]),
+        "both": ("오늘 습도로 보면 잿빛곰팡이병 위험이 있어?", [both_tool.run("오늘 습도와 잿빛곰팡이병")]),
+        "rows": ("최근 센서 기록 보여줘", [vector_rows(csv_bytes, DATA_VECTOR_TOP_K)]),
+    }
+
+
+def timed_response(context: str, prompt: str, repeat: int) -> float:
+    from agents.agent import response_agent
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response_agent.invoke({"context": context, "prompt": prompt})
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def run(repeat: int) -> dict:
+    from bench.offline_bench import OFFLINE_ENV, make_pdf, make_docx, make_csv, start_server, bench_ingest
+    os.environ.update(OFFLINE_ENV)
+    os.environ.update({"STORAGE_DIR": tempfile.mkdtemp(prefix="compress-bench-"), "ROUTER_ENABLED": "0",
+                       "FAKE_LLM_PREFILL_SEC": str(PREFILL_SEC), "FAKE_LLM_TOKEN_SEC": str(TOKEN_SEC)})
+
+    with contextlib.redirect_stdout(io.StringIO()):  # 서버/도구 로그 숨김
+        import httpx
+        from bench.retrieval_bench import CORPUS
+        from core.context_packer import estimate_tokens
+        from core.context_compressor import compress_context
+        server, thread, base_url = start_server()
+        try:
+            csv_bytes = make_csv(3)
+            files = {name: text.encode("utf-8") for name, text in CORPUS.items()}
+            files.update({"manual.pdf": make_pdf(20), "guide.docx": make_docx(60), "sensors.csv": csv_bytes})
+            with httpx.Client(base_url=base_url, timeout=600) as client:
+                bench_ingest(client, files)
+            cases = scenarios(csv_bytes)
+
+            results = {}
+            for name, (prompt, outputs) in cases.items():
+                raw = "\n\n".join(outputs)
+                compressed, stats = compress_context(outputs)
+                missing = [source for source in sources_in(raw) if source not in compressed]
+                results[name] = {
+                    "raw_tokens": estimate_tokens(raw),
+                    "compressed_tokens": stats["tokens_out"],
+                    "duplicates": stats["duplicates"],
+                    "raw_response_sec": round(timed_response(raw, prompt, repeat), 3),
+                    "compressed_response_sec": round(timed_response(compressed, prompt, repeat), 3),
+                    "sources": sorted(sources_in(raw)),
+                    "sources_kept": not missing,
+                }
+        finally:
+            server.should_exit = True
+            thread.join()
+    return results
+
+
+def print_report(results: dict) -> bool:
+    print(f"🗜️ 응답 컨텍스트 압축 (입력 토큰당 {PREFILL_SEC}초, 예산 {os.getenv('RESPONSE_CONTEXT_TOKENS', '1000')} 토큰)")
+    for name, result in results.items():
+        print(f"{'✅' if result['sources_kept'] else '❌'} {name:<11} 토큰 {result['raw_tokens']:5d} → "
+              f"{result['compressed_tokens']:5d}  응답 {result['raw_response_sec']:6.2f}s → "
+              f"{result['compressed_response_sec']:6.2f}s  중복 {result['duplicates']}  출처 {', '.join(result['sources'])}")
+    return all(result["sources_kept"] for result in results.values())
+
+
+if __name__ == "__main__":
+    results = run(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
+    ok = print_report(results)
+    print(json.dumps(results, ensure_ascii=False, indent=1))
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,83 @@
+import os
+import sys
+import json
+import tempfile
+import subprocess
+import numpy as np
+import pandas as pd
+
+# ✅ 데이터 파일 → 행 문서 변환 처리량/메모리 비교
+#    기존: 전체 read_csv + iterrows / 개선: 청크 읽기 + 컬럼 단위 문자열 변환 (+ 숫자 테이블 임베딩 생략)
+#    실행: cd backend && python -m bench.data_ingest_bench [행 수] [기존 방식 행 수]
+#    방식마다 새 프로세스에서 측정 (임베딩 전 단계까지: 읽기 + 센서 저장소 저장 + 문서 변환)
+
+PROBE = r"""
+import json, os, resource, sys, tempfile, time
+mode, path, rows = sys.argv[1], sys.argv[2], int(sys.argv[3])
+os.environ["EMBED_NUMERIC_TABLES"] = "0" if mode == "skip_numeric" else "1"
+import pandas as pd
+from data import sensor_store
+from data.file_handler import process_data_file
+sensor_store.SENSOR_DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_sensor.db")
+
+start = time.perf_counter()
+docs = 0
+if mode == "legacy":
+    df = pd.read_csv(path, nrows=rows)
+    sensor_store.store_dataframe("bench.csv", df)
+    for _, row in df.iterrows():
+        ", ".join([f"{col}: {row[col]}" for col in df.columns if pd.notna(row[col])])
+        docs += 1
+else:
+    info = {}
+    for _ in process_data_file(None, "csv", "bench.csv", file_path=path, info=info):
+        docs += 1
+    rows = info["rows"]
+elapsed = time.perf_counter() - start
+print("RESULT" + json.dumps({"rows": rows, "docs": docs, "sec": elapsed, "rows_per_sec": rows / elapsed,
+                             "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def make_csv(path: str, rows: int):
+    """1분 간격 합성 센서 로그 (날짜 + 숫자 컬럼)"""
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        "date": pd.date_range("2020-01-01", periods=rows, freq="min").strftime("%Y-%m-%d %H:%M:%S"),
+        "온도": rng.normal(24, 4, rows).round(1),
+        "습도": rng.integers(40, 90, rows),
+        "CO2": rng.integers(350, 1200, rows),
+        "조도": rng.integers(0, 50000, rows),
+        "토양수분": rng.normal(30, 5, rows).round(1),
+    }).to_csv(path, index=False)
+
+
+def probe(mode: str, path: str, rows: int) -> dict:
+    output = subprocess.run([sys.executable, "-c", PROBE, mode, path, str(rows)], capture_output=True, text=True).stdout
+    for line in output.splitlines():
+        if line.startswith("RESULT"):
+            return json.loads(line[len("RESULT"):])
+    raise RuntimeError(f"측정 실패 ({mode}):\n{output[-2000:]}")
+
+
+def run(rows: int = 2_000_000, legacy_rows: int = 200_000):
+    path = os.path.join(tempfile.mkdtemp(), "bench.csv")
+    make_csv(path, rows)
+    print(f"📊 {rows:,}행 CSV ({os.path.getsize(path) / 1024 / 1024:.0f}MB)")
+
+    results = {}
+    for mode, mode_rows in (("legacy", legacy_rows), ("chunked", rows), ("skip_numeric", rows)):
+        result = probe(mode, path, mode_rows)
+        results[mode] = result
+        line = (f"  {mode:<12} | {result['rows']:>10,}행 {result['sec']:>7.2f}s | {result['rows_per_sec']:>10,.0f} rows/sec"
+                f" | 문서 {result['docs']:,}개 | peak RSS {result['peak_rss_mb']:.0f}MB")
+        if mode == "legacy" and legacy_rows < rows:
+            line += f" | {rows:,}행 환산 약 {result['sec'] * rows / legacy_rows:.0f}s"
+        print(line)
+    os.remove(path)
+    return results
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200_000)
@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+import tempfile
+from data import sensor_store
+from agents.data_tool import extract_matching_columns, format_summary
+from core.context_packer import estimate_tokens
+from bench.sensor_store_bench import make_sensor_frame
+
+# ✅ SmartFarmData 컨텍스트 크기/지연 시간 비교 (기존: 조건에 맞는 행 최대 1000개 그대로 / 개선: SQL 집계 요약)
+#    실행: cd backend && python -m bench.data_tool_bench [행 수 ...]
+#    테이블 크기를 바꿔 가며 같은 질문을 조회 (요약은 조건에 맞는 행 수에만 비례해야 함)
+
+PROMPTS = ["온도 25 인 데이터 보여줘", "습도 60 일 때 온도는?", "습도 데이터 알려줘"]
+
+
+def legacy_context(prompt: str) -> str:
+    rows = sensor_store.query_rows(extract_matching_columns(prompt, sensor_store.all_column_names()), limit=1000)
+    return f"📊 검색된 데이터:\n{rows}"
+
+
+def summary_context(prompt: str) -> str:
+    summaries = sensor_store.summarize(extract_matching_columns(prompt, sensor_store.all_column_names()))
+    return "📊 검색된 데이터:\n" + "\n".join(format_summary(summary) for summary in summaries)
+
+
+def run(sizes: list):
+    for rows in sizes:
+        sensor_store.SENSOR_DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_sensor.db")
+        sensor_store._local.conn = None
+        sensor_store.store_dataframe("bench.csv", make_sensor_frame(rows))
+        print(f"🗄️ {rows:,}행")
+        for prompt in PROMPTS:
+            summary_context(prompt)  # 필터 컬럼 인덱스 생성 (처음 한 번)
+            line = f"  {prompt:<20}"
+            for name, build in (("legacy", legacy_context), ("summary", summary_context)):
+                start = time.perf_counter()
+                context = build(prompt)
+                elapsed = (time.perf_counter() - start) * 1000
+                line += f" | {name} {elapsed:>7.1f}ms {estimate_tokens(context):>6} 토큰"
+            print(line)
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
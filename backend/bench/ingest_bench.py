@@ -0,0 +1,30 @@
+import sys
+import chromadb
+from data.file_handler import embed_and_store
+
+# ✅ 업로드 파이프라인 처리량 측정 (chunks/sec)
+#    실행: cd backend && python -m bench.ingest_bench [조각 수]
+
+SAMPLE_TEXT = "딸기는 낮 기온 20~25도, 밤 기온 5~10도에서 잘 자라며 잿빛곰팡이병에 주의해야 합니다. "
+
+def make_chunks(n: int) -> list:
+    """1000자 내외의 합성 문서 조각 생성"""
+    return [f"[{i}] " + SAMPLE_TEXT * 12 for i in range(n)]
+
+def run(num_chunks: int = 512, batch_sizes=(1, 16, 64, 128)):
+    chroma_client = chromadb.EphemeralClient()
+    docs = make_chunks(num_chunks)
+
+    print(f"📦 조각 {num_chunks}개 기준 처리량 측정")
+    results = []
+    for batch_size in batch_sizes:
+        name = f"bench-{batch_size}"
+        collection = chroma_client.get_or_create_collection(name=name)
+        stats = embed_and_store(docs, collection, name, "bench", batch_size=batch_size)
+        chroma_client.delete_collection(name)
+        results.append(stats)
+        print(f"  batch={batch_size:>4} | embed {stats['embed_sec']:>7.2f}s | insert {stats['insert_sec']:>6.2f}s | {stats['chunks_per_sec']:>8.2f} chunks/sec")
+    return results
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 512)
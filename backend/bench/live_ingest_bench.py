@@ -0,0 +1,97 @@
+import os
+import sys
+import time
+import random
+import tempfile
+import datetime
+import threading
+from data import sensor_store
+from data.live_ingest import LiveIngestor, QueueFull
+from data.today_data import get_today_data
+
+# ✅ 실시간 센서 수집 처리량/반영 지연 측정 (가상 센서 장치가 목표 속도로 일정 크기 묶음을 계속 전송)
+#    실행: cd backend && python -m bench.live_ingest_bench [초] [목표 행/초 ...]
+#    - 처리량: 저장 완료된 행/초 (버퍼가 넘쳐 거절된 행은 제외)
+#    - 반영 지연: 표식 측정값 전송 → get_today_data()에 보일 때까지 걸린 시간
+
+SOURCES = 4
+BATCH = 100  # 장치가 한 번에 보내는 행 수 (HTTP POST 1회 분량)
+
+
+def make_readings(count: int) -> list:
+    return [{"온도": round(random.uniform(18, 30), 2), "습도": round(random.uniform(40, 80), 2),
+             "CO2농도": random.randint(350, 900), "조도": random.randint(0, 50000), "zone": f"z{i % 4}"}
+            for i in range(count)]
+
+
+def produce(ingestor: LiveIngestor, source: str, rate: float, deadline: float):
+    """rate 행/초로 BATCH 행씩 전송 (밀리면 따라잡지 않고 다음 주기로)"""
+    pool = make_readings(BATCH * 10)
+    period = BATCH / rate
+    next_send = time.perf_counter()
+    i = 0
+    while next_send < deadline:
+        try:
+            ingestor.submit(source, pool[i % 10 * BATCH:(i % 10 + 1) * BATCH])
+        except QueueFull:
+            pass
+        i += 1
+        next_send = max(next_send + period, time.perf_counter())
+        time.sleep(max(0.0, next_send - time.perf_counter()))
+
+
+def probe_freshness(ingestor: LiveIngestor, deadline: float) -> list:
+    """0.5초마다 표식 행 전송 → 오늘 데이터 조회에 나타날 때까지 시간 (ms)"""
+    lags = []
+    marker = 0
+    while time.perf_counter() < deadline:
+        marker += 1
+        needle = f"marker: {marker},"
+        sent = time.perf_counter()
+        try:
+            ingestor.submit("probe", [{"marker": marker}])
+        except QueueFull:
+            time.sleep(0.5)
+            continue
+        while time.perf_counter() - sent < 10:
+            rows = get_today_data()
+            if any(needle in row for row in rows[-ingestor.batch_rows * 2:]):
+                lags.append((time.perf_counter() - sent) * 1000)
+                break
+            time.sleep(0.01)
+        time.sleep(0.5)
+    return lags
+
+
+def run(seconds: float, rate: float):
+    sensor_store.SENSOR_DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_sensor.db")
+    sensor_store._local.conn = None
+    ingestor = LiveIngestor()
+    ingestor.start()
+
+    start = time.perf_counter()
+    deadline = start + seconds
+    producers = [threading.Thread(target=produce, args=(ingestor, f"bench{i}", rate / SOURCES, deadline))
+                 for i in range(SOURCES)]
+    for thread in producers:
+        thread.start()
+    lags = probe_freshness(ingestor, deadline)
+    for thread in producers:
+        thread.join()
+    ingestor.stop()
+    elapsed = time.perf_counter() - start
+
+    stats = ingestor.get_stats()
+    lags.sort()
+    line = (f"  목표 {rate:>8,.0f}행/초 | 저장 {stats['written'] / elapsed:>8,.0f}행/초 ({stats['flushes']}회,"
+            f" 최대 {stats['max_flush_ms']:.0f}ms) | 거절 {stats['rejected']:>7,}행")
+    if lags:
+        line += f" | 반영 지연 중앙값 {lags[len(lags) // 2]:.0f}ms, 최대 {lags[-1]:.0f}ms"
+    print(line)
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print(f"📡 가상 센서 {SOURCES}개 × {BATCH}행 묶음, 목표 속도별 {seconds:.0f}초 ({datetime.datetime.now():%H:%M:%S})")
+    for rate in [float(arg) for arg in sys.argv[2:]] or [1_000, 10_000, 50_000]:
+        run(seconds, rate)
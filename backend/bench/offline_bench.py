@@ -0,0 +1,287 @@
+import io
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import platform
+import tempfile
+import datetime
+import threading
+import statistics
+import subprocess
+import contextlib
+
+# ✅ 오프라인 전체 파이프라인 벤치마크 (GPU/Ollama/ChromaDB 서버 없이)
+#    실행: cd backend && python -m bench.offline_bench [--token-sec 0.02] [--users 1,4,8] [--out 보고서.json] [--compare 기준.json]
+#    - 메모리 ChromaDB (CHROMA_MODE=ephemeral) + 해시 임베딩 (EMBEDDING_BACKEND=hash) + 가짜 ReAct LLM (LLM_BACKEND=fake)
+#    - 임시 STORAGE_DIR에서 uvicorn 서버를 띄우고 업로드(PDF/DOCX/CSV/TXT) → RAG 검색 → 데이터 검색 → /today → 동시 /chat 순서로 측정
+#    - 입력 파일/LLM 출력이 고정이라 같은 커밋이면 처리 결과가 같음 (지연 시간만 기계 성능에 따라 다름)
+#    - --compare: 기준 보고서보다 지연 시간/처리량이 --tolerance 이상 나빠진 항목을 표시하고 종료 코드 1
+
+OFFLINE_ENV = {
+    "CHROMA_MODE": "ephemeral",
+    "EMBEDDING_BACKEND": "hash",
+    "LLM_BACKEND": "fake",
+    "RERANKER": "none",  # cross-encoder 모델 다운로드 없이
+    "ANSWER_CACHE_ENABLED": "0",  # 같은 질문 반복 → 캐시 적중으로 부하 측정이 무의미해짐
+    "WARMUP_MODELS": "0",
+}
+DATA_PROMPTS = ["오늘 온도 알려줘", "습도 60 일 때 온도는?", "CO2 데이터 보여줘", "조도 데이터 알려줘"]
+
+
+# ✅ 1️⃣ 고정 입력 파일
+def make_pdf(pages: int) -> bytes:
+    import fitz
+    from bench.retrieval_bench import CORPUS
+    texts = list(CORPUS.values())
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        for line in range(20):
+            page.insert_text((40, 50 + line * 36), texts[(i + line) % len(texts)][:45], fontname="korea", fontsize=10)
+    return doc.tobytes()
+
+
+def make_docx(paragraphs: int) -> bytes:
+    import docx
+    from bench.retrieval_bench import CORPUS
+    texts = list(CORPUS.values())
+    document = docx.Document()
+    document.add_paragraph("목차")  # extract_text_from_docx는 목차 이후 본문만 사용
+    for i in range(paragraphs):
+        document.add_paragraph(f"{i + 1}. {texts[i % len(texts)]}")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def make_csv(days: int) -> bytes:
+    """오늘을 포함한 최근 N일, 10분 간격 센서 데이터 (값은 고정 시드)"""
+    import numpy as np
+    import pandas as pd
+    rows = days * 144
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp(datetime.date.today()) - pd.Timedelta(days=days - 1)
+    df = pd.DataFrame({
+        "date": pd.date_range(start, periods=rows, freq="10min").strftime("%Y-%m-%d %H:%M:%S"),
+        "온도": rng.integers(10, 35, rows),
+        "습도": rng.integers(40, 90, rows),
+        "CO2": rng.integers(350, 1200, rows),
+        "조도": rng.integers(0, 50000, rows),
+    })
+    return df.to_csv(index=False).encode("utf-8")
+
+
+# ✅ 2️⃣ 측정 도우미
+def percentiles(samples: list, unit: float = 1000.0) -> dict:
+    samples = sorted(samples)
+    return {"p50_ms": round(statistics.median(samples) * unit, 2),
+            "p95_ms": round(samples[max(0, int(len(samples) * 0.95) - 1)] * unit, 2)}
+
+
+def timed(func, repeat: int) -> tuple:
+    latencies, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        latencies.append(time.perf_counter() - start)
+    return result, latencies
+
+
+def start_server():
+    import uvicorn
+    import main
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+# ✅ 3️⃣ 시나리오
+def bench_ingest(client, files: dict) -> dict:
+    """파일별 업로드 → 작업 완료까지 시간 / 조각 처리량"""
+    results = {}
+    for filename, content in files.items():
+        start = time.perf_counter()
+        job_id = client.post("/upload", files={"file": (filename, content)}).json()["job_id"]
+        while True:
+            job = client.get(f"/jobs/{job_id}").json()
+            if job["status"] not in ("queued", "running"):
+                break
+            time.sleep(0.02)
+        elapsed = time.perf_counter() - start
+        chunks = (job.get("result") or {}).get("chunks", job["chunks_done"])
+        results[filename] = {"status": job["status"], "chunks": chunks, "sec": round(elapsed, 3),
+                             "chunks_per_sec": round(chunks / elapsed, 1) if elapsed else 0.0}
+    return results
+
+
+def bench_rag_search(repeat: int) -> dict:
+    from agents.rag_tool import retrieve_documents, search_rag_data
+    from bench.retrieval_bench import LABELLED_QUERIES
+    hits, latencies = 0, []
+    for query, expected in LABELLED_QUERIES:
+        docs = retrieve_documents(query, top_k_final=5, min_docs=0) or []
+        hits += expected in [filename for _, _, _, filename in docs]
+        latencies += timed(lambda: search_rag_data(query), repeat)[1]
+    return {"queries": len(LABELLED_QUERIES), "recall_at_5": round(hits / len(LABELLED_QUERIES), 3), **percentiles(latencies)}
+
+
+def bench_data_search(repeat: int) -> dict:
+    from agents.data_tool import query_smartfarm_data
+    from core.context_packer import estimate_tokens
+    latencies, tokens = [], []
+    for prompt in DATA_PROMPTS:
+        context, samples = timed(lambda: query_smartfarm_data(prompt), repeat)
+        latencies += samples
+        tokens.append(estimate_tokens(context))
+    return {"queries": len(DATA_PROMPTS), "avg_context_tokens": round(sum(tokens) / len(tokens), 1), **percentiles(latencies)}
+
+
+def bench_today(client, repeat: int) -> dict:
+    rows, latencies = timed(lambda: client.get("/today").json(), repeat)
+    return {"rows": len(rows), **percentiles(latencies)}
+
+
+def bench_chat(base_url: str, levels: list, requests_per_user: int) -> dict:
+    from bench.chat_load import run_level
+    results = {}
+    for users in levels:
+        result = run_level(base_url, users, requests_per_user)
+        results[f"users_{users}"] = {"rps": result["rps"], "p50_ms": round(result["p50_sec"] * 1000, 1),
+                                     "p95_ms": round(result["p95_sec"] * 1000, 1)}
+    return results
+
+
+# ✅ 4️⃣ 보고서 비교
+def flatten(results: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """기준 대비 나빠진 항목 [(이름, 기준값, 현재값)]
+
+    - 지연 시간: tolerance 비율 이상 + 절대값 (5ms / 0.25초) 이상 증가 (한 번만 재는 항목의 흔들림 제외)
+    - 처리량(rps): tolerance 비율 이상 감소 / 정확도: 하락 / 조각·행 수: 달라짐 (처리 결과가 바뀜)
+    """
+    current, base = flatten(report["results"]), flatten(baseline["results"])
+    regressions = []
+    for name, old in base.items():
+        new = current.get(name)
+        if new is None:
+            continue
+        if name.endswith("_ms"):
+            worse = new > old * (1 + tolerance) and new - old > 5
+        elif name.endswith(".sec") or name.endswith("_sec") and not name.endswith("per_sec"):
+            worse = new > old * (1 + tolerance) and new - old > 0.25
+        elif name.endswith(".rps"):
+            worse = new < old * (1 - tolerance)
+        elif "recall" in name:
+            worse = new < old
+        elif name.endswith((".chunks", ".rows")):
+            worse = new != old
+        else:
+            continue
+        if worse:
+            regressions.append((name, old, new))
+    return regressions
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__)).stdout.strip()
+    except OSError:
+        return ""
+
+
+def run(args) -> dict:
+    os.environ.update(OFFLINE_ENV)
+    os.environ["STORAGE_DIR"] = tempfile.mkdtemp(prefix="offline-bench-")
+    os.environ["FAKE_LLM_TOKEN_SEC"] = str(args.token_sec)
+    levels = [int(users) for users in args.users.split(",")]
+
+    log = io.StringIO()  # 서버/에이전트 로그는 --verbose일 때만 출력
+    with contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(log):
+        import httpx
+        from bench.retrieval_bench import CORPUS
+        server, thread, base_url = start_server()
+        try:
+            with httpx.Client(base_url=base_url, timeout=600) as client:
+                files = {name: text.encode("utf-8") for name, text in CORPUS.items()}
+                files.update({"manual.pdf": make_pdf(args.pdf_pages), "guide.docx": make_docx(args.docx_paragraphs),
+                              "sensors.csv": make_csv(args.csv_days)})
+                ingest = bench_ingest(client, files)
+                results = {
+                    "ingest": {name: ingest[name] for name in ("manual.pdf", "guide.docx", "sensors.csv")},
+                    "ingest_txt_total_sec": round(sum(ingest[name]["sec"] for name in CORPUS), 3),
+                    "rag_search": bench_rag_search(args.repeat),
+                    "data_search": bench_data_search(args.repeat),
+                    "today": bench_today(client, args.repeat),
+                    "chat": bench_chat(base_url, levels, args.requests_per_user),
+                }
+        finally:
+            server.should_exit = True
+            thread.join()
+
+    return {
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "settings": {**OFFLINE_ENV, "token_sec": args.token_sec, "users": levels, "requests_per_user": args.requests_per_user,
+                     "pdf_pages": args.pdf_pages, "docx_paragraphs": args.docx_paragraphs, "csv_days": args.csv_days,
+                     "repeat": args.repeat},
+        "results": results,
+    }
+
+
+def print_report(report: dict):
+    print(f"🧪 오프라인 벤치마크 ({report['created_at']}, {report['git'] or '-'}, CPU {report['cpu_count']}개)")
+    for name, value in flatten(report["results"]).items():
+        print(f"  {name:<40} {value}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--token-sec", type=float, default=0.02, help="가짜 LLM 출력 토큰당 지연 (초)")
+    parser.add_argument("--users", default="1,4,8", help="동시 /chat 사용자 수 (쉼표로 구분)")
+    parser.add_argument("--requests-per-user", type=int, default=3)
+    parser.add_argument("--pdf-pages", type=int, default=30)
+    parser.add_argument("--docx-paragraphs", type=int, default=200)
+    parser.add_argument("--csv-days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5, help="검색/조회 시나리오 반복 횟수")
+    parser.add_argument("--out", help="보고서 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 기준 보고서 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="나빠졌다고 볼 비율 (0.2 = 20%%)")
+    parser.add_argument("--verbose", action="store_true", help="서버/에이전트 로그 출력")
+    args = parser.parse_args()
+
+    report = run(args)
+    print_report(report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 보고서 저장: {args.out}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for name, old, new in regressions:
+            print(f"⚠️ 성능 저하: {name} {old} → {new}")
+        print(f"{'❌' if regressions else '✅'} 기준 대비 저하 항목 {len(regressions)}개 (허용 {args.tolerance:.0%})")
+        sys.exit(1 if regressions else 0)
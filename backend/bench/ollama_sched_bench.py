@@ -0,0 +1,212 @@
+import sys
+import json
+import time
+import random
+import threading
+import statistics
+from collections import Counter, deque
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# ✅ 두 모델(context/응답)을 번갈아 쓰는 채팅의 모델 재로드 지연 측정 (로컬 가짜 Ollama 서버, GPU/모델 없음)
+#    실행: cd backend && python -m bench.ollama_sched_bench [사용자 수] [사용자당 채팅 수]
+#    - 가짜 Ollama: 메모리에 모델 1개만 (MOCK_MAX_LOADED), 모델 로드 LOAD_SEC, 요청은 도착 순서대로 처리 (실제 Ollama처럼
+#      다른 모델 요청이 앞에 있으면 현재 모델 요청이 끝날 때까지 기다렸다가 교체), keep_alive가 지나면 모델을 내림
+#    - 채팅 1건 = context 모델 생성 2번 (ReAct) + 응답 모델 생성 1번, 채팅 사이 생각 시간 0~THINK_SEC
+#    - 비교: 기존 (모델별 OllamaLLM, keep_alive 없음) / 스케줄러 (공용 연결 풀 + keep_alive + 워밍업 + 같은 모델 요청 묶기)
+#            / 단일 모델 (LLM_SINGLE_MODEL)
+
+MOCK_MAX_LOADED = 1
+MOCK_PARALLEL = 4  # 모델별 동시 생성 수 (OLLAMA_NUM_PARALLEL)
+LOAD_SEC = 1.0  # 모델 로드 시간 (실제 7B CPU 로드는 수 초~수십 초)
+DEFAULT_KEEP_ALIVE = 1.5  # keep_alive 없는 요청의 유지 시간 (Ollama 기본 5분을 축소)
+TOKEN_SEC = 0.004
+CONTEXT_TOKENS, RESPONSE_TOKENS = 20, 60
+THINK_SEC = 3.0
+CONTEXT_MODEL, RESPONSE_MODEL = "mistral", "gemma:7b"
+
+
+# ✅ 1️⃣ 가짜 Ollama 서버
+class MockOllama:
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.queue = deque()  # 도착 순서 (앞 요청이 배정될 때까지 뒤 요청은 대기)
+        self.loaded = {}  # 모델 → 내릴 시각 (실행 중이면 None)
+        self.ready_at = {}  # 모델 → 로드 완료 시각
+        self.running = Counter()
+        self.loads = Counter()
+        self.connections = 0
+
+    def reset(self):
+        with self.cond:
+            self.loaded.clear()
+            self.loads.clear()
+            self.connections = 0
+
+    def _expire(self, now: float):
+        for model, until in list(self.loaded.items()):
+            if self.running[model] == 0 and until is not None and now >= until:
+                del self.loaded[model]
+
+    def admit(self, model: str) -> float:
+        """배정될 때까지 대기 → 로드가 필요하면 로드 시간(초) 반환"""
+        ticket = object()
+        with self.cond:
+            self.queue.append(ticket)
+            while True:
+                now = time.perf_counter()
+                self._expire(now)
+                if self.queue[0] is ticket:
+                    if model in self.loaded and self.running[model] < MOCK_PARALLEL:
+                        break
+                    if model not in self.loaded:
+                        idle = [m for m in self.loaded if self.running[m] == 0]
+                        if len(self.loaded) >= MOCK_MAX_LOADED and idle:
+                            del self.loaded[idle[0]]
+                        if len(self.loaded) < MOCK_MAX_LOADED:
+                            self.loaded[model] = None
+                            self.ready_at[model] = now + LOAD_SEC
+                            self.loads[model] += 1
+                            break
+                self.cond.wait(0.01)
+            self.queue.popleft()
+            self.running[model] += 1
+            self.loaded[model] = None
+            self.cond.notify_all()
+        wait = max(0.0, self.ready_at[model] - time.perf_counter())
+        time.sleep(wait)  # 로드 중이면 같은 모델의 다른 요청도 로드 완료까지 대기
+        return wait
+
+    def finish(self, model: str, keep_alive: float):
+        with self.cond:
+            self.running[model] -= 1
+            if self.running[model] == 0:
+                self.loaded[model] = time.perf_counter() + keep_alive
+            self.cond.notify_all()
+
+
+def parse_keep_alive(value) -> float:
+    if value is None:
+        return DEFAULT_KEEP_ALIVE
+    if isinstance(value, (int, float)):
+        return float("inf") if value < 0 else float(value)
+    units = {"s": 1, "m": 60, "h": 3600}
+    return float("inf") if value.startswith("-") else float(value[:-1]) * units.get(value[-1], 1)
+
+
+mock = MockOllama()
+
+
+class OllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 연결 재사용 (새 연결 수 = 핸들러 생성 수)
+
+    def setup(self):
+        super().setup()
+        with mock.cond:
+            mock.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        model, prompt = body["model"], body.get("prompt", "")
+        load_sec = mock.admit(model)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        tokens = 0 if not prompt else (RESPONSE_TOKENS if "문맥" in prompt else CONTEXT_TOKENS)
+        try:
+            for _ in range(tokens):
+                time.sleep(TOKEN_SEC)
+                self.write_line({"model": model, "response": "토큰 ", "done": False})
+            self.write_line({"model": model, "response": "", "done": True, "done_reason": "stop",
+                             "load_duration": int(load_sec * 1e9), "prompt_eval_count": len(prompt.split()),
+                             "eval_count": tokens})
+            self.wfile.write(b"0\r\n\r\n")
+        finally:
+            mock.finish(model, parse_keep_alive(body.get("keep_alive")))
+
+    def write_line(self, data: dict):
+        line = (json.dumps(data, ensure_ascii=False) + "\n").encode()
+        self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+        self.wfile.flush()
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+# ✅ 2️⃣ 채팅 부하
+def run_users(llm_context, llm_response, users: int, chats: int) -> tuple:
+    latencies, first = [], []
+
+    def user(seed: int):
+        rng = random.Random(seed)
+        time.sleep(rng.uniform(0, 0.5))
+        for i in range(chats):
+            start = time.perf_counter()
+            for step in range(2):
+                llm_context.invoke(f"Question: 토마토 질문 {seed}-{i} 단계 {step}")
+            llm_response.invoke(f"문맥: 토마토 재배 문서 {seed}-{i}")
+            elapsed = time.perf_counter() - start
+            latencies.append(elapsed)
+            if i == 0:
+                first.append(elapsed)
+            time.sleep(rng.uniform(0, THINK_SEC))
+
+    threads = [threading.Thread(target=user, args=(seed,)) for seed in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, first
+
+
+def summarize(name: str, latencies: list, first: list, extra: dict = None) -> dict:
+    samples = sorted(latencies)
+    pick = lambda q: samples[min(len(samples) - 1, int(len(samples) * q))]
+    result = {"chats": len(samples), "p50_sec": round(statistics.median(samples), 2), "p95_sec": round(pick(0.95), 2),
+              "p99_sec": round(pick(0.99), 2), "max_sec": round(samples[-1], 2),
+              "first_chat_avg_sec": round(statistics.mean(first), 2), "mock_loads": sum(mock.loads.values()),
+              "mock_connections": mock.connections, **(extra or {})}
+    print(f"{name:<10} p50 {result['p50_sec']:5.2f}s  p95 {result['p95_sec']:5.2f}s  p99 {result['p99_sec']:5.2f}s  "
+          f"max {result['max_sec']:5.2f}s  첫 채팅 {result['first_chat_avg_sec']:5.2f}s  "
+          f"모델 로드 {result['mock_loads']:3d}회  연결 {result['mock_connections']:3d}개")
+    return result
+
+
+def run(users: int, chats: int, base_url: str) -> dict:
+    from langchain_ollama import OllamaLLM
+    from core.llm_scheduler import ModelScheduler, PooledOllamaLLM, preload
+    results = {}
+
+    mock.reset()
+    legacy = [OllamaLLM(model=model, base_url=base_url) for model in (CONTEXT_MODEL, RESPONSE_MODEL)]
+    results["legacy"] = summarize("기존", *run_users(*legacy, users, chats))
+
+    mock.reset()
+    scheduler = ModelScheduler(max_loaded=MOCK_MAX_LOADED, parallel=MOCK_PARALLEL)
+    pooled = [PooledOllamaLLM(model=model, base_url=base_url, keep_alive="30m", scheduler=scheduler)
+              for model in (CONTEXT_MODEL, RESPONSE_MODEL)]
+    preload(CONTEXT_MODEL, scheduler, base_url)
+    results["scheduled"] = summarize("스케줄러", *run_users(*pooled, users, chats),
+                                     {key: scheduler.get_stats()[key] for key in ("switches", "cold_requests")})
+
+    mock.reset()
+    scheduler = ModelScheduler(max_loaded=MOCK_MAX_LOADED, parallel=MOCK_PARALLEL)
+    single = PooledOllamaLLM(model=CONTEXT_MODEL, base_url=base_url, keep_alive="30m", scheduler=scheduler)
+    preload(CONTEXT_MODEL, scheduler, base_url)
+    results["single_model"] = summarize("단일 모델", *run_users(single, single, users, chats))
+    return results
+
+
+if __name__ == "__main__":
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    chats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    server = MockServer(("127.0.0.1", 0), OllamaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"🦙 가짜 Ollama :{server.server_port} (모델 {MOCK_MAX_LOADED}개 상주, 로드 {LOAD_SEC}초), "
+          f"사용자 {users}명 × 채팅 {chats}건")
+    print(json.dumps(run(users, chats, f"http://127.0.0.1:{server.server_port}"), ensure_ascii=False, indent=1))
@@ -0,0 +1,87 @@
+import os
+import sys
+import json
+import tempfile
+import subprocess
+
+# ✅ PDF 추출 처리량/메모리 비교 (기존: 전체 bytes → 순차 추출 / 개선: 파일 경로 → 프로세스 풀 병렬 추출 + 스트리밍 분할)
+#    실행: cd backend && python -m bench.pdf_extract_bench [페이지 수] [페이지당 이미지 KB]
+#    방식마다 새 프로세스에서 측정 (peak RSS = 메인 프로세스 + 추출 워커 프로세스 중 최대값)
+
+PAGE_TEXT = ("딸기는 낮 기온 20~25도, 밤 기온 5~10도에서 잘 자라며 잿빛곰팡이병에 주의해야 한다. "
+             "토마토 생육 적온은 주간 25~27도, 야간 15~17도이다. ") * 12
+
+PROBE = r"""
+import json, resource, sys, time
+mode, path = sys.argv[1], sys.argv[2]
+from data.file_handler import split_pages
+from core.extraction import extract_text_from_pdf, iter_pdf_pages
+
+start = time.perf_counter()
+chunks = 0
+if mode == "legacy":
+    with open(path, "rb") as f:
+        file_content = f.read()
+    pages = extract_text_from_pdf(file_content)
+    docs = list(split_pages(pages))
+    chunks = len(docs)
+    page_count = len(pages)
+else:
+    progress = {}
+    for _ in split_pages(iter_pdf_pages(path, progress)):  # 조각을 하나씩 소비 (임베딩 단계와 같은 방식)
+        chunks += 1
+    page_count = progress["done"]
+elapsed = time.perf_counter() - start
+
+from core import extraction
+if extraction._pdf_pool is not None:
+    extraction._pdf_pool.shutdown()  # 워커 종료 후에야 RUSAGE_CHILDREN에 반영됨
+
+self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+print("RESULT" + json.dumps({"pages": page_count, "chunks": chunks, "sec": elapsed,
+                             "pages_per_sec": page_count / elapsed, "peak_rss_mb": max(self_rss, child_rss),
+                             "main_rss_mb": self_rss}))
+"""
+
+
+def make_pdf(path: str, num_pages: int, image_kb: int):
+    """페이지마다 텍스트 + 압축되지 않는 이미지(스캔 문서처럼 큰 파일)를 넣은 PDF 생성"""
+    import fitz
+    doc = fitz.open()
+    side = max(1, int((image_kb * 1024 / 3) ** 0.5))
+    for i in range(num_pages):
+        page = doc.new_page()
+        page.insert_textbox(fitz.Rect(40, 40, 555, 500), f"[{i + 1}] " + PAGE_TEXT, fontname="korea", fontsize=10)
+        if image_kb:
+            pixmap = fitz.Pixmap(fitz.csRGB, side, side, os.urandom(side * side * 3), False)
+            page.insert_image(fitz.Rect(40, 520, 300, 780), pixmap=pixmap)
+    doc.save(path)
+    doc.close()
+
+
+def probe(mode: str, path: str) -> dict:
+    output = subprocess.run([sys.executable, "-c", PROBE, mode, path], capture_output=True, text=True).stdout
+    for line in output.splitlines():
+        if line.startswith("RESULT"):
+            return json.loads(line[len("RESULT"):])
+    raise RuntimeError(f"측정 실패 ({mode}):\n{output[-2000:]}")
+
+
+def run(num_pages: int = 2000, image_kb: int = 100):
+    path = os.path.join(tempfile.mkdtemp(), "bench.pdf")
+    make_pdf(path, num_pages, image_kb)
+    print(f"📄 {num_pages}페이지 PDF ({os.path.getsize(path) / 1024 / 1024:.1f}MB)")
+
+    results = {}
+    for mode in ("legacy", "streaming"):
+        result = probe(mode, path)
+        results[mode] = result
+        print(f"  {mode:<9} | {result['pages_per_sec']:>8.1f} pages/sec | 조각 {result['chunks']}개"
+              f" | peak RSS {result['peak_rss_mb']:.0f}MB (메인 {result['main_rss_mb']:.0f}MB)")
+    os.remove(path)
+    return results
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000, int(sys.argv[2]) if len(sys.argv) > 2 else 100)
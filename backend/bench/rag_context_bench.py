@@ -0,0 +1,93 @@
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+
+# ✅ RAG 컨텍스트 크기/지연 시간 비교 (재정렬 + 토큰 예산 적용 전후)
+#    실행: cd backend && python -m bench.rag_context_bench [--agent]
+#    설정마다 새 프로세스에서 고정 코퍼스를 임시 ChromaDB에 업로드한 뒤 질문별 문서 컨텍스트 토큰 수/검색 지연 시간 측정
+#    --agent: query_dual_agent 전체 응답 시간도 측정 (Ollama 서버 필요)
+
+CONFIGS = {
+    "before": {"RERANKER": "none", "RAG_CONTEXT_TOKENS": "0"},
+    "after": {"RERANKER": "cross_encoder", "RAG_CONTEXT_TOKENS": "1500"},
+}
+
+PARAGRAPHS = [
+    "시설 재배에서는 환기, 보온, 차광을 작물의 생육 단계에 맞춰 조절해야 한다. 특히 일교차가 큰 봄과 가을에는 새벽 저온과 한낮 고온에 모두 대비한다.",
+    "병해충 예찰은 주 1회 이상 정기적으로 하며, 끈끈이 트랩으로 해충 밀도를 확인하고 발생 초기에 등록 약제로 방제한다.",
+    "양분 관리는 토양 검정 결과를 바탕으로 하며, 밑거름과 웃거름의 비율을 작형에 맞게 나누어 준다.",
+]
+
+
+def make_document(core_text: str) -> str:
+    """핵심 문단 앞뒤로 일반 문단을 붙여 여러 조각으로 나뉘는 문서 생성"""
+    return "\n\n".join(PARAGRAPHS * 3 + [core_text] + PARAGRAPHS * 3)
+
+
+def measure(with_agent: bool) -> dict:
+    """현재 환경 변수 설정으로 코퍼스 업로드 → 질문별 컨텍스트 토큰 수/지연 시간"""
+    import chromadb
+    from core import registry
+    from data import lexical_index
+    from data.file_handler import split_pages, embed_and_store
+    from core.context_packer import estimate_tokens
+    from agents.rag_tool import search_rag_data
+    from bench.retrieval_bench import CORPUS, LABELLED_QUERIES
+
+    lexical_index.LEXICAL_DB_PATH = os.path.join(tempfile.mkdtemp(), "lexical_index.db")
+    client = chromadb.EphemeralClient()
+    registry._collections["documents"] = client.get_or_create_collection(name="rag-bench")
+    for filename, text in CORPUS.items():
+        embed_and_store(split_pages([make_document(text)]), registry._collections["documents"], filename, filename,
+                        on_stored=lambda ids, texts, name=filename: lexical_index.add_documents(ids, texts, name))
+
+    tokens, search_ms, answer_sec = [], [], []
+    for query, _ in LABELLED_QUERIES:
+        start = time.perf_counter()
+        context = search_rag_data(query)
+        search_ms.append((time.perf_counter() - start) * 1000)
+        tokens.append(estimate_tokens(context))
+        if with_agent:
+            from agents.agent import query_dual_agent
+            start = time.perf_counter()
+            query_dual_agent(query)
+            answer_sec.append(time.perf_counter() - start)
+
+    result = {"avg_context_tokens": sum(tokens) / len(tokens), "max_context_tokens": max(tokens),
+              "avg_search_ms": sum(search_ms) / len(search_ms)}
+    if answer_sec:
+        result["avg_answer_sec"] = sum(answer_sec) / len(answer_sec)
+    return result
+
+
+def probe(name: str, with_agent: bool) -> dict:
+    env = dict(os.environ, ANSWER_CACHE_ENABLED="0", **CONFIGS[name])
+    args = [sys.executable, "-m", "bench.rag_context_bench", "--probe"] + (["--agent"] if with_agent else [])
+    output = subprocess.run(args, env=env, capture_output=True, text=True).stdout
+    for line in output.splitlines():
+        if line.startswith("RESULT"):
+            return json.loads(line[len("RESULT"):])
+    raise RuntimeError(f"측정 실패 ({name}):\n{output[-2000:]}")
+
+
+def run(with_agent: bool = False):
+    results = {}
+    for name in CONFIGS:
+        result = probe(name, with_agent)
+        results[name] = result
+        line = (f"📚 {name:<6} | 컨텍스트 평균 {result['avg_context_tokens']:.0f} / 최대 {result['max_context_tokens']} 토큰"
+                f" | 검색 {result['avg_search_ms']:.1f}ms")
+        if "avg_answer_sec" in result:
+            line += f" | 응답 {result['avg_answer_sec']:.2f}s"
+        print(line)
+    return results
+
+
+if __name__ == "__main__":
+    if "--probe" in sys.argv:
+        print("RESULT" + json.dumps(measure("--agent" in sys.argv)))
+    else:
+        run("--agent" in sys.argv)
@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+import random
+import tempfile
+
+# ✅ 수정된 문서 재업로드 비용 비교 (기존: 전체 재임베딩 / 개선: 내용 해시가 바뀐 조각만 임베딩 + 사라진 조각 삭제)
+#    실행: cd backend && python -m bench.reingest_bench [문단 수] [수정 비율 %]
+#    임시 ChromaDB/색인에 문서를 저장한 뒤 문단 일부를 고쳐 다시 저장 (임베딩 모델은 실제 설정 사용)
+
+WORDS = ["딸기", "토마토", "파프리카", "온도", "습도", "환기", "관수", "양액", "잿빛곰팡이병", "진딧물",
+         "생육", "적온", "주간", "야간", "정식", "수확", "차광", "보온", "EC", "pH"]
+
+
+def make_paragraphs(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [f"{i}. " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 60))) + "." for i in range(count)]
+
+
+def edit_paragraphs(paragraphs: list, percent: float, seed: int = 1) -> list:
+    """문단 percent%의 중간에 문장 삽입"""
+    rng = random.Random(seed)
+    edited = list(paragraphs)
+    for i in rng.sample(range(len(edited)), max(1, round(len(edited) * percent / 100))):
+        middle = len(edited[i]) // 2
+        edited[i] = edited[i][:middle] + " (수정: 야간 온도를 2도 낮춤) " + edited[i][middle:]
+    return edited
+
+
+def store(paragraphs: list, collection, filename: str, file_hash: str) -> tuple:
+    from data import lexical_index
+    from data.file_handler import split_pages, embed_and_store
+    start = time.perf_counter()
+    stats = embed_and_store(split_pages(["\n\n".join(paragraphs)]), collection, filename, file_hash,
+                            on_stored=lambda ids, texts: lexical_index.add_documents(ids, texts, filename),
+                            on_removed=lexical_index.remove_documents)
+    return time.perf_counter() - start, stats
+
+
+def run(num_paragraphs: int = 3000, percent: float = 1.0):
+    import chromadb
+    from data import ingest_index, lexical_index
+    workdir = tempfile.mkdtemp()
+    ingest_index.INGEST_DB_PATH = os.path.join(workdir, "ingest_index.db")
+    lexical_index.LEXICAL_DB_PATH = os.path.join(workdir, "lexical_index.db")
+    client = chromadb.EphemeralClient()
+
+    original = make_paragraphs(num_paragraphs)
+    edited = edit_paragraphs(original, percent)
+    print(f"📄 문단 {num_paragraphs}개, {percent}% 수정 후 재업로드")
+
+    results = {}
+    for mode in ("full", "incremental"):
+        collection = client.get_or_create_collection(name=f"reingest-{mode}")
+        filename = f"{mode}.txt"
+        store(original, collection, filename, "v1")
+        if mode == "full":
+            # 기존 방식: 파일 단위 해시만 있으므로 파일 전체를 지우고 처음부터 다시 임베딩
+            collection.delete(where={"filename": filename})
+            lexical_index.remove_file(filename)
+            ingest_index.remove_file(filename)
+        elapsed, stats = store(edited, collection, filename, "v2")
+        results[mode] = {"sec": elapsed, "embedded": stats["chunks"], "reused": stats["reused"],
+                         "removed": stats["removed"], "stored": collection.count()}
+        print(f"  {mode:<11} | {elapsed:>7.2f}s | 임베딩 {stats['chunks']:>5}개 | 재사용 {stats['reused']:>5}개"
+              f" | 삭제 {stats['removed']:>4}개 | 저장된 조각 {collection.count()}개")
+
+    print(f"⚡ 재업로드 시간 {results['full']['sec'] / max(results['incremental']['sec'], 1e-9):.1f}배 단축")
+    return results
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 3000, float(sys.argv[2]) if len(sys.argv) > 2 else 1.0)
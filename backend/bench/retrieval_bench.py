@@ -0,0 +1,102 @@
+import os
+import sys
+import time
+import tempfile
+import chromadb
+from core import registry
+from data import lexical_index
+from data.file_handler import embed_and_store
+from agents.rag_tool import retrieve_documents
+
+# ✅ RAG 검색 품질/지연 시간 비교 (벡터 검색 + 키워드 보조 필터 vs BM25 하이브리드)
+#    실행: cd backend && python -m bench.retrieval_bench [방해 문서 수]
+#    고정 코퍼스를 임시 ChromaDB/BM25 색인에 저장한 뒤 질문별 recall@k, 평균/p95 지연 시간 측정
+
+CORPUS = {
+    "strawberry_temp.txt": "딸기는 낮 기온 20~25도, 밤 기온 5~10도에서 잘 자란다. 개화기 야간 온도가 5도 이하로 내려가면 기형과가 많이 생긴다.",
+    "strawberry_botrytis.txt": "딸기 잿빛곰팡이병은 다습한 환경에서 과실에 회색 곰팡이가 피는 병이다. 환기를 자주 하고 병든 과실은 즉시 제거한다.",
+    "strawberry_variety.txt": "국내 주요 딸기 품종은 설향, 금실, 죽향, 킹스베리 등이 있으며 설향이 재배 면적의 대부분을 차지한다.",
+    "pepper_anthracnose.txt": "고추 탄저병은 장마철 고온다습할 때 과실에 둥근 병반이 생기는 병으로, 비가림 재배와 적기 방제가 중요하다.",
+    "pepper_pests.txt": "고추 주요 해충은 담배나방, 총채벌레, 진딧물이다. 총채벌레는 바이러스를 옮기므로 초기 방제가 필요하다.",
+    "tomato_temp.txt": "토마토 생육 적온은 주간 25~27도, 야간 15~17도이다. 30도 이상이 지속되면 착과가 불량해진다.",
+    "tomato_yellow.txt": "토마토 잎이 노랗게 변하는 원인은 질소 결핍, 마그네슘 결핍, 황화잎말림바이러스 감염 등이다.",
+    "tomato_tylcv.txt": "토마토 황화잎말림바이러스(TYLCV)는 담배가루이가 매개하며, 방충망 설치와 저항성 품종 재배로 예방한다.",
+    "lettuce_harvest.txt": "상추는 파종 후 40~50일이면 수확할 수 있으며, 겉잎부터 차례로 따서 수확하면 오래 수확할 수 있다.",
+    "lettuce_bolting.txt": "상추는 고온 장일 조건에서 추대가 빨라지므로 여름 재배 시 차광과 만추대성 품종을 이용한다.",
+    "cucumber_mildew.txt": "오이 흰가루병은 잎 표면에 흰 가루 모양의 곰팡이가 생기는 병으로, 건조하고 일교차가 클 때 많이 발생한다.",
+    "cucumber_care.txt": "오이 재배 시 덩굴 유인과 적심을 제때 하고, 토양 수분이 부족하면 곡과가 생기므로 관수에 주의한다.",
+    "paprika_seedling.txt": "파프리카 육묘는 25~28도에서 발아시키고 본엽 8~10매일 때 정식한다. 육묘 기간은 약 50~60일이다.",
+    "paprika_fertilizer.txt": "파프리카는 양액재배 시 EC 2.0~3.0 dS/m, pH 5.5~6.5를 유지하고 착과기에는 칼륨 비율을 높인다.",
+    "co2_enrichment.txt": "시설 하우스의 CO2 시용은 오전 환기 전 800~1000ppm으로 유지할 때 광합성 촉진 효과가 크다.",
+    "humidity_control.txt": "온실 상대습도는 60~80%가 적당하며, 90% 이상 다습하면 곰팡이성 병해가 급증한다.",
+    "soil_moisture.txt": "토양 수분은 포장용수량의 60~80%를 유지하는 것이 좋으며 점적관수로 과습을 방지한다.",
+    "light_intensity.txt": "토마토와 파프리카는 광포화점이 높아 일사량이 부족한 겨울철에는 보광등을 활용한다.",
+}
+
+# ✅ (질문, 정답 문서 파일명)
+LABELLED_QUERIES = [
+    ("딸기 적정 온도는?", "strawberry_temp.txt"),
+    ("딸기 잿빛곰팡이병 방제", "strawberry_botrytis.txt"),
+    ("설향 품종 특징", "strawberry_variety.txt"),
+    ("고추 탄저병 예방법", "pepper_anthracnose.txt"),
+    ("총채벌레 방제 시기", "pepper_pests.txt"),
+    ("토마토 생육 적온", "tomato_temp.txt"),
+    ("토마토 잎이 노랗게 변하는 이유", "tomato_yellow.txt"),
+    ("TYLCV 매개 해충", "tomato_tylcv.txt"),
+    ("상추 수확 시기", "lettuce_harvest.txt"),
+    ("상추 추대 방지", "lettuce_bolting.txt"),
+    ("오이 흰가루병", "cucumber_mildew.txt"),
+    ("오이 곡과 원인", "cucumber_care.txt"),
+    ("파프리카 육묘 기간", "paprika_seedling.txt"),
+    ("파프리카 양액 EC", "paprika_fertilizer.txt"),
+    ("하우스 CO2 시용 농도", "co2_enrichment.txt"),
+    ("온실 습도 관리", "humidity_control.txt"),
+    ("점적관수 토양 수분", "soil_moisture.txt"),
+    ("겨울철 보광등", "light_intensity.txt"),
+]
+
+FILLER_TEXT = "시설원예 농가는 계절별 작업 일정에 맞춰 환경 관리와 작물 관리를 병행해야 한다. "
+
+
+def build_corpus(num_fillers: int):
+    """임시 ChromaDB 컬렉션/BM25 색인에 고정 코퍼스 + 방해 문서 저장"""
+    registry._collections["documents"] = chromadb.EphemeralClient().get_or_create_collection(name="retrieval-bench")
+    collection = registry._collections["documents"]
+    documents = dict(CORPUS)
+    documents.update({f"filler_{i}.txt": f"[{i}] " + FILLER_TEXT * 5 for i in range(num_fillers)})
+
+    for filename, text in documents.items():
+        embed_and_store([text], collection, filename, "bench",
+                        on_stored=lambda ids, texts, name=filename: lexical_index.add_documents(ids, texts, name))
+
+
+def evaluate(hybrid: bool, k: int) -> dict:
+    hits, latencies = 0, []
+    for query, expected in LABELLED_QUERIES:
+        start = time.perf_counter()
+        docs = retrieve_documents(query, top_k_final=k, min_docs=0, hybrid=hybrid) or []
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += expected in [filename for _, _, _, filename in docs[:k]]
+
+    latencies.sort()
+    return {"recall": hits / len(LABELLED_QUERIES),
+            "avg_ms": sum(latencies) / len(latencies),
+            "p95_ms": latencies[int(len(latencies) * 0.95) - 1]}
+
+
+def run(num_fillers: int = 200, ks=(1, 3, 5)):
+    lexical_index.LEXICAL_DB_PATH = os.path.join(tempfile.mkdtemp(), "lexical_index.db")
+    build_corpus(num_fillers)
+    print(f"📚 문서 {len(CORPUS) + num_fillers}개, 질문 {len(LABELLED_QUERIES)}개")
+
+    results = {}
+    for k in ks:
+        for name, hybrid in (("vector", False), ("hybrid", True)):
+            result = evaluate(hybrid, k)
+            results[(name, k)] = result
+            print(f"  {name:<6} recall@{k} {result['recall']:.2f} | avg {result['avg_ms']:.1f}ms | p95 {result['p95_ms']:.1f}ms")
+    return results
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,77 @@
+import sys
+import time
+from agents.router import route_query, get_router_stats, DATA, RAG, BOTH, UNKNOWN
+
+# ✅ 사전 라우터 평가 (지연 시간, 적중률, 정답/에이전트 일치율)
+#    실행: cd backend && python -m bench.router_eval [--agent]
+#    --agent: Ollama(mistral) context_agent의 도구 선택과도 비교 (Ollama 서버 필요)
+
+LABELLED_QUERIES = [
+    ("딸기 품종 알려줘", RAG),
+    ("고추 병해충은 뭐가 있어?", RAG),
+    ("토마토 잎이 노랗게 변하는 이유", RAG),
+    ("상추 수확 시기는 언제야?", RAG),
+    ("오이 재배할 때 주의할 점", RAG),
+    ("파프리카 육묘 방법 알려줘", RAG),
+    ("딸기 탄저병 방제법", RAG),
+    ("토마토 적정 온도는 몇 도야?", RAG),
+    ("딸기 수분 방법", RAG),
+    ("오늘 온도 알려줘", DATA),
+    ("현재 습도 몇이야?", DATA),
+    ("지금 CO2 농도 알려줘", DATA),
+    ("오늘 측정된 조도 보여줘", DATA),
+    ("현재 토양 수분 상태 알려줘", DATA),
+    ("온도 30도인 데이터 찾아줘", DATA),
+    ("센서 데이터 보여줘", DATA),
+    ("온도 관리 방법은?", RAG),
+    ("지금 온도가 토마토 생장에 적절해?", BOTH),
+    ("현재 습도가 딸기 재배에 괜찮아?", BOTH),
+    ("오늘 CO2 농도가 고추 생육에 적합한가요?", BOTH),
+    ("지금 조도가 상추 키우기에 알맞아?", BOTH),
+    ("GPT는 뇌가 있나요?", UNKNOWN),
+    ("내일 뭐 할까?", UNKNOWN),
+    ("안녕 반가워", UNKNOWN),
+    ("오늘 저녁 메뉴 추천해줘", UNKNOWN),
+    ("파이썬 리스트 정렬하는 법", UNKNOWN),
+]
+
+def agent_tool_choice(prompt: str):
+    """context_agent가 처음 선택한 도구 이름"""
+    from agents.agent import context_agent
+    result = context_agent.invoke({"input": prompt})
+    steps = result.get("intermediate_steps", []) if isinstance(result, dict) else []
+    return steps[0][0].tool if steps else None
+
+def run(with_agent: bool = False):
+    routed, correct, agreed, compared = 0, 0, 0, 0
+    latencies = []
+
+    for prompt, label in LABELLED_QUERIES:
+        route = route_query(prompt)
+        latencies.append(route["latency_ms"])
+        agent_choice = None
+
+        if route["tool"]:
+            routed += 1
+            correct += route["tool"] == label
+        if with_agent:
+            start = time.perf_counter()
+            agent_choice = agent_tool_choice(prompt)
+            agent_ms = (time.perf_counter() - start) * 1000
+            if route["tool"]:
+                compared += 1
+                agreed += route["tool"] == agent_choice
+            print(f"  {prompt:<30} 정답={label:<17} 라우터={str(route['tool']):<17} ({route['method']}, {route['latency_ms']}ms) 에이전트={agent_choice} ({agent_ms:.0f}ms)")
+        else:
+            print(f"  {prompt:<30} 정답={label:<17} 라우터={str(route['tool']):<17} ({route['method']}, {route['latency_ms']}ms)")
+
+    latencies.sort()
+    print(f"\n📈 적중률(에이전트 생략): {routed}/{len(LABELLED_QUERIES)} = {routed / len(LABELLED_QUERIES):.2%}")
+    print(f"🎯 라우팅된 질문 정확도: {correct}/{routed} = {correct / routed:.2%}" if routed else "🎯 라우팅된 질문 없음")
+    if with_agent and compared:
+        print(f"🤝 에이전트 일치율: {agreed}/{compared} = {agreed / compared:.2%}")
+    print(f"⏱️ 라우터 지연 p50 {latencies[len(latencies) // 2]:.2f}ms / 최대 {latencies[-1]:.2f}ms")
+    print(f"📊 누적 통계: {get_router_stats()}")
+
+if __name__ == "__main__":
+    run(with_agent="--agent" in sys.argv)
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+from data import sensor_store
+from agents.data_tool import extract_matching_columns
+
+# ✅ 센서 저장소 vs 기존 "col: val" 문자열 파싱 방식 비교 (지연 시간, 메모리)
+#    실행: cd backend && python -m bench.sensor_store_bench [행 수] [기존 방식 행 수]
+
+PROMPT = "온도 25 인 데이터 보여줘"
+
+def make_sensor_frame(rows: int) -> pd.DataFrame:
+    """1분 간격 합성 센서 데이터"""
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "date": pd.date_range("2024-01-01", periods=rows, freq="min"),
+        "온도": rng.integers(10, 35, rows),
+        "습도": rng.integers(40, 90, rows),
+        "CO2": rng.integers(350, 1200, rows),
+        "조도": rng.integers(0, 50000, rows),
+    })
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1024 / 1024
+
+def legacy_query(docs: list, prompt: str) -> list:
+    """기존 방식: 전체 문서 문자열 파싱 → DataFrame → 필터"""
+    df = pd.DataFrame([dict(entry.split(": ") for entry in doc.split(", ")) for doc in docs])
+    for col, value in extract_matching_columns(prompt, df.columns.tolist()).items():
+        if value is not None:
+            df = df[df[col].astype(str) == value]
+    return df.to_dict(orient="records")
+
+def run(rows: int = 1_000_000, legacy_rows: int = 100_000):
+    sensor_store.SENSOR_DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_sensor.db")
+    df = make_sensor_frame(rows)
+
+    _, elapsed, peak = measure(lambda: sensor_store.store_dataframe("bench.csv", df))
+    print(f"🗄️ 저장 {rows:,}행: {elapsed:.2f}s (peak {peak:.1f}MB)")
+
+    filters = extract_matching_columns(PROMPT, sensor_store.all_column_names())
+    result, elapsed, peak = measure(lambda: sensor_store.query_rows(filters, limit=1000))
+    print(f"🔍 조건 조회 {filters}: {len(result)}행, {elapsed * 1000:.1f}ms (peak {peak:.1f}MB)")
+
+    day = df["date"].iloc[len(df) // 2].strftime("%Y-%m-%d")
+    table = sensor_store.list_tables()[0]
+    conn = sensor_store.get_connection()
+    count, elapsed, peak = measure(lambda: conn.execute(
+        f"SELECT COUNT(*) FROM {sensor_store.quote(table['table'])} WHERE date >= ? AND date < ?",
+        (day, day + " 99")).fetchone()[0])
+    print(f"📅 날짜 인덱스 조회 ({day}): {count}행, {elapsed * 1000:.1f}ms (peak {peak:.1f}MB)")
+
+    sample = df.head(legacy_rows)
+    docs = [", ".join(f"{col}: {value}" for col, value in row.items()) for row in sample.astype(str).to_dict(orient="records")]
+    result, elapsed, peak = measure(lambda: legacy_query(docs, PROMPT))
+    print(f"🐢 기존 문자열 파싱 {legacy_rows:,}행: {len(result)}행, {elapsed * 1000:.1f}ms (peak {peak:.1f}MB)")
+    print(f"   → {rows:,}행 환산 약 {elapsed * rows / legacy_rows:.1f}s")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100_000)
@@ -0,0 +1,44 @@
+import os
+import sys
+import json
+import subprocess
+
+# ✅ 서버 시작 시간 / 메모리(RSS) 측정 (새 프로세스에서 main 임포트 → 워밍업)
+#    실행: cd backend && python -m bench.startup_bench [torch onnx ...]
+#    onnx 양자화 모델 비교 시 EMBEDDING_ONNX_FILE 환경 변수도 함께 지정
+
+PROBE = r"""
+import json, resource, time
+start = time.perf_counter()
+import main
+import_sec = time.perf_counter() - start
+import_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+from core.registry import warm_up
+start = time.perf_counter()
+warm_up()
+warm_sec = time.perf_counter() - start
+warm_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print("RESULT" + json.dumps({"import_sec": import_sec, "import_rss_mb": import_rss,
+                             "warm_up_sec": warm_sec, "warm_rss_mb": warm_rss}))
+"""
+
+def probe(backend: str) -> dict:
+    env = dict(os.environ, EMBEDDING_BACKEND=backend)
+    output = subprocess.run([sys.executable, "-c", PROBE], env=env, capture_output=True, text=True).stdout
+    for line in output.splitlines():
+        if line.startswith("RESULT"):
+            return json.loads(line[len("RESULT"):])
+    raise RuntimeError(f"측정 실패 ({backend}):\n{output[-2000:]}")
+
+def run(backends=("torch",)):
+    results = {}
+    for backend in backends:
+        result = probe(backend)
+        results[backend] = result
+        print(f"🚀 {backend:<6} | import {result['import_sec']:.2f}s / {result['import_rss_mb']:.0f}MB"
+              f" | warm-up {result['warm_up_sec']:.2f}s / {result['warm_rss_mb']:.0f}MB")
+    return results
+
+if __name__ == "__main__":
+    run(sys.argv[1:] or ["torch"])
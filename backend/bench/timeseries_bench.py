@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import tempfile
+import pandas as pd
+from data import sensor_store, graph
+from data.sensor_store import quote
+from bench.sensor_store_bench import make_sensor_frame
+
+# ✅ 대시보드 시계열 조회 비교 (기존: 원본 행 GROUP BY / 개선: 미리 계산한 집계 조회) + 행 추가 시 집계 갱신 비용
+#    실행: cd backend && python -m bench.timeseries_bench [일 수]
+#    1분 간격 센서 데이터 N일치 → 전체 기간 1시간/1일 단위 차트 조회 시간
+
+
+def raw_query(table: dict, interval: str) -> int:
+    """기존 방식: 원본 테이블을 매번 구간별로 집계"""
+    sensors = graph.numeric_columns(table)
+    key = graph.bucket_key(quote(table["date_column"]), interval)
+    selects = ", ".join(f"AVG({quote(col)}), MIN({quote(col)}), MAX({quote(col)})" for col in sensors)
+    rows = sensor_store.get_connection().execute(
+        f"SELECT {key}, {selects} FROM {quote(table['table'])} GROUP BY 1 ORDER BY 1").fetchall()
+    return len(rows)
+
+
+def timed(func, repeat: int = 3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best * 1000
+
+
+def run(days: int = 180):
+    sensor_store.SENSOR_DB_PATH = os.path.join(tempfile.mkdtemp(), "bench_sensor.db")
+    df = make_sensor_frame(days * 1440)
+    sensor_store.store_dataframe("bench.csv", df)
+    table = sensor_store.list_tables()[0]
+
+    _, build_ms = timed(lambda: graph.update_rollups(table), 1)
+    print(f"📈 {days}일 ({len(df):,}행) 집계 생성: {build_ms:.0f}ms")
+
+    for interval in ("1h", "1d"):
+        points, raw_ms = timed(lambda: raw_query(table, interval))
+        result, rollup_ms = timed(lambda: graph.query_series("bench.csv", interval=interval, rolling=24))
+        print(f"  전체 기간 {interval} 차트 ({points}구간) | 원본 GROUP BY {raw_ms:>8.1f}ms | 집계 조회 {rollup_ms:>6.1f}ms"
+              f" (이동 통계 포함)")
+
+    # 🔹 하루치 행 추가 → 증분 갱신 vs 전체 재계산
+    extra = make_sensor_frame(1440)
+    extra["date"] = pd.date_range(df["date"].iloc[-1] + pd.Timedelta(minutes=1), periods=1440, freq="min")
+    extra["date"] = extra["date"].dt.strftime(sensor_store.DATE_FORMAT)
+    with sensor_store._write_lock:
+        conn = sensor_store.get_connection()
+        extra.to_sql(table["table"], conn, if_exists="append", index=False)
+        conn.commit()
+    incremental, incremental_ms = timed(lambda: graph.update_rollups(table), 1)
+    graph.drop_rollups("bench.csv")
+    _, full_ms = timed(lambda: graph.update_rollups(table), 1)
+    print(f"  1일치 ({len(extra):,}행) 추가 후 갱신 | 증분 {incremental_ms:.0f}ms ({incremental['mode']}) | 전체 재계산 {full_ms:.0f}ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 180)
@@ -0,0 +1,165 @@
+import os
+import sys
+import time
+import tempfile
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+# ✅ 웹 검색 폴백 측정 (로컬 스텁 서버, 외부 네트워크 없음)
+#    실행: cd backend && python -m bench.web_search_bench
+#    - 검색 엔진 127.0.0.1 / 정상 사이트 127.0.0.2 / 문제 사이트 127.0.0.3 (사이트별 차단기가 섞이지 않도록 주소 분리)
+#    - 순위 우선 + 동시 수집, 멈춘 사이트의 제한 시간, 큰 페이지, 디스크 캐시, 검색 엔진 차단기, 동시 요청을 확인
+
+FETCH_TIMEOUT, DEADLINE, COOLDOWN = 1.0, 2.0, 1.5
+PARAGRAPH = "<p>토마토 잎곰팡이병은 습도가 높을 때 발생하며 환기와 적정 온도 유지로 예방합니다.</p>"
+hits = Counter()  # 스텁 서버가 받은 요청 수 (경로별)
+
+# 검색어 → 결과 링크 (g: 정상 사이트, b: 문제 사이트)
+RESULTS = {
+    "순위": ["b/error-slow", "g/slow"],  # 1위는 0.8초 뒤 실패, 2위는 0.8초 뒤 성공 → 순차 1.6초 / 동시 0.8초
+    "멈춤": ["b/drip"],  # 조금씩 끝없이 보내는 사이트
+    "대용량": ["g/big"],
+    "캐시": ["g/fast"],
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        path, query = urlsplit(self.path).path, parse_qs(urlsplit(self.path).query)
+        hits[path] += 1
+        if path == "/search":
+            term = query.get("q", [""])[0]
+            if term.startswith("장애"):
+                return self.reply(500, b"down")
+            links = RESULTS.get(term.split()[0], [f"g/slow?{term}"])
+            html = "".join(f'<div class="ezO2md"><a href="/url?q={self.site(link)}&sa=U">결과</a></div>' for link in links)
+            return self.reply(200, html.encode())
+        if path == "/fast":
+            return self.reply(200, (PARAGRAPH * 3).encode())
+        if path == "/slow":
+            time.sleep(0.8)
+            return self.reply(200, (PARAGRAPH * 3).encode())
+        if path == "/error-slow":
+            time.sleep(0.8)
+            return self.reply(500, b"error")
+        if path == "/big":
+            return self.reply(200, (PARAGRAPH * 60_000).encode())  # 약 8MB
+        if path == "/drip":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.end_headers()
+            try:
+                for _ in range(120):
+                    self.wfile.write(b"<p>.</p>")
+                    self.wfile.flush()
+                    time.sleep(0.25)
+            except OSError:
+                pass
+            return
+        self.reply(404, b"")
+
+    def site(self, link: str) -> str:
+        host, path = link.split("/", 1)
+        return f"http://127.0.0.{2 if host == 'g' else 3}:{self.server.server_port}/{path}"
+
+    def reply(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except OSError:  # 클라이언트가 WEB_MAX_BYTES까지만 받고 끊음
+            pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # 기본값 5면 동시 연결이 SYN 재전송(1초)으로 밀림
+
+
+def start_stub() -> int:
+    """같은 포트로 127.0.0.1~3에 스텁 서버 실행"""
+    port = None
+    for host in ("127.0.0.1", "127.0.0.2", "127.0.0.3"):
+        server = StubServer((host, port or 0), StubHandler)
+        port = server.server_port
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return port
+
+
+def timed_search(searcher, query: str) -> tuple:
+    start = time.perf_counter()
+    result = searcher.search(query)
+    return result, time.perf_counter() - start
+
+
+def report(name: str, sec: float, result: str, ok: bool, note: str = ""):
+    print(f"{'✅' if ok else '❌'} {name:<10} {sec * 1000:8.1f}ms  {result.splitlines()[0][:60]}  {note}")
+    return ok
+
+
+def run() -> bool:
+    from agents.web_search import web_searcher
+    results = []
+
+    result, sec = timed_search(web_searcher, "순위 병해충")
+    results.append(report("순위/동시", sec, result, "127.0.0.2" in result and sec < 1.4, "(순차였다면 1.6초)"))
+
+    result, sec = timed_search(web_searcher, "멈춤 사이트")
+    results.append(report("멈춘 사이트", sec, result, result.startswith("❌") and sec < FETCH_TIMEOUT + 0.5))
+
+    result, sec = timed_search(web_searcher, "대용량 페이지")
+    body = result.split("\n", 1)[-1]
+    results.append(report("대용량", sec, result, 0 < len(body) <= 5000, f"(본문 {len(body)}자)"))
+
+    timed_search(web_searcher, "캐시 확인")
+    before = sum(hits.values())
+    result, sec = timed_search(web_searcher, "캐시 확인")
+    results.append(report("캐시 적중", sec, result, sum(hits.values()) == before and sec < 0.05, "(스텁 요청 0건)"))
+
+    for i in range(3):
+        timed_search(web_searcher, f"장애 {i}")
+    before = hits["/search"]
+    result, sec = timed_search(web_searcher, "장애 차단 중")
+    results.append(report("차단기", sec, result, hits["/search"] == before and sec < 0.05, "(검색 엔진 요청 0건)"))
+    time.sleep(COOLDOWN)
+    result, sec = timed_search(web_searcher, "복구 확인")
+    results.append(report("차단 해제", sec, result, not result.startswith("❌"), "(시험 호출 성공 → 복구)"))
+
+    threads, outcomes = [], []
+    start = time.perf_counter()
+    for i in range(20):
+        thread = threading.Thread(target=lambda i=i: outcomes.append(timed_search(web_searcher, f"동시 {i}")))
+        thread.start()
+        threads.append(thread)
+    for thread in threads:
+        thread.join()
+    total = time.perf_counter() - start
+    failed = sum(result.startswith("❌") for result, _ in outcomes)
+    slowest = max(sec for _, sec in outcomes)
+    results.append(report("동시 20건", total, f"최대 {slowest * 1000:.0f}ms, 실패 {failed}건", total < DEADLINE and not failed,
+                          "(각 페이지 0.8초)"))
+
+    print("📊", web_searcher.get_stats())
+    web_searcher.close()
+    return all(results)
+
+
+if __name__ == "__main__":
+    port = start_stub()
+    os.environ.update({
+        "STORAGE_DIR": tempfile.mkdtemp(prefix="web-bench-"),
+        "WEB_SEARCH_URL": f"http://127.0.0.1:{port}/search",
+        "WEB_FETCH_TIMEOUT": str(FETCH_TIMEOUT),
+        "WEB_SEARCH_DEADLINE": str(DEADLINE),
+        "WEB_BREAKER_FAILURES": "3",
+        "WEB_BREAKER_COOLDOWN": str(COOLDOWN),
+    })
+    print(f"🌍 웹 검색 스텁 서버 :{port} (요청 제한 {FETCH_TIMEOUT}초, 전체 {DEADLINE}초)")
+    sys.exit(0 if run() else 1)
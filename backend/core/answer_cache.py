@@ -0,0 +1,135 @@
+import re
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+from core.config import (ANSWER_CACHE_SIZE, ANSWER_CACHE_TTL, ANSWER_CACHE_SENSOR_TTL,
+                         ANSWER_CACHE_SIMILARITY)
+
+# ✅ 도구별로 답변이 의존하는 ChromaDB 컬렉션 (업로드/삭제 시 무효화 기준)
+TOOL_COLLECTIONS = {
+    "SmartFarmData": {"data_files"},
+    "SmartFarmRAG": {"documents"},
+    "SmartFarmBOTH": {"data_files", "documents"},
+    "SmartFarmUnknown": set(),
+}
+SENSOR_TOOLS = {"SmartFarmData", "SmartFarmBOTH"}  # 센서 데이터는 금방 바뀌므로 짧은 TTL
+
+
+def normalize_prompt(prompt: str) -> str:
+    """공백/대소문자/끝 문장부호 차이를 무시한 정확 일치 키"""
+    return re.sub(r"\s+", " ", prompt).strip().lower().rstrip("?!.~ ")
+
+
+class AnswerCache:
+    """💾 질문 → 답변 캐시 (정확 일치 + 임베딩 유사도 조회, TTL + LRU 제거, 컬렉션 단위 무효화)"""
+
+    def __init__(self, embed_query=None, max_size: int = ANSWER_CACHE_SIZE,
+                 similarity: float = ANSWER_CACHE_SIMILARITY):
+        self.embed_query = embed_query  # 질문 임베딩 함수 (없으면 정확 일치만 사용)
+        self.max_size = max_size
+        self.similarity = similarity
+        self.entries = OrderedDict()  # 정규화된 질문 → 캐시 항목 (오래 안 쓴 순서)
+        self.lock = threading.Lock()
+        self.stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "saved_latency_sec": 0.0,
+                      "evictions": 0, "invalidations": 0}
+
+    # ✅ 1️⃣ 조회 → (캐시 항목 또는 None, 질문 임베딩)
+    def lookup(self, prompt: str):
+        start = time.perf_counter()
+        key = normalize_prompt(prompt)
+
+        with self.lock:
+            self._expire()
+            entry = self.entries.get(key)
+            if entry:
+                self.entries.move_to_end(key)
+                self._record_hit("exact_hits", entry, start)
+                return entry, None
+
+        embedding = self._embed(prompt)
+        if embedding is None:
+            with self.lock:
+                self.stats["misses"] += 1
+            return None, None
+
+        with self.lock:
+            candidates = [(k, e) for k, e in self.entries.items() if e["embedding"] is not None]
+            if candidates:
+                scores = np.array([e["embedding"] for _, e in candidates]) @ embedding
+                best = int(np.argmax(scores))
+                if scores[best] >= self.similarity:
+                    best_key, entry = candidates[best]
+                    self.entries.move_to_end(best_key)
+                    self._record_hit("semantic_hits", entry, start)
+                    return entry, embedding
+            self.stats["misses"] += 1
+        return None, embedding
+
+    # ✅ 2️⃣ 저장 (사용한 도구에 따라 TTL/의존 컬렉션 결정)
+    def store(self, prompt: str, answer: str, latency_sec: float, tools: list, embedding=None):
+        if not answer or answer.startswith("❌"):
+            return  # 오류 응답은 캐시하지 않음
+
+        if tools:
+            collections = set().union(*(TOOL_COLLECTIONS.get(tool, {"data_files", "documents"}) for tool in tools))
+        else:
+            collections = {"data_files", "documents"}  # 사용 도구를 모르면 모든 컬렉션에 의존한다고 간주
+        ttl = ANSWER_CACHE_SENSOR_TTL if SENSOR_TOOLS & set(tools or []) or not tools else ANSWER_CACHE_TTL
+
+        key = normalize_prompt(prompt)
+        with self.lock:
+            self.entries[key] = {
+                "prompt": prompt,
+                "answer": answer,
+                "embedding": embedding,
+                "collections": collections,
+                "latency_sec": latency_sec,
+                "expires_at": time.time() + ttl,
+            }
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    # ✅ 3️⃣ 무효화 (업로드/삭제로 컬렉션이 바뀌면 해당 컬렉션에 의존하는 답변 제거)
+    def invalidate(self, collection_name: str = None):
+        with self.lock:
+            stale = [k for k, e in self.entries.items() if collection_name is None or collection_name in e["collections"]]
+            for key in stale:
+                del self.entries[key]
+            self.stats["invalidations"] += len(stale)
+        if stale:
+            print(f"🧹 답변 캐시 무효화: {collection_name or '전체'} ({len(stale)}개)")
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats["size"] = len(self.entries)
+        lookups = stats["exact_hits"] + stats["semantic_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["exact_hits"] + stats["semantic_hits"]) / lookups, 3) if lookups else 0.0
+        stats["saved_latency_sec"] = round(stats["saved_latency_sec"], 3)
+        return stats
+
+    # ✅ 내부 처리
+    def _embed(self, prompt: str):
+        if not self.embed_query:
+            return None
+        try:
+            return np.asarray(self.embed_query(prompt), dtype=np.float32)  # 정규화된 임베딩 → 내적 = 코사인 유사도
+        except Exception as e:
+            print(f"❌ 답변 캐시 임베딩 오류: {e}")
+            return None
+
+    def _expire(self):
+        now = time.time()
+        for key in [k for k, e in self.entries.items() if e["expires_at"] <= now]:
+            del self.entries[key]
+
+    def _record_hit(self, kind: str, entry: dict, start: float):
+        self.stats[kind] += 1
+        self.stats["saved_latency_sec"] += max(entry["latency_sec"] - (time.perf_counter() - start), 0.0)
+
+
+# ✅ 프로세스 공용 답변 캐시
+answer_cache = AnswerCache()
@@ -0,0 +1,36 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, asynccontextmanager
+from core.config import CHAT_WORKERS, STAGE_LIMITS
+
+# ✅ 블로킹 호출(LLM, 임베딩, ChromaDB)을 이벤트 루프 밖에서 실행하는 전용 스레드 풀
+executor = ThreadPoolExecutor(max_workers=CHAT_WORKERS, thread_name_prefix="chat")
+
+# ✅ 단계별 동시 실행 한도 (이벤트 루프용 / 워커 스레드용)
+_async_limits = {stage: asyncio.Semaphore(limit) for stage, limit in STAGE_LIMITS.items()}
+_thread_limits = {stage: threading.BoundedSemaphore(limit) for stage, limit in STAGE_LIMITS.items()}
+
+
+async def run_blocking(stage: str, func, *args, **kwargs):
+    """⚙️ 블로킹 함수를 스레드 풀에서 실행 (stage 동시 실행 한도 적용, contextvars 유지)"""
+    loop = asyncio.get_running_loop()
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    async with _async_limits[stage]:
+        return await loop.run_in_executor(executor, call)
+
+
+@asynccontextmanager
+async def async_stage_limit(stage: str):
+    """⚙️ 이벤트 루프에서 직접 실행되는 비동기 구간의 동시 실행 한도 (스트리밍 응답 등)"""
+    async with _async_limits[stage]:
+        yield
+
+
+@contextmanager
+def stage_limit(stage: str):
+    """⚙️ 워커 스레드 안에서 실행되는 블로킹 구간의 동시 실행 한도 (임베딩, ChromaDB 조회 등)"""
+    with _thread_limits[stage]:
+        yield
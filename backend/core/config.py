@@ -0,0 +1,128 @@
+import os
+
+# ✅ 업로드(임베딩) 파이프라인 설정 - 환경 변수로 조정 가능
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))  # 한 번에 임베딩할 문서 조각 수
+CHROMA_INSERT_BATCH_SIZE = int(os.getenv("CHROMA_INSERT_BATCH_SIZE", "512"))  # ChromaDB 일괄 저장 단위
+
+# ✅ 백그라운드 업로드 작업 큐 설정
+STORAGE_DIR = os.getenv("STORAGE_DIR", "storage")  # 작업 상태/업로드 원본 등 로컬 저장 위치
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))  # 동시에 처리할 업로드 작업 수
+
+# ✅ 업로드 스트리밍 / PDF 병렬 추출 설정
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))  # 업로드를 디스크로 옮길 때 읽는 단위 (bytes)
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(max(1, min(4, (os.cpu_count() or 2) // 2)))))  # PDF 페이지 추출 프로세스 수
+PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "8"))  # 프로세스 작업 1개당 페이지 수
+DATA_CHUNK_ROWS = int(os.getenv("DATA_CHUNK_ROWS", "50000"))  # CSV/XLSX/JSON 파일을 나눠 읽는 행 수
+EMBED_NUMERIC_TABLES = os.getenv("EMBED_NUMERIC_TABLES", "1") == "1"  # 0이면 숫자뿐인 센서 테이블은 행 임베딩 생략
+
+# ✅ /chat 동시 처리 설정 (블로킹 LLM/임베딩/ChromaDB 호출은 전용 스레드 풀에서 실행)
+CHAT_WORKERS = int(os.getenv("CHAT_WORKERS", "16"))  # 블로킹 호출용 스레드 수
+STAGE_LIMITS = {  # 단계별 동시 실행 한도
+    "context": int(os.getenv("CONTEXT_CONCURRENCY", "4")),  # context 모델(기본 mistral) ReAct 에이전트
+    "response": int(os.getenv("RESPONSE_CONCURRENCY", "2")),  # 응답 모델(기본 gemma:7b) 생성
+    "embed": int(os.getenv("EMBED_CONCURRENCY", "2")),  # 쿼리 임베딩
+    "chroma": int(os.getenv("CHROMA_CONCURRENCY", "8")),  # ChromaDB 조회
+    "tool": int(os.getenv("TOOL_CONCURRENCY", "8")),  # 라우터가 고른 도구 직접 실행
+    "rerank": int(os.getenv("RERANK_CONCURRENCY", "2")),  # cross-encoder 재정렬
+}
+
+# ✅ 사전 라우터 설정 (확실한 질문은 ReAct 에이전트 없이 바로 도구 실행)
+ROUTER_ENABLED = os.getenv("ROUTER_ENABLED", "1") == "1"
+ROUTER_MIN_CONFIDENCE = float(os.getenv("ROUTER_MIN_CONFIDENCE", "0.8"))  # 이 값 미만이면 LLM 에이전트로 폴백
+
+# ✅ SmartFarmBOTH 병렬 실행 설정 (분기별 제한 시간, 초)
+BOTH_DATA_TIMEOUT = float(os.getenv("BOTH_DATA_TIMEOUT", "30"))
+BOTH_RAG_TIMEOUT = float(os.getenv("BOTH_RAG_TIMEOUT", "30"))
+
+# ✅ 답변 캐시 설정 (반복/유사 질문은 에이전트 실행 없이 응답)
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "1") == "1"
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "256"))  # 최대 보관 답변 수 (LRU)
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "3600"))  # 문서 기반 답변 유지 시간 (초)
+ANSWER_CACHE_SENSOR_TTL = float(os.getenv("ANSWER_CACHE_SENSOR_TTL", "60"))  # 센서 데이터 기반 답변 유지 시간 (초)
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))  # 유사 질문으로 판단할 코사인 유사도
+
+# ✅ 공용 모델/클라이언트 레지스트리 설정
+CHROMA_MODE = os.getenv("CHROMA_MODE", "http")  # http: ChromaDB 서버 / persistent: 로컬 폴더 / ephemeral: 메모리 (벤치마크용)
+CHROMA_HOST = os.getenv("CHROMA_HOST", "localhost")
+CHROMA_PORT = int(os.getenv("CHROMA_PORT", "8000"))
+CHROMA_PATH = os.getenv("CHROMA_PATH", os.path.join(STORAGE_DIR, "chroma"))  # CHROMA_MODE=persistent 저장 위치
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "BAAI/bge-m3")
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE", "cpu")
+# torch: 기본 PyTorch / onnx: ONNX Runtime (EMBEDDING_ONNX_FILE로 int8 양자화 파일 지정 가능)
+#   예) EMBEDDING_BACKEND=onnx EMBEDDING_ONNX_FILE=onnx/model_qint8_avx512_vnni.onnx
+# hash: 모델 없이 단어 해시 벡터 사용 (오프라인 벤치마크용, core.offline.HashEmbeddings)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+HASH_EMBEDDING_DIM = int(os.getenv("HASH_EMBEDDING_DIM", "384"))
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "")
+WARMUP_MODELS = os.getenv("WARMUP_MODELS", "0") == "1"  # 서버 시작 시 모델 미리 로드
+
+# ✅ LLM 백엔드 (ollama: 실제 모델 / fake: core.offline.FakeReActLLM, GPU 없이 벤치마크용)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "ollama")
+FAKE_LLM_TOKEN_SEC = float(os.getenv("FAKE_LLM_TOKEN_SEC", "0.02"))  # 출력 토큰당 지연 (초)
+FAKE_LLM_PREFILL_SEC = float(os.getenv("FAKE_LLM_PREFILL_SEC", "0.0002"))  # 입력 토큰당 지연 (초)
+FAKE_LLM_MAX_TOKENS = int(os.getenv("FAKE_LLM_MAX_TOKENS", "64"))  # 응답 생성 시 최대 출력 토큰 수
+
+# ✅ LLM 모델 / Ollama 연결 (context 에이전트와 응답 생성이 서로 다른 모델 → 메모리가 부족하면 번갈아 재로드됨)
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+LLM_SINGLE_MODEL = os.getenv("LLM_SINGLE_MODEL", "")  # 지정하면 context/응답 모두 이 모델 사용 (한 모델만 상주, 재로드 없음)
+LLM_CONTEXT_MODEL = LLM_SINGLE_MODEL or os.getenv("LLM_CONTEXT_MODEL", "mistral")
+LLM_RESPONSE_MODEL = LLM_SINGLE_MODEL or os.getenv("LLM_RESPONSE_MODEL", "gemma:7b")
+_keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")  # 마지막 요청 후 모델을 메모리에 유지할 시간 ("30m", 초 단위 숫자, -1: 계속 유지)
+OLLAMA_KEEP_ALIVE = int(_keep_alive) if _keep_alive.lstrip("-").isdigit() else _keep_alive
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "120"))  # 응답 조각 사이 최대 대기 시간 (초, 기본 무제한 대신)
+OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+OLLAMA_MAX_CONNECTIONS = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "16"))  # 모든 모델이 함께 쓰는 HTTP 연결 풀 크기
+LLM_WARMUP = os.getenv("LLM_WARMUP", "1") == "1"  # 서버 시작 시 모델을 백그라운드에서 미리 메모리에 올림
+# 모델별 생성 요청 스케줄러 (core.llm_scheduler)
+LLM_MAX_LOADED_MODELS = int(os.getenv("LLM_MAX_LOADED_MODELS", "2"))  # 동시에 메모리에 둘 모델 수 (Ollama 서버의 OLLAMA_MAX_LOADED_MODELS와 맞춤, 1이면 같은 모델 요청을 묶어서 처리)
+LLM_PARALLEL = int(os.getenv("LLM_PARALLEL", "4"))  # 모델별 동시 생성 수 (Ollama 서버의 OLLAMA_NUM_PARALLEL과 맞춤)
+LLM_SWITCH_BATCH = int(os.getenv("LLM_SWITCH_BATCH", "8"))  # 다른 모델 요청이 기다리는 동안 현재 모델로 더 받을 요청 수
+LLM_SWITCH_MAX_WAIT = float(os.getenv("LLM_SWITCH_MAX_WAIT", "5"))  # 다른 모델 요청이 이만큼 기다리면 현재 모델 요청을 더 받지 않고 교체 (초)
+
+# ✅ 질문 임베딩 캐시 (정규화된 질문 텍스트 기준 LRU)
+QUERY_EMBED_CACHE_SIZE = int(os.getenv("QUERY_EMBED_CACHE_SIZE", "1024"))
+
+# ✅ RAG 하이브리드 검색 (BM25 + 벡터, Reciprocal Rank Fusion)
+RAG_HYBRID = os.getenv("RAG_HYBRID", "1") == "1"  # 0이면 벡터 검색만 사용 (비교용)
+RAG_RRF_K = int(os.getenv("RAG_RRF_K", "60"))  # RRF 점수 = Σ 1 / (k + 순위)
+
+# ✅ RAG 재정렬 / 컨텍스트 예산 (에이전트에 넘기는 문서 양 제한)
+RERANKER = os.getenv("RERANKER", "cross_encoder")  # cross_encoder | none
+RERANK_MODEL_NAME = os.getenv("RERANK_MODEL_NAME", "BAAI/bge-reranker-v2-m3")
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "16"))
+RERANK_TOP_N = int(os.getenv("RERANK_TOP_N", "6"))  # 재정렬 후 남길 문서 조각 수
+RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "4096"))  # (질문, 조각) → 점수 LRU
+RAG_CONTEXT_TOKENS = int(os.getenv("RAG_CONTEXT_TOKENS", "1500"))  # 문서 컨텍스트 토큰 예산 (0이면 제한/병합 없음)
+
+# ✅ 센서 데이터 요약 (행 전체 대신 센서별 최소/최대/평균/최신값 + 최근 행 일부만 에이전트에 전달)
+DATA_SAMPLE_ROWS = int(os.getenv("DATA_SAMPLE_ROWS", "5"))  # 테이블별로 함께 보여줄 최근 행 수
+DATA_VECTOR_TOP_K = int(os.getenv("DATA_VECTOR_TOP_K", "20"))  # 센서 저장소에 맞는 데이터가 없을 때 벡터 검색 결과 수
+
+# ✅ 응답 모델에 넘기는 컨텍스트 압축 (도구 결과 → 센서 통계 + 중복 제거된 문서 발췌, 출처 파일명 유지)
+RESPONSE_CONTEXT_TOKENS = int(os.getenv("RESPONSE_CONTEXT_TOKENS", "1000"))  # 토큰 예산 (0이면 압축 없이 context 에이전트 출력 그대로)
+CONTEXT_RECENT_ROWS = int(os.getenv("CONTEXT_RECENT_ROWS", "3"))  # 센서 요약마다 남길 최근 행 수 (예산이 남을 때만)
+CONTEXT_AGENT_NOTE_TOKENS = int(os.getenv("CONTEXT_AGENT_NOTE_TOKENS", "150"))  # context 에이전트 최종 답변을 함께 넘길 길이
+
+# ✅ 실시간 센서 수집 (요청마다 쓰지 않고 모아서 한 번에 저장)
+LIVE_FLUSH_INTERVAL = float(os.getenv("LIVE_FLUSH_INTERVAL", "0.2"))  # 최대 대기 시간 (초) → 조회 반영 지연의 상한
+LIVE_BATCH_ROWS = int(os.getenv("LIVE_BATCH_ROWS", "5000"))  # 이만큼 쌓이면 대기 시간 전이라도 저장
+LIVE_QUEUE_ROWS = int(os.getenv("LIVE_QUEUE_ROWS", "200000"))  # 저장 대기 행 상한 (넘으면 503으로 거절)
+
+# ✅ 단계별 지연 시간 추적 / 느린 요청 프로파일링
+TRACE_HISTORY = int(os.getenv("TRACE_HISTORY", "200"))  # /traces로 볼 수 있는 최근 채팅 수
+PROFILE_SLOW_SEC = float(os.getenv("PROFILE_SLOW_SEC", "0"))  # 0보다 크면 이 시간 이상 걸린 채팅의 스택 표본을 파일로 저장
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))  # 표본 수집할 채팅 비율 (오버헤드 조절)
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.01"))  # 스택 표본 간격 (초)
+
+# ✅ 웹 검색 폴백 (문서 검색 결과가 없을 때, 제한 시간 + 디스크 캐시 + 차단기 적용)
+WEB_SEARCH_URL = os.getenv("WEB_SEARCH_URL", "https://www.google.com/search")  # 로컬 스텁 서버 주소로 바꿔 테스트 가능
+WEB_SEARCH_RESULTS = int(os.getenv("WEB_SEARCH_RESULTS", "3"))  # 동시에 가져올 후보 페이지 수 (검색 순위가 높은 페이지 우선)
+WEB_CONNECT_TIMEOUT = float(os.getenv("WEB_CONNECT_TIMEOUT", "2"))  # 연결 제한 시간 (초)
+WEB_FETCH_TIMEOUT = float(os.getenv("WEB_FETCH_TIMEOUT", "4"))  # 검색/페이지 요청 1건 전체 제한 시간 (초, 조금씩 보내는 느린 서버 포함)
+WEB_SEARCH_DEADLINE = float(os.getenv("WEB_SEARCH_DEADLINE", "8"))  # 웹 검색 폴백 전체 제한 시간 (초)
+WEB_MAX_BYTES = int(os.getenv("WEB_MAX_BYTES", "1000000"))  # 페이지당 최대 다운로드 크기
+WEB_TEXT_CHARS = int(os.getenv("WEB_TEXT_CHARS", "5000"))  # 페이지당 본문 최대 글자 수
+WEB_MAX_CONNECTIONS = int(os.getenv("WEB_MAX_CONNECTIONS", "20"))  # 공용 HTTP 클라이언트 연결 수 상한
+WEB_CACHE_TTL = float(os.getenv("WEB_CACHE_TTL", "86400"))  # 검색 결과/페이지 본문 디스크 캐시 유지 시간 (초)
+WEB_BREAKER_FAILURES = int(os.getenv("WEB_BREAKER_FAILURES", "3"))  # 연속 실패 횟수 → 검색 엔진/사이트 호출 차단
+WEB_BREAKER_COOLDOWN = float(os.getenv("WEB_BREAKER_COOLDOWN", "60"))  # 차단 유지 시간 (초, 이후 1건 시험 호출)
@@ -0,0 +1,244 @@
+import re
+import threading
+from collections import Counter
+from core.config import RESPONSE_CONTEXT_TOKENS, CONTEXT_RECENT_ROWS, CONTEXT_AGENT_NOTE_TOKENS
+from core.context_packer import estimate_tokens, pack_passages, truncate_to_tokens
+
+# ✅ context 에이전트 → 응답 모델 사이 컨텍스트 압축 (도구 결과 형식을 읽어 구조 단위로 줄임)
+#    - 센서 요약(📄 파일: 조건에 맞는 N행 + 센서별 통계)은 통계만 먼저, 최근 행은 예산이 남을 때만
+#    - 벡터 검색 원본 행(📄 파일: 관련 행 N개) → 파일별 컬럼 통계 (숫자: 최소/최대/평균, 문자: 많이 나온 값)
+#    - 문서 조각(📄 문서: 파일명) → 같은 본문/겹침 제거 후 남은 예산 안에서 순위순 (ReAct가 같은 문서를 여러 번 찾아도 한 번만)
+#    - 웹 결과(🌍 [출처: URL]) → 남은 예산만큼 자름
+#    - 예산 때문에 빠진 조각이 있어도 마지막 줄에 모든 출처(파일명/URL)를 남김
+
+PASSAGE_HEADER = re.compile(r"^📄 문서: (.+)$")
+SENSOR_HEADER = re.compile(r"^📄 (.+?): 조건에 맞는 \d+행")
+ROWS_HEADER = re.compile(r"^📄 (.+?): 관련 행 \d+개$")
+WEB_HEADER = re.compile(r"^🌍 \[출처: (.+)\]$")
+SECTION_PREFIXES = ("📊 ", "📚 검색된 문서 데이터", "🌡", "📄 문서 검색 결과", "⏱")  # 도구 출력 머리글 (압축 결과에서 다시 붙임)
+DATE_COLUMNS = ("date", "datetime", "timestamp", "time", "날짜", "일시", "시간")
+TEXT_BLOCK_TOKENS = 100  # 안내/오류 등 기타 텍스트 블록당 최대 토큰
+HEADER_TOKENS = 40  # 다시 붙이는 머리글/[파일명] 몫으로 남겨 두는 토큰
+
+_stats_lock = threading.Lock()
+compress_stats = {"requests": 0, "tokens_in": 0, "tokens_out": 0, "duplicates": 0}
+
+
+# ✅ 1️⃣ 도구 출력 → 블록 목록
+def parse_blocks(text: str) -> list:
+    blocks, current = [], None
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith(SECTION_PREFIXES):
+            current = None
+            continue
+
+        header = None
+        for kind, pattern in (("passage", PASSAGE_HEADER), ("rows", ROWS_HEADER), ("sensor", SENSOR_HEADER),
+                              ("web", WEB_HEADER)):
+            match = pattern.match(stripped)
+            if match:
+                header = {"kind": kind, "source": match.group(1).strip(), "head": stripped, "lines": [], "recent": []}
+                break
+        if header:
+            current = header
+            blocks.append(current)
+            continue
+
+        if current and current["kind"] in ("sensor", "rows"):
+            if not stripped:
+                current = None
+            elif current["kind"] == "sensor" and stripped.startswith("- "):
+                current["lines"].append(stripped)
+            elif current["kind"] == "sensor" and re.match(r"^최근 \d+행:$", stripped):
+                continue
+            elif line.startswith("  "):
+                current["recent" if current["kind"] == "sensor" else "lines"].append(stripped)
+            else:
+                current = {"kind": "text", "lines": [line]}
+                blocks.append(current)
+            continue
+
+        if current is None:
+            if not stripped:
+                continue
+            current = {"kind": "text", "lines": []}
+            blocks.append(current)
+        current["lines"].append(line)
+    return blocks
+
+
+# ✅ 2️⃣ 원본 행 → 컬럼 통계
+def _format_number(value: float) -> str:
+    return f"{value:g}" if abs(value) < 1e6 else f"{value:.0f}"
+
+
+def summarize_rows(source: str, rows: list) -> list:
+    """"컬럼: 값, 컬럼: 값" 행 목록 → 파일 한 줄 + 컬럼별 한 줄"""
+    columns = {}
+    for row in rows:
+        last = None
+        for part in row.split(", "):
+            key, sep, value = part.partition(": ")
+            if sep:
+                last = columns.setdefault(key.strip(), [])
+                last.append(value.strip())
+            elif last:  # 값 안에 ", "가 있던 경우
+                last[-1] += f", {part}"
+
+    date_column = next((col for col in columns if col.lower() in DATE_COLUMNS), None)
+    head = f"📄 {source}: 관련 행 {len(rows)}개"
+    if date_column:
+        dates = sorted(columns[date_column])
+        head += f" ({dates[0]} ~ {dates[-1]})"
+    lines = [head]
+    for col, values in columns.items():
+        if col == date_column:
+            continue
+        try:
+            numbers = [float(value) for value in values]
+        except ValueError:
+            numbers = None
+        if numbers:
+            lines.append(f"- {col}: 최소 {_format_number(min(numbers))}, 최대 {_format_number(max(numbers))}, "
+                         f"평균 {_format_number(round(sum(numbers) / len(numbers), 2))}")
+        else:
+            counts = Counter(values)
+            text = ", ".join(f"{value}({count})" for value, count in counts.most_common(3))
+            lines.append(f"- {col}: {text}" + (f" 외 {len(counts) - 3}종" if len(counts) > 3 else ""))
+    return lines
+
+
+def _fit_lines(lines: list, budget: int) -> list:
+    """앞에서부터 예산 안에 들어가는 줄까지만"""
+    kept = []
+    for line in lines:
+        budget -= estimate_tokens(line)
+        if budget < 0:
+            break
+        kept.append(line)
+    return kept
+
+
+# ✅ 3️⃣ 압축
+def compress_context(outputs: list, note: str = "", budget: int = RESPONSE_CONTEXT_TOKENS) -> tuple:
+    """📦 도구 결과 텍스트 목록 (+ context 에이전트 최종 답변) → (응답 모델용 컨텍스트, 토큰 통계)
+
+    budget이 0 이하면 압축하지 않음 (에이전트 최종 답변, 없으면 도구 결과 그대로 = 기존 동작)
+    """
+    outputs = [str(output) for output in outputs if output]
+    if note.startswith("Agent stopped"):  # 반복 한도 초과 안내문은 답변이 아님
+        note = ""
+    raw = note if budget <= 0 and note else "\n\n".join(outputs) or note
+    stats = {"tokens_in": estimate_tokens("\n\n".join(outputs + [note]))}
+    if budget <= 0:
+        stats.update(tokens_out=estimate_tokens(raw), duplicates=0)
+        return raw, stats
+    if not outputs:
+        context = truncate_to_tokens(note, budget)
+        stats.update(tokens_out=estimate_tokens(context), duplicates=0)
+        _record(stats)
+        return context, stats
+
+    blocks = [block for output in outputs for block in parse_blocks(output)]
+    seen, duplicates = set(), 0
+    sensors, rows, passages, webs, texts, sources = [], {}, [], [], [], []
+    for block in blocks:
+        kind = block["kind"]
+        key = (kind, block.get("source"), "\n".join(block["lines"]).strip())
+        if kind != "rows" and key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        if block.get("source") and block["source"] not in sources:
+            sources.append(block["source"])
+        if kind == "sensor":
+            sensors.append(block)
+        elif kind == "rows":
+            known = rows.setdefault(block["source"], [])
+            duplicates += sum(row in known for row in block["lines"])
+            known.extend(row for row in block["lines"] if row not in known)
+        elif kind == "passage":
+            passages.append((len(passages), "\n".join(block["lines"]).strip(), 0.0, block["source"]))
+        elif kind == "web":
+            webs.append(block)
+        else:
+            texts.append(truncate_to_tokens("\n".join(block["lines"]).strip(), TEXT_BLOCK_TOKENS))
+
+    # 센서 통계 → 기타 텍스트 → 에이전트 답변 → 문서 → 웹 → (남으면) 최근 행 순서로 예산 사용
+    # (표가 많거나 넓어 예산을 넘으면 뒤쪽 섹션의 줄부터 버림, 출처 줄은 항상 유지)
+    source_line = f"📎 출처: {', '.join(sources)}" if sources else ""
+    used = HEADER_TOKENS + estimate_tokens(source_line)
+    sensor_sections, complete = [], []
+    for section in [[block["head"]] + block["lines"] for block in sensors] + \
+                   [summarize_rows(source, source_rows) for source, source_rows in rows.items()]:
+        kept = _fit_lines(section, budget - used)
+        sensor_sections.append(kept)
+        complete.append(len(kept) == len(section))
+        used += estimate_tokens("\n".join(kept))
+    kept_texts = []
+    for text in texts:
+        text = truncate_to_tokens(text, budget - used) if used < budget else ""
+        if text:
+            kept_texts.append(text)
+            used += estimate_tokens(text)
+    texts = kept_texts
+    note_text = truncate_to_tokens(note, min(CONTEXT_AGENT_NOTE_TOKENS, budget - used)) if note and used < budget else ""
+    used += estimate_tokens(note_text)
+
+    packed, pack_stats = pack_passages(passages, max(0, budget - used)) if passages and used < budget else ([], {})
+    used += sum(estimate_tokens(text) for _, text in packed)
+    web_texts = []
+    for block in webs:
+        remaining = budget - used
+        if remaining <= 0:
+            break
+        text = truncate_to_tokens("\n".join(block["lines"]).strip(), remaining)
+        web_texts.append((block["source"], text))
+        used += estimate_tokens(text)
+    for section, block, whole in zip(sensor_sections, sensors, complete):
+        if not whole:
+            continue
+        for row in block["recent"][-CONTEXT_RECENT_ROWS:] if CONTEXT_RECENT_ROWS > 0 else []:
+            cost = estimate_tokens(row)
+            if used + cost > budget:
+                break
+            section.append(f"  최근: {row}")
+            used += cost
+
+    parts = []
+    if any(sensor_sections):
+        parts.append("🌡️ 센서 데이터 요약:\n" + "\n".join("\n".join(section) for section in sensor_sections if section))
+    if packed:
+        parts.append("📄 문서 발췌:\n" + "\n\n".join(f"[{filename}]\n{text}" for filename, text in packed))
+    parts += [f"🌍 웹 검색 결과 (출처: {source}):\n{text}" for source, text in web_texts]
+    parts += texts
+    if note_text:
+        parts.append(f"🧠 context 에이전트 정리: {note_text}")
+    if source_line:
+        parts.append(source_line)
+    context = "\n\n".join(parts)
+
+    stats.update(tokens_out=estimate_tokens(context), duplicates=duplicates,
+                 passages_in=len(passages), passages_out=pack_stats.get("passages_out", 0))
+    _record(stats)
+    return context, stats
+
+
+def _record(stats: dict):
+    with _stats_lock:
+        compress_stats["requests"] += 1
+        for key in ("tokens_in", "tokens_out", "duplicates"):
+            compress_stats[key] += stats[key]
+
+
+def get_stats() -> dict:
+    """📈 요청당 평균 응답 컨텍스트 토큰 수 (압축 전 → 후)"""
+    with _stats_lock:
+        stats = dict(compress_stats)
+    requests = stats["requests"]
+    stats["avg_tokens_in"] = round(stats["tokens_in"] / requests, 1) if requests else 0.0
+    stats["avg_tokens_out"] = round(stats["tokens_out"] / requests, 1) if requests else 0.0
+    stats["reduction"] = round(1 - stats["tokens_out"] / stats["tokens_in"], 3) if stats["tokens_in"] else 0.0
+    stats["token_budget"] = RESPONSE_CONTEXT_TOKENS
+    return stats
@@ -0,0 +1,95 @@
+import re
+
+# ✅ 에이전트에 넘길 문서 컨텍스트 구성 (토큰 예산 안에서 중복/겹침 제거)
+#    CharacterTextSplitter(chunk_overlap=100) 때문에 같은 파일의 연속 조각은 앞뒤가 겹침 → 한 번만 포함
+
+MIN_OVERLAP = 20  # 이보다 짧은 겹침은 우연한 일치로 보고 연속 조각으로 취급하지 않음
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 LLM 토큰 수 (한글 음절 1개 ≈ 1토큰, 영문/숫자 단어·기호 1개 ≈ 1토큰)"""
+    return len(re.findall(r"[가-힣]|[A-Za-z0-9]+|[^\sA-Za-z0-9가-힣]", text))
+
+
+def overlap_size(previous: str, text: str, max_overlap: int = 300) -> int:
+    """앞 조각의 끝부분과 겹치는 text 앞부분의 길이"""
+    for size in range(min(max_overlap, len(previous), len(text)), 0, -1):
+        if previous.endswith(text[:size]):
+            return size
+    return 0
+
+
+def trim_overlap(previous: str, text: str, max_overlap: int = 300) -> str:
+    """앞 조각의 끝부분과 겹치는 text의 앞부분 제거"""
+    return text[overlap_size(previous, text, max_overlap):].lstrip()
+
+
+def follows(previous: str, text: str) -> bool:
+    """text가 previous 바로 다음 조각인지 (조각 id는 내용 해시라 순서 정보가 없음 → 분할 겹침으로 판단)"""
+    return overlap_size(previous, text) >= MIN_OVERLAP
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    kept = []
+    for match in re.finditer(r"[가-힣]|[A-Za-z0-9]+|[^\sA-Za-z0-9가-힣]", text):
+        if len(kept) >= budget:
+            return text[:kept[-1]] + " …" if kept else ""
+        kept.append(match.end())
+    return text
+
+
+def pack_passages(passages: list, token_budget: int) -> tuple:
+    """📦 순위순 문서 조각 [(id, 문서, 점수, 파일명)] → 예산 안의 [(파일명, 본문)] + 토큰 통계
+
+    - 본문이 같은 조각은 한 번만 포함
+    - 같은 파일의 앞/뒤 조각이 이미 포함됐다면 겹치는 부분을 잘라내고 이어 붙임
+    - 예산을 넘는 조각은 건너뛰고 (첫 조각은 잘라서라도 포함) 다음 조각으로 계속
+    """
+    stats = {"passages_in": len(passages), "tokens_in": sum(estimate_tokens(p[1]) for p in passages)}
+    sections = {}  # 파일명 → 이어 붙인 구간 [{"pieces": [겹침 제거된 본문], "first": 첫 조각 원문, "last": 끝 조각 원문}]
+    seen_texts = set()
+    used = selected = 0
+
+    for _, text, _, filename in passages:
+        if text in seen_texts:
+            continue
+        segments = sections.setdefault(filename, [])
+        before = next((seg for seg in segments if follows(seg["last"], text)), None)
+        after = next((seg for seg in segments if seg is not before and follows(text, seg["first"])), None)
+        piece = trim_overlap(before["last"], text) if before else text
+
+        cost = estimate_tokens(piece)
+        if used + cost > token_budget:
+            if selected:
+                continue
+            piece = truncate_to_tokens(piece, token_budget)
+            cost = estimate_tokens(piece)
+
+        if after:  # 뒤 조각이 먼저 뽑혔다면 그쪽 앞부분의 겹침 제거
+            trimmed = trim_overlap(text, after["pieces"][0])
+            used -= estimate_tokens(after["pieces"][0]) - estimate_tokens(trimmed)
+            after["pieces"][0] = trimmed
+
+        if before and after:  # 두 구간 사이를 잇는 조각 → 하나로 합침
+            before["pieces"] += [piece] + after["pieces"]
+            before["last"] = after["last"]
+            segments.remove(after)
+        elif before:
+            before["pieces"].append(piece)
+            before["last"] = text
+        elif after:
+            after["pieces"].insert(0, piece)
+            after["first"] = text
+        else:
+            segments.append({"pieces": [piece], "first": text, "last": text})
+
+        seen_texts.add(text)
+        selected += 1
+        used += cost
+
+    packed = [(filename, "\n…\n".join("\n".join(seg["pieces"]) for seg in segments))
+              for filename, segments in sections.items() if segments]
+
+    stats["passages_out"] = selected
+    stats["tokens_out"] = sum(estimate_tokens(text) for _, text in packed)
+    return packed, stats
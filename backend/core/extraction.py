@@ -1,7 +1,19 @@
 import hashlib
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 import fitz  # PyMuPDF for PDF
 import docx
 import chardet  # 문자 인코딩 감지
+from core.config import PDF_WORKERS, PDF_PAGES_PER_TASK
+
+REFERENCE_KEYWORDS = ["참고 문헌", "참고문헌", "References", "REFERENCES", "참 고 문 헌"]
+PDF_EMPTY_MESSAGE = "⚠️ PDF에서 텍스트를 제대로 추출하지 못했습니다. (OCR 필요 가능성 있음)"
+
+# ✅ PDF 페이지 추출용 프로세스 풀 (처음 사용할 때 생성, 프로세스 전체 공유)
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
 
 def calculate_file_hash(file_content: bytes) -> str:
     """SHA256 해시값 생성"""
@@ -11,7 +23,7 @@ def extract_text_from_pdf(file_content: bytes) -> list:
     """📄 PDF에서 텍스트 추출 (참고문헌 이후 제외) → 페이지별 리스트 반환"""
     doc = fitz.open(stream=file_content, filetype="pdf")
     all_pages = []  # 페이지별 텍스트 저장
-    ignore_keywords = ["참고 문헌", "참고문헌", "References", "REFERENCES", "참 고 문 헌"]
+    ignore_keywords = REFERENCE_KEYWORDS
 
     exclude_text = False  # 참고문헌 감지 후 이후 페이지 무시
 
@@ -28,11 +40,98 @@ def extract_text_from_pdf(file_content: bytes) -> list:
             all_pages.append(page_text)  # ✅ 페이지별 리스트로 저장
 
     if not all_pages:
-        return ["⚠️ PDF에서 텍스트를 제대로 추출하지 못했습니다. (OCR 필요 가능성 있음)"]
+        return [PDF_EMPTY_MESSAGE]
 
     return all_pages  # ✅ 이제 리스트 반환
 
 
+def _extract_page_range(path: str, start: int, end: int) -> list:
+    """(워커 프로세스) PDF 파일 경로에서 [start, end) 페이지 텍스트 추출"""
+    with fitz.open(path) as doc:
+        return [doc[page_num].get_text("text").strip() for page_num in range(start, end)]
+
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # 서버 프로세스는 이미 여러 스레드(임베딩/HTTP/작업 워커)가 돌고 있어 fork하면 잠긴 상태로 복사된 락에 자식이 멈출 수 있음
+            # → forkserver(없으면 spawn)로 깨끗한 프로세스에서 시작 (워커는 경로와 페이지 범위만 받음)
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            context = multiprocessing.get_context(method)
+            if method == "forkserver":
+                context.set_forkserver_preload(["core.extraction"])
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=context)
+    return _pdf_pool
+
+
+def iter_pdf_pages(path: str, page_progress: dict = None):
+    """📄 PDF 파일을 페이지 묶음 단위로 여러 프로세스에서 병렬 추출 → 페이지 텍스트를 순서대로 yield
+
+    - 파일 전체를 메모리에 올리지 않음 (워커가 경로로 직접 열기)
+    - 동시에 처리 중인 묶음은 워커 수의 2배까지 → 메모리 사용량이 파일 크기와 무관
+    - 참고문헌 페이지를 만나면 남은 작업을 취소하고 중단 (extract_text_from_pdf와 동일 기준)
+    - page_progress: {"done", "total"} 페이지 진행 상황을 기록할 dict (진행률 추정용)
+    """
+    with fitz.open(path) as doc:
+        page_count = doc.page_count
+    if page_progress is not None:
+        page_progress.update(done=0, total=page_count)
+
+    ranges = iter([(start, min(start + PDF_PAGES_PER_TASK, page_count))
+                   for start in range(0, page_count, PDF_PAGES_PER_TASK)])
+    parallel = PDF_WORKERS > 1 and page_count > PDF_PAGES_PER_TASK  # 작은 PDF는 현재 프로세스에서 처리
+    window_size = PDF_WORKERS * 2 if parallel else 1
+
+    window = deque()  # (시작 페이지, Future) 처리 중인 묶음
+    yielded = False
+    try:
+        while True:
+            while len(window) < window_size:
+                page_range = next(ranges, None)
+                if page_range is None:
+                    break
+                window.append((page_range[0], _submit_page_range(path, *page_range, parallel=parallel)))
+            if not window:
+                break
+
+            start, future = window.popleft()
+            page_texts, found_references = _collect_pages(start, future.result(), page_progress)
+            for page_text in page_texts:
+                yielded = True
+                yield page_text
+            if found_references:
+                break
+    finally:
+        for _, future in window:
+            future.cancel()
+
+    if not yielded:
+        yield PDF_EMPTY_MESSAGE
+
+
+def _submit_page_range(path: str, start: int, end: int, parallel: bool) -> Future:
+    if parallel:
+        return get_pdf_pool().submit(_extract_page_range, path, start, end)
+    future = Future()
+    future.set_result(_extract_page_range(path, start, end))
+    return future
+
+
+def _collect_pages(start: int, page_texts: list, page_progress: dict = None):
+    """추출된 페이지 묶음 → (빈 페이지 제외 텍스트 목록, 참고문헌 감지 여부)"""
+    collected = []
+    for offset, page_text in enumerate(page_texts):
+        if any(keyword in page_text for keyword in REFERENCE_KEYWORDS):
+            print(f"🔍 참고문헌 감지됨! (페이지 {start + offset + 1}) 이후 텍스트 제외")
+            return collected, True
+        if page_progress is not None:
+            page_progress["done"] = start + offset + 1
+        if page_text:
+            collected.append(page_text)
+    return collected, False
+
+
 def extract_text_from_docx(file_content: bytes) -> str:
     """📄 DOCX 파일에서 텍스트 추출 (목차 제외, 본문 유지)"""
     from io import BytesIO
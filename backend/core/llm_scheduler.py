@@ -0,0 +1,250 @@
+import time
+import asyncio
+import threading
+from collections import Counter
+from contextlib import contextmanager, asynccontextmanager
+from typing import Any, Optional
+import httpx
+import ollama
+from pydantic import Field, model_validator
+from langchain_ollama import OllamaLLM
+from core.config import (OLLAMA_BASE_URL, OLLAMA_KEEP_ALIVE, OLLAMA_TIMEOUT, OLLAMA_CONNECT_TIMEOUT,
+                         OLLAMA_MAX_CONNECTIONS, LLM_MAX_LOADED_MODELS, LLM_PARALLEL, LLM_SWITCH_BATCH,
+                         LLM_SWITCH_MAX_WAIT)
+
+# ✅ Ollama 생성 요청 관리
+#    - 모든 모델이 하나의 HTTP 연결 풀 공유 (모델마다 클라이언트를 만들지 않음, 제한 시간 적용)
+#    - 요청마다 keep_alive 전달 → Ollama 기본값(5분)이 지나도 모델이 내려가지 않음
+#    - ModelScheduler: 메모리에 둘 수 있는 모델 수보다 많은 모델이 번갈아 요청되면 같은 모델 요청을 묶어서 처리
+#      (mistral → gemma → mistral ... 순서 그대로 보내면 Ollama가 요청마다 모델을 내렸다 다시 올림)
+COLD_LOAD_SEC = 0.5  # Ollama가 알려준 load_duration이 이보다 길면 모델 로드를 기다린 요청으로 집계
+
+
+class _Waiter:
+    __slots__ = ("model", "since", "notify")
+
+    def __init__(self, model: str, notify):
+        self.model = model
+        self.since = time.monotonic()
+        self.notify = notify
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class ModelScheduler:
+    """🚦 모델별 생성 슬롯
+
+    - 올라와 있는 모델: 모델별 parallel개까지 바로 실행
+    - 올라와 있지 않은 모델: 빈 자리가 있으면 올림, 없으면 실행 중인 요청이 없는 모델을 내리고 교체
+    - 다른 모델이 기다리는 중이면 현재 모델은 switch_batch건 더 받거나 상대가 max_wait만큼 기다린 뒤 새 요청을 멈춤
+      (같은 모델 요청을 묶되 한 모델만 계속 처리되지는 않도록)
+    """
+
+    def __init__(self, max_loaded: int = LLM_MAX_LOADED_MODELS, parallel: int = LLM_PARALLEL,
+                 switch_batch: int = LLM_SWITCH_BATCH, max_wait: float = LLM_SWITCH_MAX_WAIT):
+        self.max_loaded = max(1, max_loaded)
+        self.parallel = max(1, parallel)
+        self.switch_batch = switch_batch
+        self.max_wait = max_wait
+        self.lock = threading.Lock()
+        self.waiters = []  # 도착 순서
+        self.loaded = []  # 스케줄러가 올려 둔 모델 (앞쪽이 오래 안 쓴 모델)
+        self.running = Counter()
+        self.burst = Counter()  # 다른 모델이 기다리는 동안 추가로 받은 요청 수
+        self.stats = {"switches": 0, "cold_requests": 0, "load_sec": 0.0}  # cold_requests: 모델 로드를 기다린 생성 요청 수
+        self.model_stats = {}
+
+    # ✅ 1️⃣ 슬롯 획득/반납
+    def acquire(self, model: str):
+        event = threading.Event()
+        self._enqueue(_Waiter(model, event.set))
+        event.wait()
+
+    async def aacquire(self, model: str):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = _Waiter(model, lambda: loop.call_soon_threadsafe(_resolve, future))
+        self._enqueue(waiter)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self.lock:
+                granted = waiter not in self.waiters
+                if not granted:
+                    self.waiters.remove(waiter)
+            if granted:
+                self.release(model)
+            raise
+
+    def release(self, model: str):
+        with self.lock:
+            self.running[model] -= 1
+            self._dispatch()
+
+    @contextmanager
+    def slot(self, model: str):
+        self.acquire(model)
+        try:
+            yield
+        finally:
+            self.release(model)
+
+    @asynccontextmanager
+    async def aslot(self, model: str):
+        await self.aacquire(model)
+        try:
+            yield
+        finally:
+            self.release(model)
+
+    # ✅ 2️⃣ 배정
+    def _enqueue(self, waiter: _Waiter):
+        with self.lock:
+            self.waiters.append(waiter)
+            self._dispatch()
+
+    def _dispatch(self):
+        now = time.monotonic()
+        for waiter in list(self.waiters):
+            if self._can_admit(waiter.model, now):
+                self._admit(waiter, now)
+
+    def _oldest_unloaded_wait(self, now: float):
+        """올라와 있지 않은 모델 요청 중 가장 오래 기다린 시간 (없으면 None)"""
+        waits = [now - waiter.since for waiter in self.waiters if waiter.model not in self.loaded]
+        return max(waits) if waits else None
+
+    def _should_yield(self, model: str, now: float) -> bool:
+        waited = self._oldest_unloaded_wait(now)
+        return waited is not None and (self.burst[model] >= self.switch_batch or waited >= self.max_wait)
+
+    def _victim(self, now: float):
+        """내려도 되는 모델: 실행 중인 요청이 없고, 기다리는 요청이 없거나 이미 충분히 처리한 모델 (오래 안 쓴 순)"""
+        waiting = {waiter.model for waiter in self.waiters}
+        for model in self.loaded:
+            if self.running[model] == 0 and (model not in waiting or self._should_yield(model, now)):
+                return model
+        return None
+
+    def _can_admit(self, model: str, now: float) -> bool:
+        if self.running[model] >= self.parallel:
+            return False
+        if model in self.loaded:
+            return not self._should_yield(model, now)
+        return len(self.loaded) < self.max_loaded or self._victim(now) is not None
+
+    def _admit(self, waiter: _Waiter, now: float):
+        model = waiter.model
+        self.waiters.remove(waiter)
+        if model in self.loaded:
+            self.loaded.remove(model)
+        else:
+            if len(self.loaded) >= self.max_loaded:
+                self.loaded.remove(self._victim(now))
+                self.stats["switches"] += 1
+            self.burst[model] = 0
+        self.loaded.append(model)
+        self.burst[model] = self.burst[model] + 1 if self._oldest_unloaded_wait(now) is not None else 0
+        self.running[model] += 1
+
+        stats = self._model_stats(model)
+        stats["requests"] += 1
+        stats["wait_sec"] += now - waiter.since
+        stats["max_wait_sec"] = max(stats["max_wait_sec"], now - waiter.since)
+        waiter.notify()
+
+    # ✅ 3️⃣ 통계 (Ollama 응답의 load_duration으로 실제 모델 로드 집계)
+    def record_load(self, model: str, load_sec: float):
+        if load_sec >= COLD_LOAD_SEC:
+            with self.lock:
+                self.stats["cold_requests"] += 1
+                self.stats["load_sec"] += load_sec
+                self._model_stats(model)["cold_requests"] += 1
+
+    def _model_stats(self, model: str) -> dict:
+        return self.model_stats.setdefault(model, {"requests": 0, "wait_sec": 0.0, "max_wait_sec": 0.0,
+                                                   "cold_requests": 0})
+
+    def get_stats(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats["loaded"] = list(self.loaded)
+            stats["queued"] = len(self.waiters)
+            stats["running"] = sum(self.running.values())
+            models = {}
+            for model, values in self.model_stats.items():
+                requests = values["requests"]
+                models[model] = {"requests": requests, "running": self.running[model],
+                                 "queued": sum(waiter.model == model for waiter in self.waiters),
+                                 "avg_wait_sec": round(values["wait_sec"] / requests, 3) if requests else 0.0,
+                                 "max_wait_sec": round(values["max_wait_sec"], 3),
+                                 "cold_requests": values["cold_requests"]}
+        stats["load_sec"] = round(stats["load_sec"], 3)
+        stats["models"] = models
+        stats["max_loaded"] = self.max_loaded
+        return stats
+
+
+llm_scheduler = ModelScheduler()
+
+
+# ✅ 4️⃣ 공용 Ollama 클라이언트 (base_url별 동기/비동기 1개씩, 비동기는 서버 이벤트 루프에서만 사용)
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def shared_clients(base_url: str = OLLAMA_BASE_URL) -> tuple:
+    with _clients_lock:
+        clients = _clients.get(base_url)
+        if clients is None:
+            options = {
+                "timeout": httpx.Timeout(OLLAMA_TIMEOUT, connect=OLLAMA_CONNECT_TIMEOUT),
+                "limits": httpx.Limits(max_connections=OLLAMA_MAX_CONNECTIONS,
+                                       max_keepalive_connections=OLLAMA_MAX_CONNECTIONS),
+            }
+            clients = _clients[base_url] = (ollama.Client(host=base_url, **options),
+                                            ollama.AsyncClient(host=base_url, **options))
+    return clients
+
+
+class PooledOllamaLLM(OllamaLLM):
+    """🦙 OllamaLLM + 공용 연결 풀 + 스케줄러 슬롯 안에서만 생성 (스트리밍/일반 호출 모두)"""
+
+    scheduler: Optional[Any] = Field(default=None, exclude=True)  # 없으면 공용 llm_scheduler
+
+    @model_validator(mode="after")
+    def _set_clients(self):
+        self._client, self._async_client = shared_clients(self.base_url or OLLAMA_BASE_URL)
+        return self
+
+    def _get_scheduler(self) -> ModelScheduler:
+        return self.scheduler or llm_scheduler
+
+    def _record(self, part):
+        if not isinstance(part, str) and part.get("done"):
+            self._get_scheduler().record_load(self.model, (part.get("load_duration") or 0) / 1e9)
+
+    def _create_generate_stream(self, prompt: str, stop=None, **kwargs):
+        with self._get_scheduler().slot(self.model):
+            for part in super()._create_generate_stream(prompt, stop, **kwargs):
+                self._record(part)
+                yield part
+
+    async def _acreate_generate_stream(self, prompt: str, stop=None, **kwargs):
+        async with self._get_scheduler().aslot(self.model):
+            async for part in super()._acreate_generate_stream(prompt, stop, **kwargs):
+                self._record(part)
+                yield part
+
+
+def preload(model: str, scheduler: ModelScheduler = None, base_url: str = OLLAMA_BASE_URL) -> float:
+    """🔥 모델을 메모리에 올림 (프롬프트 없는 생성 요청 = Ollama의 모델 로드 요청)"""
+    scheduler = scheduler or llm_scheduler
+    start = time.perf_counter()
+    with scheduler.slot(model):
+        response = shared_clients(base_url)[0].generate(model=model, prompt="", keep_alive=OLLAMA_KEEP_ALIVE)
+    scheduler.record_load(model, (response.get("load_duration") or 0) / 1e9)
+    return time.perf_counter() - start
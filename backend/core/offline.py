@@ -0,0 +1,103 @@
+import re
+import time
+import hashlib
+from typing import Any, Iterator, List, Optional
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.llms import LLM
+from langchain_core.outputs import GenerationChunk
+from core.config import FAKE_LLM_TOKEN_SEC, FAKE_LLM_PREFILL_SEC, FAKE_LLM_MAX_TOKENS, HASH_EMBEDDING_DIM
+
+# ✅ GPU/네트워크 없이 전체 파이프라인을 돌리기 위한 대체 백엔드 (벤치마크/개발용)
+#    - EMBEDDING_BACKEND=hash → HashEmbeddings (단어/음절 bigram 해시 → 고정 차원 벡터)
+#    - LLM_BACKEND=fake → FakeReActLLM (같은 입력이면 항상 같은 출력, 토큰당 지연 시간 흉내)
+
+TOKEN_PATTERN = re.compile(r"[가-힣]+|[A-Za-z0-9]+")
+SENSOR_KEYWORDS = ("온도", "습도", "CO2", "조도", "센서", "오늘", "현재", "지금")
+
+
+def _tokens(text: str) -> list:
+    return TOKEN_PATTERN.findall(text)
+
+
+class HashEmbeddings(Embeddings):
+    """🔢 단어 + 한글 음절 bigram을 해시해 더한 정규화 벡터 (모델 다운로드 없음, 같은 단어가 많을수록 유사)"""
+
+    def __init__(self, dim: int = HASH_EMBEDDING_DIM):
+        self.dim = dim
+
+    def _embed(self, text: str) -> list:
+        vector = np.zeros(self.dim)
+        for word in _tokens(text.lower()):
+            features = [word] + [word[i:i + 2] for i in range(len(word) - 1)]
+            for feature in features:
+                value = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+                vector[value % self.dim] += 1.0 if value >> 63 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+class FakeReActLLM(LLM):
+    """🤖 Ollama 대체 LLM
+
+    - ReAct 에이전트 프롬프트: 첫 호출은 질문에 맞는 도구 Action, Observation이 생기면 Final Answer
+    - 그 외 (응답 생성): 문맥 앞부분 단어로 답변
+    - 입력 토큰당 FAKE_LLM_PREFILL_SEC, 출력 토큰당 FAKE_LLM_TOKEN_SEC만큼 대기
+    """
+
+    model: str = "fake"
+    token_sec: float = FAKE_LLM_TOKEN_SEC
+    prefill_sec: float = FAKE_LLM_PREFILL_SEC
+    max_tokens: int = FAKE_LLM_MAX_TOKENS
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-react"
+
+    def respond(self, prompt: str) -> str:
+        if "Action Input" in prompt and "\nQuestion:" in prompt:
+            return self._react_step(prompt)
+        return self._answer(prompt)
+
+    def _react_step(self, prompt: str) -> str:
+        scratchpad = prompt.rsplit("\nQuestion:", 1)[1]
+        question = scratchpad.split("\n", 1)[0].strip()
+        observations = re.findall(r"Observation:(.*?)(?=\nThought:|$)", scratchpad, re.S)
+        if observations:
+            return f" 도구 결과로 답할 수 있습니다.\nFinal Answer: {' '.join(observations[-1].split())[:300]}"
+
+        match = re.search(r"should be one of \[(.*?)\]", prompt)
+        tools = [name.strip() for name in match.group(1).split(",")] if match else []
+        if "SmartFarmData" in tools and any(keyword in question for keyword in SENSOR_KEYWORDS):
+            tool = "SmartFarmData"
+        else:
+            tool = "SmartFarmRAG" if "SmartFarmRAG" in tools else (tools[0] if tools else "SmartFarmUnknown")
+        return f" {tool} 도구로 확인해야 합니다.\nAction: {tool}\nAction Input: {question}"
+
+    def _answer(self, prompt: str) -> str:
+        context = prompt.split("문맥:", 1)[-1].split("###", 1)[0]  # response_prompt의 문맥 부분
+        words = _tokens(context)[:max(0, self.max_tokens - 2)]
+        return "문맥에 따르면 " + " ".join(words)
+
+    def _stream(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None,
+                **kwargs: Any) -> Iterator[GenerationChunk]:
+        prompt_tokens = len(_tokens(prompt))
+        time.sleep(self.prefill_sec * prompt_tokens)
+        pieces = re.findall(r"\S+\s*|\s+", self.respond(prompt))
+        for piece in pieces:
+            time.sleep(self.token_sec)
+            chunk = GenerationChunk(text=piece)
+            if run_manager:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+        yield GenerationChunk(text="", generation_info={"done": True, "prompt_eval_count": prompt_tokens,
+                                                        "eval_count": len(pieces)})
+
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> str:
+        return "".join(chunk.text for chunk in self._stream(prompt, stop, None, **kwargs))
@@ -0,0 +1,84 @@
+import re
+import threading
+import contextvars
+from collections import OrderedDict
+from core.config import QUERY_EMBED_CACHE_SIZE
+from core.concurrency import stage_limit
+from core.registry import get_embedding_model
+from core.tracing import span
+
+# ✅ 질문 임베딩 LRU 캐시 (같은/거의 같은 Action Input 반복 시 재인코딩 방지)
+_cache = OrderedDict()  # 정규화된 질문 → 임베딩
+_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0, "encodes": 0, "batches": 0, "chats": 0, "chat_encodes": 0}
+
+# ✅ 채팅 1회 동안의 인코딩 횟수 (contextvars → run_blocking/BOTH 스레드에서도 같은 카운터 공유)
+_chat_counter = contextvars.ContextVar("query_embed_chat_counter", default=None)
+
+
+def normalize_query(text: str) -> str:
+    """공백/대소문자/따옴표/끝 문장부호 차이를 무시한 캐시 키"""
+    return re.sub(r"\s+", " ", text).strip().strip("\"'`").lower().rstrip("?!.~ ")
+
+
+def embed_queries(queries: list) -> list:
+    """🧮 여러 질문을 한 번에 임베딩 (캐시에 없는 질문만 모아서 한 번의 forward pass)"""
+    keys = [normalize_query(query) for query in queries]
+    results = {}
+    with _lock:
+        for key in keys:
+            if key in _cache:
+                _cache.move_to_end(key)
+                results[key] = _cache[key]
+
+    missing = list(dict.fromkeys(key for key in keys if key not in results))  # 중복 제거, 순서 유지
+    if missing:
+        with stage_limit("embed"), span("embed", queries=len(missing)):
+            vectors = get_embedding_model().embed_documents(missing)  # bge-m3는 질문/문서 인코딩 방식이 같음
+        with _lock:
+            stats["encodes"] += len(missing)
+            stats["batches"] += 1
+            for key, vector in zip(missing, vectors):
+                results[key] = vector
+                _cache[key] = vector
+                _cache.move_to_end(key)
+            while len(_cache) > QUERY_EMBED_CACHE_SIZE:
+                _cache.popitem(last=False)
+
+    with _lock:
+        stats["hits"] += len(keys) - len(missing)
+        stats["misses"] += len(missing)
+    counter = _chat_counter.get()
+    if counter is not None:
+        counter["encodes"] += len(missing)
+        counter["hits"] += len(keys) - len(missing)
+
+    return [results[key] for key in keys]
+
+
+def embed_query(query: str) -> list:
+    return embed_queries([query])[0]
+
+
+def start_chat_tracking() -> dict:
+    """채팅 요청 시작 시 호출 → 이 요청에서 발생한 인코딩/캐시 적중 수를 세는 카운터"""
+    counter = {"encodes": 0, "hits": 0}
+    _chat_counter.set(counter)
+    return counter
+
+
+def finish_chat_tracking(counter: dict):
+    with _lock:
+        stats["chats"] += 1
+        stats["chat_encodes"] += counter["encodes"]
+
+
+def get_stats() -> dict:
+    """📈 질문 임베딩 캐시 적중률 / 채팅당 평균 인코딩 횟수"""
+    with _lock:
+        result = dict(stats)
+        result["size"] = len(_cache)
+    lookups = result["hits"] + result["misses"]
+    result["hit_ratio"] = round(result["hits"] / lookups, 3) if lookups else 0.0
+    result["encodes_per_chat"] = round(result.pop("chat_encodes") / result["chats"], 2) if result["chats"] else 0.0
+    return result
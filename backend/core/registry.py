@@ -0,0 +1,144 @@
+import time
+import threading
+import chromadb
+from langchain.embeddings import HuggingFaceEmbeddings
+from core.config import (CHROMA_MODE, CHROMA_HOST, CHROMA_PORT, CHROMA_PATH, EMBEDDING_MODEL_NAME, EMBEDDING_DEVICE,
+                         EMBEDDING_BACKEND, EMBEDDING_ONNX_FILE, EMBED_BATCH_SIZE, RERANKER, RERANK_MODEL_NAME,
+                         LLM_BACKEND, OLLAMA_BASE_URL, OLLAMA_KEEP_ALIVE, LLM_CONTEXT_MODEL, LLM_RESPONSE_MODEL,
+                         LLM_MAX_LOADED_MODELS)
+
+# ✅ 프로세스 공용 모델/클라이언트 레지스트리 (처음 사용할 때 한 번만 생성)
+_lock = threading.RLock()
+_chroma_client = None
+_collections = {}
+_embedding_models = {}
+_reranker_models = {}
+_llms = {}
+
+
+# ✅ 1️⃣ ChromaDB 클라이언트 / 컬렉션
+def get_chroma_client():
+    global _chroma_client
+    if _chroma_client is None:
+        with _lock:
+            if _chroma_client is None:
+                if CHROMA_MODE == "ephemeral":
+                    _chroma_client = chromadb.EphemeralClient()
+                elif CHROMA_MODE == "persistent":
+                    _chroma_client = chromadb.PersistentClient(path=CHROMA_PATH)
+                else:
+                    _chroma_client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
+    return _chroma_client
+
+
+def get_collection(name: str):
+    collection = _collections.get(name)
+    if collection is None:
+        with _lock:
+            collection = _collections.get(name)
+            if collection is None:
+                collection = get_chroma_client().get_or_create_collection(name=name)
+                _collections[name] = collection
+    return collection
+
+
+# ✅ 2️⃣ 임베딩 모델 (문서/질문 임베딩 공용, 정규화된 벡터 반환)
+def _model_kwargs() -> dict:
+    kwargs = {"device": EMBEDDING_DEVICE}
+    if EMBEDDING_BACKEND == "onnx":
+        kwargs["backend"] = "onnx"
+        if EMBEDDING_ONNX_FILE:
+            kwargs["model_kwargs"] = {"file_name": EMBEDDING_ONNX_FILE}  # int8 양자화 ONNX 파일 등
+    return kwargs
+
+
+def get_embedding_model(model_name: str = EMBEDDING_MODEL_NAME):
+    model = _embedding_models.get(model_name)
+    if model is None:
+        with _lock:
+            model = _embedding_models.get(model_name)
+            if model is None:
+                start = time.perf_counter()
+                if EMBEDDING_BACKEND == "hash":
+                    from core.offline import HashEmbeddings
+                    model = HashEmbeddings()
+                else:
+                    model = HuggingFaceEmbeddings(
+                        model_name=model_name,
+                        model_kwargs=_model_kwargs(),
+                        encode_kwargs={"normalize_embeddings": True, "batch_size": EMBED_BATCH_SIZE}
+                    )
+                _embedding_models[model_name] = model
+                print(f"🧠 임베딩 모델 로드: {model_name} ({EMBEDDING_BACKEND}, {time.perf_counter() - start:.1f}초)")
+    return model
+
+
+# ✅ 3️⃣ 재정렬(cross-encoder) 모델 (RAG 문서 조각 재정렬용, CPU 실행)
+def get_reranker_model(model_name: str = RERANK_MODEL_NAME):
+    model = _reranker_models.get(model_name)
+    if model is None:
+        with _lock:
+            model = _reranker_models.get(model_name)
+            if model is None:
+                from sentence_transformers import CrossEncoder  # 재정렬을 켠 경우에만 로드
+                start = time.perf_counter()
+                model = CrossEncoder(model_name, device=EMBEDDING_DEVICE, max_length=512)
+                _reranker_models[model_name] = model
+                print(f"🧠 재정렬 모델 로드: {model_name} ({time.perf_counter() - start:.1f}초)")
+    return model
+
+
+# ✅ 4️⃣ LLM (LLM_BACKEND=fake면 Ollama 없이 동작하는 결정적 LLM)
+def get_llm(model: str):
+    llm = _llms.get(model)
+    if llm is None:
+        with _lock:
+            llm = _llms.get(model)
+            if llm is None:
+                if LLM_BACKEND == "fake":
+                    from core.offline import FakeReActLLM
+                    llm = FakeReActLLM(model=model)
+                else:
+                    from core.llm_scheduler import PooledOllamaLLM  # 공용 연결 풀 + keep_alive + 모델별 스케줄러
+                    llm = PooledOllamaLLM(model=model, base_url=OLLAMA_BASE_URL, keep_alive=OLLAMA_KEEP_ALIVE)
+                _llms[model] = llm
+    return llm
+
+
+# ✅ 5️⃣ 워밍업 (모델 로드 + 첫 추론, ChromaDB 연결)
+def warm_up() -> dict:
+    timings = {}
+    start = time.perf_counter()
+    get_embedding_model().embed_query("워밍업")
+    timings["embedding_sec"] = round(time.perf_counter() - start, 3)
+
+    if RERANKER == "cross_encoder":
+        start = time.perf_counter()
+        get_reranker_model().predict([("워밍업", "워밍업")])
+        timings["reranker_sec"] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    try:
+        for name in ["documents", "data_files"]:
+            get_collection(name)
+    except Exception as e:
+        print(f"❌ ChromaDB 연결 오류: {e}")
+    timings["chroma_sec"] = round(time.perf_counter() - start, 3)
+
+    print(f"🔥 워밍업 완료: {timings}")
+    return timings
+
+
+def warm_up_llms() -> dict:
+    """🔥 Ollama 모델을 미리 메모리에 올림 (context 모델 우선, 동시에 둘 수 있는 모델 수까지)"""
+    if LLM_BACKEND != "ollama":
+        return {}
+    from core.llm_scheduler import preload
+    timings = {}
+    for model in list(dict.fromkeys([LLM_CONTEXT_MODEL, LLM_RESPONSE_MODEL]))[:LLM_MAX_LOADED_MODELS]:
+        try:
+            timings[f"{model}_sec"] = round(preload(model), 3)
+        except Exception as e:
+            print(f"❌ Ollama 모델 워밍업 오류 ({model}): {e}")
+    print(f"🔥 LLM 워밍업 완료: {timings}")
+    return timings
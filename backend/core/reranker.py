@@ -0,0 +1,68 @@
+import time
+import threading
+from collections import OrderedDict
+from core.config import RERANKER, RERANK_BATCH_SIZE, RERANK_TOP_N, RERANK_CACHE_SIZE
+from core.concurrency import stage_limit
+from core.registry import get_reranker_model
+from core.query_embeddings import normalize_query
+
+# ✅ RAG 문서 조각 재정렬 (질문-조각 쌍 점수 → 상위 N개만 에이전트에 전달)
+_cache = OrderedDict()  # (정규화된 질문, 조각 본문) → 점수 (같은 id로 재업로드돼도 안전)
+_lock = threading.Lock()
+stats = {"calls": 0, "pairs": 0, "scored": 0, "latency_ms_total": 0.0}
+
+
+# ✅ 1️⃣ 점수 계산기 (이름 → 함수(query, texts) → 점수 목록, 높을수록 관련성 높음)
+def cross_encoder_scores(query: str, texts: list) -> list:
+    with stage_limit("rerank"):
+        return [float(score) for score in
+                get_reranker_model().predict([(query, text) for text in texts], batch_size=RERANK_BATCH_SIZE)]
+
+
+RERANKERS = {
+    "cross_encoder": cross_encoder_scores,
+}
+
+
+# ✅ 2️⃣ 재정렬 (passages: [(id, 문서, 유사도, 파일명)] → 점수 내림차순 상위 top_n)
+def rerank(query: str, passages: list, top_n: int = RERANK_TOP_N, method: str = RERANKER) -> list:
+    score_fn = RERANKERS.get(method)
+    if score_fn is None or not passages:
+        return passages  # "none": 검색 순위/개수 그대로 사용 (컨텍스트 예산만 적용)
+
+    start = time.perf_counter()
+    key = normalize_query(query)
+    with _lock:
+        scores = {p[0]: _cache[(key, p[1])] for p in passages if (key, p[1]) in _cache}
+    missing = [p for p in passages if p[0] not in scores]
+
+    if missing:
+        try:
+            new_scores = score_fn(query, [p[1] for p in missing])
+        except Exception as e:
+            print(f"❌ 재정렬 오류 (검색 순위 사용): {e}")
+            return passages[:top_n]
+        with _lock:
+            for p, score in zip(missing, new_scores):
+                scores[p[0]] = score
+                _cache[(key, p[1])] = score
+            while len(_cache) > RERANK_CACHE_SIZE:
+                _cache.popitem(last=False)
+
+    with _lock:
+        stats["calls"] += 1
+        stats["pairs"] += len(passages)
+        stats["scored"] += len(missing)
+        stats["latency_ms_total"] += (time.perf_counter() - start) * 1000
+
+    return sorted(passages, key=lambda p: scores[p[0]], reverse=True)[:top_n]
+
+
+def get_stats() -> dict:
+    """📈 재정렬 호출 수 / 캐시 적중률 / 평균 지연 시간"""
+    with _lock:
+        result = dict(stats)
+    result["method"] = RERANKER
+    result["cache_hit_ratio"] = round(1 - result["scored"] / result["pairs"], 3) if result["pairs"] else 0.0
+    result["avg_latency_ms"] = round(result.pop("latency_ms_total") / result["calls"], 2) if result["calls"] else 0.0
+    return result
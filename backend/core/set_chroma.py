@@ -1,9 +1,9 @@
-import chromadb
+from core.registry import get_chroma_client, get_collection
 
 # ✅ ChromaDB 클라이언트 연결
-chroma_client = chromadb.HttpClient(host="localhost", port=8000)
+chroma_client = get_chroma_client()
 
-collection = chroma_client.get_or_create_collection("documents")
+collection = get_collection("documents")
 
 #chroma_client.delete_collection("documents")
 #collection = chroma_client.get_or_create_collection(name="data_files")
@@ -0,0 +1,327 @@
+import os
+import re
+import sys
+import time
+import uuid
+import random
+import asyncio
+import datetime
+import functools
+import itertools
+import threading
+import contextvars
+import collections
+from contextlib import contextmanager
+from core.config import STORAGE_DIR, TRACE_HISTORY, PROFILE_SLOW_SEC, PROFILE_SAMPLE_RATE, PROFILE_INTERVAL
+
+# ✅ 채팅 파이프라인 단계별 지연 시간 추적 + Prometheus 지표 (/metrics)
+#    - span(): 단계 실행 시간을 히스토그램에 기록하고, 진행 중인 채팅 trace가 있으면 단계 목록에 추가
+#    - contextvars로 현재 trace/상위 단계를 전달 → run_blocking/BOTH 분기 스레드에서도 같은 trace에 기록
+#    - PROFILE_SLOW_SEC > 0이면 채팅 처리 스레드의 스택을 주기적으로 표본 수집 → 느린 요청만 파일로 저장
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+ITERATION_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _label_text(names: tuple, values: tuple) -> str:
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ") for value in values)
+    pairs = [f'{name}="{value}"' for name, value in zip(names, escaped)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """누적 카운터 (라벨 값 조합별)"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name, self.help, self.labels = name, help_text, tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self) -> list:
+        with self.lock:
+            return [f"{self.name}{_label_text(self.labels, key)} {value}" for key, value in sorted(self.values.items())]
+
+
+class Histogram:
+    """구간별 누적 개수 + 합계 + 개수 (Prometheus histogram 형식)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name, self.help, self.labels, self.buckets = name, help_text, tuple(labels), tuple(buckets)
+        self.values = {}  # 라벨 값 → [구간별 개수..., 합계, 개수]
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labels)
+        with self.lock:
+            series = self.values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list:
+        lines = []
+        with self.lock:
+            items = sorted((key, list(series)) for key, series in self.values.items())
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_label_text(self.labels + ('le',), key + (bound,))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_label_text(self.labels + ('le',), key + ('+Inf',))} {series[-1]}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {round(series[-2], 6)}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, key)} {series[-1]}")
+        return lines
+
+
+_metrics = []
+_gauge_sources = []  # (접두어, 통계 dict를 돌려주는 함수)
+
+
+def counter(name: str, help_text: str, labels: tuple = ()) -> Counter:
+    metric = Counter(name, help_text, labels)
+    _metrics.append(metric)
+    return metric
+
+
+def histogram(name: str, help_text: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+    metric = Histogram(name, help_text, labels, buckets)
+    _metrics.append(metric)
+    return metric
+
+
+def register_gauges(prefix: str, stats_func):
+    """기존 /xxx/stats 함수의 숫자 값을 /metrics에 gauge로 노출 (중첩 dict는 키를 _로 연결)"""
+    _gauge_sources.append((prefix, stats_func))
+
+
+def _flatten(prefix: str, stats: dict):
+    for key, value in stats.items():
+        name = re.sub(r"[^a-zA-Z0-9_]", "_", f"{prefix}_{key}")
+        if isinstance(value, dict):
+            yield from _flatten(name, value)
+        elif isinstance(value, (int, float)):
+            yield name, float(value)
+
+
+def render_metrics() -> str:
+    """📈 Prometheus 텍스트 형식"""
+    lines = []
+    for metric in _metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    for prefix, stats_func in _gauge_sources:
+        try:
+            gauges = list(_flatten(prefix, stats_func()))
+        except Exception as e:
+            print(f"❌ 지표 수집 오류 ({prefix}): {e}")
+            continue
+        for name, value in gauges:
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+# ✅ 기본 지표
+CHAT_SECONDS = histogram("smartfarm_chat_duration_seconds", "채팅 요청 전체 처리 시간", ("mode", "cached"))
+STAGE_SECONDS = histogram("smartfarm_stage_duration_seconds", "파이프라인 단계별 처리 시간", ("stage",))
+STAGE_ERRORS = counter("smartfarm_stage_errors_total", "예외로 끝난 단계 수", ("stage",))
+LLM_TOKENS = counter("smartfarm_llm_tokens_total", "LLM 입력/출력 토큰 수", ("model", "kind"))
+AGENT_ITERATIONS = histogram("smartfarm_agent_iterations", "ReAct 에이전트 LLM 호출(반복) 횟수", ("agent",),
+                             ITERATION_BUCKETS)
+HTTP_SECONDS = histogram("smartfarm_http_request_duration_seconds", "HTTP 요청 처리 시간 (스트리밍은 응답 시작까지)",
+                         ("method", "path", "status"))
+
+
+# ✅ 요청 단위 trace
+_trace = contextvars.ContextVar("trace", default=None)
+_span = contextvars.ContextVar("trace_span", default=None)
+_span_ids = itertools.count(1)
+recent_traces = collections.deque(maxlen=TRACE_HISTORY)
+
+
+class Trace:
+    def __init__(self, name: str, profiled: bool = False):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.spans = []
+        self.attrs = {}
+        self.profiled = profiled
+        self.lock = threading.Lock()
+        self.threads = collections.Counter()  # 표본 수집 대상 스레드 → 진행 중인 단계 수
+        self.samples = collections.Counter()  # 스택 문자열 → 표본 수
+        self.sec = None
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "name": self.name, "started_at": self.started_at, "sec": self.sec,
+                **self.attrs, "spans": sorted(self.spans, key=lambda s: s["start"])}
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """⏱️ 단계 실행 시간 기록 → 단계 속성 dict를 돌려줌 (토큰 수 등을 단계 안에서 추가)"""
+    trace = _trace.get()
+    parent = _span.get()
+    record = {"id": next(_span_ids), "name": name, "parent": parent["id"] if parent else None, "attrs": attrs}
+    token = _span.set(record)
+    ident = None
+    if trace is not None and trace.profiled and not _in_event_loop():  # 이벤트 루프 스레드는 여러 요청이 공유
+        ident = threading.get_ident()
+        with trace.lock:
+            trace.threads[ident] += 1
+    start = time.perf_counter()
+    try:
+        yield attrs
+    except Exception:
+        record["error"] = True
+        STAGE_ERRORS.inc(stage=name)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        try:
+            _span.reset(token)
+        except ValueError:  # 다른 context에서 종료된 경우 (비동기 제너레이터 등)
+            _span.set(parent)
+        if ident is not None:
+            with trace.lock:
+                trace.threads[ident] -= 1
+                if trace.threads[ident] <= 0:
+                    del trace.threads[ident]
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        if trace is not None:
+            record.update(start=round(start - trace.start, 4), sec=round(elapsed, 4))
+            trace.spans.append(record)
+
+
+def traced(func):
+    """함수 전체를 같은 이름의 단계로 기록하는 데코레이터"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def start_trace(name: str) -> Trace:
+    """채팅 요청 시작 시 호출 → 이후 span()은 이 trace에 기록"""
+    profiled = PROFILE_SLOW_SEC > 0 and random.random() < PROFILE_SAMPLE_RATE
+    trace = Trace(name, profiled)
+    _trace.set(trace)
+    _span.set(None)
+    if profiled:
+        _sampler.add(trace)
+    return trace
+
+
+def finish_trace(trace: Trace, **attrs):
+    """채팅 요청 종료 → 전체 시간 기록, 단계별 요약 출력, 느린 요청이면 프로파일 저장"""
+    trace.sec = round(time.perf_counter() - trace.start, 4)
+    trace.attrs.update(attrs)
+    CHAT_SECONDS.observe(trace.sec, mode=trace.name, cached=str(bool(trace.attrs.get("cached"))).lower())
+    if trace.profiled:
+        _sampler.remove(trace)
+        if trace.sec >= PROFILE_SLOW_SEC and trace.samples:
+            trace.attrs["profile"] = write_profile(trace)
+    recent_traces.append(trace)
+    _trace.set(None)
+
+    top = [s for s in trace.spans if s["parent"] is None]
+    summary = ", ".join(f"{s['name']} {s['sec']:.2f}s" for s in sorted(top, key=lambda s: s["start"]))
+    print(f"⏱️ [{trace.id}] {trace.name} {trace.sec:.2f}초 | {summary}")
+
+
+def annotate(**attrs):
+    """진행 중인 trace에 요청 단위 속성 추가 (캐시 적중 여부, 사용한 도구 등)"""
+    trace = _trace.get()
+    if trace is not None:
+        trace.attrs.update(attrs)
+
+
+def get_traces(limit: int = 20, min_sec: float = 0.0) -> list:
+    """🧾 최근 채팅 trace (최신순, min_sec 이상 걸린 요청만)"""
+    traces = [trace.to_dict() for trace in reversed(recent_traces) if (trace.sec or 0) >= min_sec]
+    return traces[:limit]
+
+
+# ✅ 표본 추출 프로파일러 (PROFILE_SLOW_SEC > 0일 때만 동작)
+class _Sampler:
+    def __init__(self):
+        self.traces = set()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def add(self, trace: Trace):
+        with self.lock:
+            self.traces.add(trace)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="trace-sampler", daemon=True)
+                self.thread.start()
+
+    def remove(self, trace: Trace):
+        with self.lock:
+            self.traces.discard(trace)
+
+    def _run(self):
+        while True:
+            time.sleep(PROFILE_INTERVAL)
+            with self.lock:
+                active = list(self.traces)
+                if not active:
+                    self.thread = None
+                    return
+            frames = sys._current_frames()
+            for trace in active:
+                with trace.lock:
+                    idents = list(trace.threads)
+                for ident in idents:
+                    frame = frames.get(ident)
+                    if frame is not None:
+                        trace.samples[_stack_key(frame)] += 1
+
+
+def _stack_key(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+_sampler = _Sampler()
+
+
+def write_profile(trace: Trace) -> str:
+    """표본 스택 → STORAGE_DIR/profiles/*.folded (flamegraph.pl / speedscope에서 열 수 있는 형식)"""
+    folder = os.path.join(STORAGE_DIR, "profiles")
+    os.makedirs(folder, exist_ok=True)
+    stamp = datetime.datetime.fromtimestamp(trace.started_at).strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(folder, f"{stamp}-{trace.name}-{trace.id}.folded")
+    with open(path, "w", encoding="utf-8") as f:
+        for stack, count in trace.samples.most_common():
+            f.write(f"{stack} {count}\n")
+    print(f"🐢 느린 요청 프로파일 저장: {path} ({trace.sec:.2f}초, 표본 {sum(trace.samples.values())}개)")
+    return path
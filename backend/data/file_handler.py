@@ -1,81 +1,456 @@
 import pandas as pd
+import openpyxl
 import json
 import io
+import os
+import time
+import hashlib
+import itertools
 from fastapi import UploadFile, HTTPException
-from core.extraction import extract_text, calculate_file_hash
+from core.extraction import extract_text, calculate_file_hash, iter_pdf_pages
+from core.config import (EMBED_BATCH_SIZE, CHROMA_INSERT_BATCH_SIZE, UPLOAD_CHUNK_SIZE, DATA_CHUNK_ROWS,
+                         EMBED_NUMERIC_TABLES)
+from data import sensor_store, lexical_index, ingest_index, graph
 from langchain.text_splitter import CharacterTextSplitter
-from langchain.embeddings import HuggingFaceEmbeddings
+from core.registry import get_embedding_model
 
-uploaded_hashes = set()  # 해시 저장소
-embedding_model = HuggingFaceEmbeddings(
-    model_name="BAAI/bge-m3",
-    encode_kwargs={"normalize_embeddings": True}
-)
+DATA_FILE_EXTENSIONS = ["csv", "json", "jsonl", "xlsx"]  # data_files 컬렉션에 저장되는 확장자
+pending_hashes = set()  # 처리 중인 업로드 해시 (저장 완료된 파일은 ingest_index에 영구 기록)
 
 async def process_uploaded_file(file: UploadFile, collection_documents, collection_data_files):
     """📂 파일 업로드 후 임베딩 생성 및 ChromaDB 저장 (CSV/JSON 분리)"""
     original_filename = file.filename
     file_content = await file.read()
 
-    # 🔹 파일 해시값 계산
+    # 🔹 파일 해시값 계산 + 중복 업로드 방지
     file_hash = calculate_file_hash(file_content)
+    register_file_hash(file_hash)
 
-    # 🔹 중복 업로드 방지
-    if file_hash in uploaded_hashes:
+    try:
+        return ingest_file(original_filename, file_content, file_hash, collection_documents, collection_data_files)
+    finally:
+        pending_hashes.discard(file_hash)
+
+def target_collection_name(filename: str) -> str:
+    """🔹 파일이 저장될 ChromaDB 컬렉션 이름"""
+    return "data_files" if filename.split(".")[-1].lower() in DATA_FILE_EXTENSIONS else "documents"
+
+def register_file_hash(file_hash: str):
+    """🔹 중복 업로드 방지 (처리 중이거나 같은 내용으로 저장 완료된 파일이면 400 에러)"""
+    if file_hash in pending_hashes or ingest_index.find_file(file_hash):
         raise HTTPException(status_code=400, detail="⚠️ 이미 업로드된 파일입니다.")
-    uploaded_hashes.add(file_hash)
+    pending_hashes.add(file_hash)
+
+async def spool_upload(file: UploadFile, dest_path: str) -> str:
+    """📥 업로드를 UPLOAD_CHUNK_SIZE 단위로 디스크에 옮기면서 SHA256 계산 (파일 전체를 메모리에 올리지 않음)"""
+    sha256 = hashlib.sha256()
+    with open(dest_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            sha256.update(chunk)
+            f.write(chunk)
+    return sha256.hexdigest()
 
+def ingest_file(original_filename: str, file_content: bytes, file_hash: str, collection_documents, collection_data_files,
+                on_progress=None, should_cancel=None, file_path: str = None) -> dict:
+    """📂 텍스트 추출 → 분할 → 배치 임베딩 → ChromaDB 저장 (동기 함수, 작업 큐 워커에서 실행)
+
+    - 같은 이름의 파일이 이미 저장돼 있으면 바뀐 조각만 임베딩하고 사라진 조각은 삭제 (재업로드/작업 재개 공통)
+    - file_path: 디스크에 저장된 업로드 경로 (file_content 대신 사용, PDF는 페이지 단위 스트리밍 추출)
+    """
     # 🔹 파일 확장자 확인
     file_ext = original_filename.split(".")[-1].lower()
-    
-    if file_ext in ["csv", "json", "xlsx"]:
-        docs = process_data_file(file_content, file_ext)
+    size_bytes = len(file_content) if file_content is not None else os.path.getsize(file_path)
+    timings = {"extract_sec": 0.0, "split_sec": 0.0}
+    source_progress = None  # 스트리밍 처리 시 읽은 위치 {"done", "total"} (페이지/바이트/행)
+    data_info = None
+
+    start_time = time.perf_counter()
+    if file_ext in DATA_FILE_EXTENSIONS:
+        # ✅ 청크 단위 읽기 → 센서 저장소 저장 + 행 문서 변환이 임베딩과 함께 진행
+        source_progress, data_info = {"done": 0, "total": None}, {}
+        docs = timed_iter(process_data_file(file_content, file_ext, original_filename, file_path,
+                                            source_progress, data_info), timings, "extract_sec")
         collection = collection_data_files  # ✅ 데이터 파일은 별도 컬렉션
+    elif file_ext == "pdf" and file_path:
+        # ✅ 페이지 추출(프로세스 풀) → 분할 → 임베딩이 흐르듯 진행 (메모리는 처리 중인 구간만 사용)
+        source_progress = {"done": 0, "total": None}
+        docs = split_pages(iter_pdf_pages(file_path, source_progress), timings)
+        collection = collection_documents
     else:
+        if file_content is None:
+            with open(file_path, "rb") as f:
+                file_content = f.read()
+
         pages = extract_text(original_filename, file_content)
         if not pages or (isinstance(pages, list) and not any(pages)):
             return {"error": f"❌ {original_filename}에서 텍스트를 추출할 수 없습니다."}
+        if isinstance(pages, str):
+            pages = [pages]  # DOCX/TXT는 단일 문자열 반환
+        timings["extract_sec"] = time.perf_counter() - start_time
 
         # 🔹 문서 분할
-        text_splitter = CharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-        docs = [chunk for page in pages for chunk in text_splitter.split_text(page)]
+        split_start = time.perf_counter()
+        docs = list(split_pages(pages))
         collection = collection_documents  # ✅ 일반 문서는 기본 컬렉션
+        timings["split_sec"] = time.perf_counter() - split_start
+        print(f"📂 {original_filename}에서 {len(docs)}개의 문서 조각 생성됨.")
+
+    def report_progress(done: int, total):
+        if total is None and source_progress and source_progress["done"] and source_progress["total"]:
+            # 스트리밍 중에는 읽은 비율로 전체 조각 수 추정
+            total = max(done, round(done * source_progress["total"] / source_progress["done"]))
+        on_progress(done, total)
+
+    on_stored = on_removed = None
+    if collection is collection_documents:
+        on_stored = lambda ids, texts: lexical_index.add_documents(ids, texts, original_filename)  # ✅ BM25 색인 동시 갱신
+        on_removed = lexical_index.remove_documents
+
+    # ✅ 배치 임베딩 및 ChromaDB 일괄 저장 (바뀐 조각만)
+    stats = embed_and_store(docs, collection, original_filename, file_hash,
+                            on_progress=report_progress if on_progress else None, should_cancel=should_cancel,
+                            on_stored=on_stored, on_removed=on_removed)
+    if hasattr(docs, "close"):
+        docs.close()  # 취소로 다 읽지 못한 스트림 정리 (센서 저장소 임시 테이블 제거 등)
+    stats["extract_sec"] = round(timings["extract_sec"], 3)
+    stats["split_sec"] = round(timings["split_sec"], 3)
+    stats["total_sec"] = round(time.perf_counter() - start_time, 3)
+    if data_info:
+        stats["rows"] = data_info["rows"]
+        stats["rows_embedded"] = data_info["embedded"]
+        stats["rows_per_sec"] = round(data_info["rows"] / timings["extract_sec"], 2) if timings["extract_sec"] else 0.0
+    elif source_progress:
+        stats["pages"] = source_progress["done"]
+        stats["pages_per_sec"] = round(source_progress["done"] / timings["extract_sec"], 2) if timings["extract_sec"] else 0.0
+
+    if stats["cancelled"]:
+        print(f"⏹ {original_filename} 저장 중단됨. ({stats['next_index']}/{stats['total']})")
+        return {"message": f"⏹ {original_filename} 업로드가 취소되었습니다.", "stats": stats}
+    if stats["failed"]:
+        # 일부 조각 임베딩 실패 → 카탈로그에 기록하지 않음 (작업 재개 시 저장된 조각은 id로 건너뛰고 실패한 조각만 다시 처리)
+        print(f"❌ {original_filename} 조각 {stats['failed']}개 임베딩 실패 → 완료 처리하지 않음")
+        return {"error": f"❌ {original_filename} 조각 {stats['failed']}개의 임베딩에 실패했습니다. 작업을 재개하면 다시 시도합니다.",
+                "stats": stats}
+
+    ingest_index.record_file(original_filename, file_hash, target_collection_name(original_filename),
+                              ingest_index.count_chunks(original_filename), size_bytes)
+    print(f"✅ {original_filename}이(가) ChromaDB에 저장됨. (새 조각 {stats['chunks']}개, 재사용 {stats['reused']}개, "
+          f"삭제 {stats['removed']}개, {stats})")
+    return {"message": f"✅ {original_filename} 업로드 및 저장 완료!", "stats": stats}
+
+def timed_iter(items, timings: dict, key: str):
+    """이터레이터가 다음 항목을 만드는 데 걸린 시간을 timings[key]에 누적"""
+    items = iter(items)
+    try:
+        while True:
+            wait_start = time.perf_counter()
+            item = next(items, None)
+            timings[key] += time.perf_counter() - wait_start
+            if item is None:
+                return
+            yield item
+    finally:
+        if hasattr(items, "close"):
+            items.close()
+
+def split_pages(pages, timings: dict = None):
+    """✂️ 페이지 텍스트 → 문서 조각 (1000자, 100자 겹침), 페이지가 들어오는 대로 조각을 yield
+
+    - timings: {"extract_sec", "split_sec"}에 페이지 대기/분할 시간을 누적
+    """
+    text_splitter = CharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
+    for page in (timed_iter(pages, timings, "extract_sec") if timings is not None else pages):
+        split_start = time.perf_counter()
+        chunks = text_splitter.split_text(page)
+        if timings is not None:
+            timings["split_sec"] += time.perf_counter() - split_start
+        yield from chunks
+
+def embed_and_store(docs, collection, filename: str, file_hash: str,
+                    batch_size: int = EMBED_BATCH_SIZE, insert_batch_size: int = CHROMA_INSERT_BATCH_SIZE,
+                    on_progress=None, should_cancel=None, on_stored=None, on_removed=None) -> dict:
+    """🧮 문서 조각을 배치 단위로 임베딩하고 ChromaDB에 일괄 저장 → 단계별 소요 시간 반환
+
+    - docs: 문서 조각 리스트 또는 이터레이터 (이터레이터면 배치 단위로 읽어 메모리 사용량 제한)
+    - 조각 id = 파일명 + 내용 해시 → ingest_index에 이미 있는 조각은 임베딩하지 않음 (재업로드/작업 재개)
+    - 끝까지 처리하면 이번에 나오지 않은 조각(파일에서 사라진 내용)을 삭제
+    - on_progress(done, total): 일괄 저장이 끝날 때마다 호출 (이터레이터는 끝나기 전까지 total=None)
+    - should_cancel(): True 반환 시 대기 중인 조각까지만 저장하고 중단
+    - on_stored(ids, documents) / on_removed(ids): 저장/삭제 직후 호출 (BM25 색인 갱신용)
+    """
+    total = len(docs) if hasattr(docs, "__len__") else None
+    stats = {"chunks": 0, "reused": 0, "removed": 0, "failed": 0, "batch_size": batch_size,
+             "embed_sec": 0.0, "insert_sec": 0.0, "total": total, "next_index": 0, "cancelled": False}
+    pending = {"ids": [], "embeddings": [], "metadatas": [], "documents": []}
+    run_id = file_hash
+
+    # 🔹 조각 색인이 생기기 전에 "파일명-번호" id로 저장된 파일 → 끝나면 예전 조각 전체 교체
+    legacy_ids = []
+    if not ingest_index.has_chunks(filename):
+        legacy_ids = collection.get(where={"filename": filename}, include=[])["ids"]
+
+    def flush(next_index: int):
+        if pending["ids"]:
+            insert_start = time.perf_counter()
+            collection.upsert(**pending)
+            if on_stored:
+                on_stored(pending["ids"], pending["documents"])
+            ingest_index.mark_chunks(filename, pending["ids"], run_id)
+            stats["insert_sec"] += time.perf_counter() - insert_start
+            stats["chunks"] += len(pending["ids"])
+            for values in pending.values():
+                values.clear()
+        stats["next_index"] = next_index
+        if on_progress:
+            on_progress(next_index, stats["total"])
+
+    chunks = iter(docs)
+    next_index = 0
+    while True:
+        if should_cancel and should_cancel():
+            stats["cancelled"] = True
+            break
+
+        batch = list(itertools.islice(chunks, batch_size))
+        if not batch:
+            stats["total"] = next_index  # 이터레이터도 끝까지 읽으면 전체 조각 수 확정
+            break
+        start, next_index = next_index, next_index + len(batch)
+
+        # 🔹 이미 저장된 조각(이전 업로드 또는 이번 업로드의 같은 내용)은 건너뛰고 확인 표시만 갱신
+        unique = {ingest_index.chunk_id(filename, doc): doc for doc in batch}
+        known = ingest_index.lookup_chunks(filename, list(unique))
+        reused = [doc_id for doc_id, seen_run in known.items() if seen_run != run_id]
+        if reused:
+            ingest_index.mark_chunks(filename, reused, run_id)
+            stats["reused"] += len(reused)
+        queued = set(pending["ids"])
+        new_ids = [doc_id for doc_id in unique if doc_id not in known and doc_id not in queued]
+        new_docs = [unique[doc_id] for doc_id in new_ids]
+
+        if new_docs:
+            embed_start = time.perf_counter()
+            try:
+                vectors = get_embedding_model().embed_documents(new_docs)
+            except Exception as e:
+                print(f"❌ 임베딩 생성 오류 (조각 {start}~{start + len(batch) - 1}): {e}")
+                stats["failed"] += len(new_docs)
+                continue
+            stats["embed_sec"] += time.perf_counter() - embed_start
+
+            pending["ids"].extend(new_ids)
+            pending["embeddings"].extend(vectors)
+            pending["metadatas"].extend({"filename": filename, "hash": file_hash} for _ in new_docs)
+            pending["documents"].extend(new_docs)
+
+        # 저장할 조각이 없어도 (모두 재사용) 일정 간격으로 진행 상황 보고
+        if len(pending["ids"]) >= insert_batch_size or next_index - stats["next_index"] >= insert_batch_size * 4:
+            flush(next_index)
+    flush(next_index)
+
+    # 🔹 끝까지 처리했다면 이번 업로드에 없는 조각 삭제 (취소 시에는 재개를 위해 유지)
+    if not stats["cancelled"] and not stats["failed"]:
+        stale_ids = ingest_index.stale_chunks(filename, run_id)
+        for i in range(0, len(stale_ids), insert_batch_size):
+            removed = stale_ids[i:i + insert_batch_size]
+            collection.delete(ids=removed)
+            if on_removed:
+                on_removed(removed)
+            ingest_index.remove_chunks(filename, removed)
+        for i in range(0, len(legacy_ids), insert_batch_size):
+            collection.delete(ids=legacy_ids[i:i + insert_batch_size])
+            if on_removed:
+                on_removed(legacy_ids[i:i + insert_batch_size])
+        stats["removed"] = len(stale_ids) + len(legacy_ids)
+
+    elapsed = stats["embed_sec"] + stats["insert_sec"]
+    stats["embed_sec"] = round(stats["embed_sec"], 3)
+    stats["insert_sec"] = round(stats["insert_sec"], 3)
+    stats["chunks_per_sec"] = round(stats["chunks"] / elapsed, 2) if elapsed > 0 else 0.0
+    return stats
+
+def process_data_file(file_content: bytes, file_ext: str, filename: str = None, file_path: str = None,
+                      progress: dict = None, info: dict = None):
+    """📊 CSV/XLSX/JSON/JSONL 파일을 청크 단위로 읽어 ChromaDB에 저장할 문서를 yield (filename이 있으면 센서 저장소에도 저장)
+
+    - 파일 전체를 DataFrame으로 만들지 않음 (DATA_CHUNK_ROWS 행씩 처리)
+    - EMBED_NUMERIC_TABLES=0이면 날짜 컬럼 외 전부 숫자인 센서 테이블은 문서를 만들지 않음 (센서 저장소로만 조회)
+    - progress: {"done", "total"} 읽은 위치 기록 (진행률 추정용) / info: {"rows", "embedded"} 결과 기록
+    """
+    info = info if info is not None else {}
+    info.update(rows=0, embedded=True)
+    writer = sensor_store.TableWriter(filename) if filename else None
+    source = open(file_path, "rb") if file_path else io.BytesIO(file_content)
+    try:
+        for df in iter_data_frames(source, file_ext, progress=progress):
+            # ✅ 타입이 유지된 컬럼 형식으로 센서 저장소에 저장 (데이터 조회는 이 저장소 사용)
+            if writer:
+                df = writer.append(df)
+                if info["rows"] == 0 and not EMBED_NUMERIC_TABLES and is_numeric_table(df, writer.date_column):
+                    info["embedded"] = False
+                    print(f"⏭ {filename}: 숫자 센서 테이블 → 행 임베딩 생략")
+            info["rows"] += len(df)
+
+            # ✅ 데이터 변환 (컬럼명을 포함하여 자연어로 변환)
+            if info["embedded"]:
+                yield from rows_to_documents(df)
+        if writer:
+            writer.commit()
+            writer = None
+            graph.refresh_file(filename)  # ✅ 대시보드용 시계열 집계 미리 계산
+    finally:
+        source.close()
+        if writer:
+            writer.abort()  # 중간에 취소/실패 → 기존 테이블 유지
+
+def is_numeric_table(df: pd.DataFrame, date_column: str = None) -> bool:
+    """날짜 컬럼을 제외한 모든 컬럼이 숫자인지"""
+    columns = [col for col in df.columns if col != date_column]
+    return bool(columns) and all(pd.api.types.is_numeric_dtype(df[col]) for col in columns)
+
+def rows_to_documents(df: pd.DataFrame) -> list:
+    """행 → "컬럼: 값, 컬럼: 값" 문자열 (값 문자열 변환은 컬럼 단위로 한 번에, 빈 값은 생략)"""
+    parts = [(f"{col}: " + df[col].astype(str)).where(df[col].notna(), "").tolist() for col in df.columns]
+    return [", ".join(filter(None, row_parts)) for row_parts in zip(*parts)]
+
+def iter_data_frames(source, file_ext: str, chunk_rows: int = None, progress: dict = None):
+    """📊 CSV/XLSX/JSON/JSONL → chunk_rows 행씩 DataFrame yield"""
+    chunk_rows = chunk_rows or DATA_CHUNK_ROWS
+    total = _source_size(source)
+    if progress is not None:
+        progress.update(done=0, total=total)
 
-    print(f"📂 {original_filename}에서 {len(docs)}개의 문서 조각 생성됨.")
-
-    # ✅ 임베딩 및 ChromaDB 저장
-    for i, doc in enumerate(docs):
-        try:
-            vector = embedding_model.embed_documents([doc])[0]
-        except Exception as e:
-            print(f"❌ 임베딩 생성 오류: {e}")
-            continue
-
-        collection.add(
-            ids=[f"{original_filename}-{i}"],
-            embeddings=[vector],
-            metadatas=[{"filename": original_filename, "hash": file_hash, "text": doc}],
-            documents=[doc]
-        )
-
-    print(f"✅ {original_filename}이(가) ChromaDB에 저장됨. (총 {len(docs)}개)")
-    return {"message": f"✅ {original_filename} 업로드 및 저장 완료!"}
-
-def process_data_file(file_content: bytes, file_ext: str):
-    """📊 CSV/JSON 파일을 분석하여 ChromaDB에 저장할 문서 생성"""
-    docs = []
-    
     if file_ext == "csv":
-        df = pd.read_csv(io.BytesIO(file_content))
-    elif file_ext == "xlsx":
-        df = pd.read_excel(io.BytesIO(file_content))
+        frames = pd.read_csv(source, chunksize=chunk_rows)
+    elif file_ext == "jsonl" or (file_ext == "json" and _looks_like_json_lines(source)):
+        frames = pd.read_json(source, lines=True, chunksize=chunk_rows)
     elif file_ext == "json":
-        data = json.loads(file_content.decode("utf-8"))
-        df = pd.DataFrame(data)
+        frames = _json_frames(source, chunk_rows)
+    elif file_ext == "xlsx":
+        frames = _xlsx_frames(source, chunk_rows, progress)
+        total = None  # 진행률은 행 기준으로 _xlsx_frames에서 기록
+    else:
+        raise ValueError(f"지원하지 않는 데이터 파일 형식입니다: {file_ext}")
+
+    for df in frames:
+        if progress is not None and total:
+            progress["done"] = min(source.tell(), total)  # 버퍼만큼 앞설 수 있는 근사값
+        yield df
+
+def _source_size(source) -> int:
+    position = source.tell()
+    size = source.seek(0, io.SEEK_END)
+    source.seek(position)
+    return size
+
+def _looks_like_json_lines(source) -> bool:
+    """첫 줄이 완결된 JSON 객체이고 뒤에 내용이 더 있으면 JSON Lines로 판단"""
+    position = source.tell()
+    if not source.read(64).lstrip().startswith(b"{"):  # 배열이면 한 줄짜리 큰 파일일 수 있으므로 줄을 읽지 않음
+        source.seek(position)
+        return False
+    source.seek(position)
+    first_line = source.readline().strip()
+    has_more = bool(source.read(1).strip() or source.readline().strip())
+    source.seek(position)
+    if not has_more:
+        return False
+    try:
+        return isinstance(json.loads(first_line), dict)
+    except ValueError:
+        return False
+
+def _json_frames(source, chunk_rows: int):
+    """JSON 배열([{...}, ...])은 항목을 차례로 파싱, 그 외 형식({"컬럼": [...]} 등)은 전체를 읽어 변환"""
+    head = source.read(64).lstrip()
+    source.seek(0)
+    if not head.startswith(b"["):
+        df = pd.DataFrame(json.loads(source.read().decode("utf-8")))
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+        return
+
+    records = []
+    for record in iter_json_array(source):
+        records.append(record)
+        if len(records) >= chunk_rows:
+            yield pd.DataFrame(records)
+            records = []
+    if records:
+        yield pd.DataFrame(records)
+
+def iter_json_array(source, buffer_size: int = 1024 * 1024):
+    """JSON 배열 항목을 하나씩 yield (buffer_size 글자씩 읽음 → 파일 전체를 메모리에 올리지 않음)"""
+    decoder = json.JSONDecoder()
+    reader = io.TextIOWrapper(source, encoding="utf-8")
+    buffer, position, eof = "", 0, False
+
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        chunk = reader.read(buffer_size)
+        eof = not chunk
+        buffer, position = buffer[position:] + chunk, 0
+        return bool(chunk)
+
+    def skip(characters: str):
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in characters:
+                position += 1
+            if position < len(buffer) or not fill():
+                return
+
+    try:
+        skip(" \t\r\n")
+        if buffer[position:position + 1] != "[":
+            raise ValueError("JSON 배열 형식이 아닙니다.")
+        position += 1
+        while True:
+            skip(" \t\r\n,")
+            if position >= len(buffer) or buffer[position] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof or not fill():  # 항목이 버퍼 경계에 걸침 → 더 읽고 다시 시도
+                    raise
+                continue
+            if end == len(buffer) and not eof and not isinstance(record, (dict, list)):
+                fill()  # 숫자/문자열 값이 버퍼 끝에서 잘렸을 수 있음
+                continue
+            position = end
+            yield record
+    finally:
+        reader.detach()  # source는 호출한 쪽에서 닫음
+
+def _xlsx_frames(source, chunk_rows: int, progress: dict = None):
+    """첫 번째 시트를 읽기 전용 모드로 행 단위 스트리밍 (첫 행 = 컬럼명)"""
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)]
+        if progress is not None:
+            progress.update(done=0, total=max((sheet.max_row or 1) - 1, 0) or None)
 
-    # ✅ 데이터 변환 (컬럼명을 포함하여 자연어로 변환)
-    for _, row in df.iterrows():
-        doc_text = ", ".join([f"{col}: {row[col]}" for col in df.columns if pd.notna(row[col])])
-        docs.append(doc_text)
+        batch, done = [], 0
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_rows:
+                done += len(batch)
+                if progress is not None:
+                    progress["done"] = done
+                yield pd.DataFrame(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns)
+    finally:
+        workbook.close()
 
-    return docs
+def read_data_file(file_content: bytes, file_ext: str) -> pd.DataFrame:
+    """📊 CSV/XLSX/JSON/JSONL 파일 → DataFrame (작은 파일 전체 읽기용)"""
+    frames = list(iter_data_frames(io.BytesIO(file_content), file_ext))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
@@ -0,0 +1,288 @@
+import math
+import time
+import threading
+import datetime
+import pandas as pd
+from data import sensor_store
+from data.sensor_store import quote, DATE_FORMAT, _date_bounds
+
+# ✅ 센서 시계열 집계 (모니터링 대시보드용)
+#    원본 행을 매번 GROUP BY 하지 않도록 1분/1시간/1일 단위 집계(rollup)를 센서 저장소에 미리 만들어 둠
+#    - 1m은 원본 행에서, 1h는 1m 집계에서, 1d는 1h 집계에서 계산
+#    - 테이블에 행이 추가되면 (rowid 기준) 새 행의 1m 집계를 기존 구간에 더하고, 1h/1d는 새 행의 가장 이른 시각 이후 구간만 다시 계산
+#    - 파일이 다시 업로드되면 (테이블 버전 변경) 전체 재계산
+
+# ✅ 집계 단위 → 시각 문자열 앞부분 길이 + 나머지 채움 (DATE_FORMAT "YYYY-MM-DD HH:MM:SS" 기준)
+INTERVALS = {
+    "1m": (16, ":00"),
+    "1h": (13, ":00:00"),
+    "1d": (10, " 00:00:00"),
+}
+BUCKET_SECONDS = {"1m": 60, "1h": 3600, "1d": 86400}
+MAX_POINTS = 1000  # interval=auto일 때 한 번에 돌려줄 최대 구간 수
+
+
+_ready = threading.local()
+
+
+def get_connection():
+    conn = sensor_store.get_connection()
+    if getattr(_ready, "conn", None) is conn:
+        return conn
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rollups (
+            table_name TEXT NOT NULL, bucket TEXT NOT NULL, ts TEXT NOT NULL, column_name TEXT NOT NULL,
+            count INTEGER NOT NULL, sum REAL, min REAL, max REAL, sumsq REAL,
+            PRIMARY KEY (table_name, bucket, ts, column_name)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rollup_state (
+            table_name TEXT PRIMARY KEY, version REAL NOT NULL, last_rowid INTEGER NOT NULL, updated_at REAL NOT NULL
+        )
+    """)
+    _ready.conn = conn
+    return conn
+
+
+def bucket_key(column: str, interval: str) -> str:
+    """시각 컬럼 → 집계 구간 시작 시각 문자열 SQL 식"""
+    length, fill = INTERVALS[interval]
+    return f"substr({column}, 1, {length}) || '{fill}'"
+
+
+def numeric_columns(table: dict) -> list:
+    types = sensor_store._column_types(table["table"])
+    return [col for col in table["columns"] if types.get(col) in ("INTEGER", "REAL") and col != table["date_column"]]
+
+
+def find_table(filename: str):
+    return next((table for table in sensor_store.list_tables() if table["filename"] == filename), None)
+
+
+# ✅ 1️⃣ 집계 생성/갱신
+def update_rollups(table: dict) -> dict:
+    """테이블 집계를 최신 상태로 (버전이 같으면 새로 추가된 행 구간만 재계산) → {"mode", "rows", "sec"}"""
+    if not table["date_column"]:
+        return {"mode": "skipped", "rows": 0, "sec": 0.0}
+
+    start_time = time.perf_counter()
+    conn = get_connection()
+    name, date_column = table["table"], quote(table["date_column"])
+    version = sensor_store.table_versions().get(name)
+    state = conn.execute("SELECT version, last_rowid FROM rollup_state WHERE table_name = ?", (name,)).fetchone()
+    last_rowid = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {quote(name)}").fetchone()[0]
+
+    if state and state[0] == version:
+        if last_rowid <= state[1]:
+            return {"mode": "fresh", "rows": 0, "sec": 0.0}
+        mode = "incremental"
+        since, new_rows = conn.execute(f"SELECT MIN({date_column}), COUNT(*) FROM {quote(name)} WHERE rowid > ?",
+                                       (state[1],)).fetchone()
+    else:
+        mode, since, new_rows = "full", None, table["rows"]
+
+    with sensor_store._write_lock:
+        if mode == "full":
+            conn.execute("DELETE FROM rollups WHERE table_name = ?", (name,))
+        if mode == "full" or since is not None:  # since가 없으면 날짜 값이 없는 행만 추가된 경우
+            for interval in INTERVALS:
+                _rebuild_interval(conn, table, interval, since,
+                                  (state[1], last_rowid) if mode == "incremental" else None)
+        conn.execute("INSERT OR REPLACE INTO rollup_state (table_name, version, last_rowid, updated_at) VALUES (?, ?, ?, ?)",
+                     (name, version, last_rowid, time.time()))
+        conn.commit()
+    return {"mode": mode, "rows": new_rows, "sec": round(time.perf_counter() - start_time, 3)}
+
+
+def _rebuild_interval(conn, table: dict, interval: str, since, new_rowids=None):
+    """since 이후 (since가 속한 구간부터) interval 집계 재계산 (1m은 원본, 나머지는 한 단계 작은 집계에서)
+
+    new_rowids=(이전, 현재 마지막 rowid)가 있으면 (행 추가만 된 경우) 1m은 재계산하지 않고 새 행 집계를 기존 구간에 더함
+    → 실시간 수집처럼 같은 1분 구간에 행이 계속 쌓여도 새 행만 읽음
+    """
+    name = table["table"]
+    since_key = None
+    if since is not None:
+        length, fill = INTERVALS[interval]
+        since_key = since[:length] + fill
+        if interval != "1m" or new_rowids is None:
+            conn.execute("DELETE FROM rollups WHERE table_name = ? AND bucket = ? AND ts >= ?", (name, interval, since_key))
+
+    if interval == "1m":
+        date_column = quote(table["date_column"])
+        for col in numeric_columns(table):
+            where = f"WHERE {quote(col)} IS NOT NULL AND {date_column} IS NOT NULL"
+            params = [name, interval, col]
+            upsert = ""
+            if new_rowids is not None:
+                where += " AND rowid > ? AND rowid <= ?"
+                params.extend(new_rowids)
+                upsert = """ON CONFLICT (table_name, bucket, ts, column_name) DO UPDATE SET
+                    count = count + excluded.count, sum = sum + excluded.sum, min = MIN(min, excluded.min),
+                    max = MAX(max, excluded.max), sumsq = sumsq + excluded.sumsq"""
+            elif since_key:
+                where += f" AND {date_column} >= ?"
+                params.append(since_key)
+            conn.execute(f"""
+                INSERT INTO rollups (table_name, bucket, ts, column_name, count, sum, min, max, sumsq)
+                SELECT ?, ?, {bucket_key(date_column, interval)}, ?, COUNT(*), SUM({quote(col)}), MIN({quote(col)}),
+                       MAX({quote(col)}), SUM({quote(col)} * {quote(col)})
+                FROM {quote(name)} {where} GROUP BY 3 {upsert}
+            """, params)
+    else:
+        source = list(INTERVALS)[list(INTERVALS).index(interval) - 1]
+        where = "WHERE table_name = ? AND bucket = ?"
+        params = [name, interval, name, source]
+        if since_key:
+            where += " AND ts >= ?"
+            params.append(since_key)
+        conn.execute(f"""
+            INSERT INTO rollups (table_name, bucket, ts, column_name, count, sum, min, max, sumsq)
+            SELECT ?, ?, {bucket_key('ts', interval)}, column_name, SUM(count), SUM(sum), MIN(min), MAX(max), SUM(sumsq)
+            FROM rollups {where} GROUP BY 3, 4
+        """, params)
+
+
+def refresh_file(filename: str):
+    """업로드/실시간 수집 직후 호출 → 해당 파일 집계 갱신"""
+    table = find_table(filename)
+    if table:
+        result = update_rollups(table)
+        if result["mode"] != "fresh":
+            print(f"📈 시계열 집계 갱신: {filename} ({result['mode']}, {result['rows']}행, {result['sec']}초)")
+
+
+def drop_rollups(filename: str):
+    name = sensor_store.table_name_for(filename)
+    with sensor_store._write_lock:
+        conn = get_connection()
+        conn.execute("DELETE FROM rollups WHERE table_name = ?", (name,))
+        conn.execute("DELETE FROM rollup_state WHERE table_name = ?", (name,))
+        conn.commit()
+
+
+# ✅ 2️⃣ 조회
+def list_series() -> list:
+    """시계열로 볼 수 있는 파일 (날짜 컬럼 + 숫자 센서 컬럼이 있는 테이블)"""
+    series = []
+    for table in sensor_store.list_tables():
+        sensors = numeric_columns(table) if table["date_column"] else []
+        if not sensors:
+            continue
+        stats = table.get("stats") or {}
+        series.append({"filename": table["filename"], "sensors": sensors, "rows": table["rows"],
+                       "first": stats.get("first"), "last": stats.get("last")})
+    return series
+
+
+def choose_interval(start: str, end: str) -> str:
+    """구간 수가 MAX_POINTS 이하가 되는 가장 작은 집계 단위"""
+    span = (datetime.datetime.strptime(end, DATE_FORMAT) - datetime.datetime.strptime(start, DATE_FORMAT)).total_seconds()
+    for interval, seconds in BUCKET_SECONDS.items():
+        if span / seconds <= MAX_POINTS:
+            return interval
+    return "1d"
+
+
+def query_series(filename: str, sensors: list = None, start=None, end=None, interval: str = "auto",
+                 rolling: int = 0) -> dict:
+    """📈 [start, end) 구간의 센서별 집계 시계열
+
+    - interval: 1m | 1h | 1d | auto (구간 수 MAX_POINTS 이하)
+    - rolling: 최근 N개 구간 이동 평균/표준편차 (구간 합계로 계산, 0이면 생략)
+    → {"interval", "ts": [구간 시작 시각], "series": {센서: {"mean", "min", "max", "count"[, "rolling_mean", "rolling_std"]}}}
+    """
+    if rolling < 0:
+        return {"error": f"❌ 잘못된 이동 구간 수: {rolling} (0 이상)"}
+    for value in (start, end):
+        if isinstance(value, str) and pd.isna(pd.to_datetime(value, errors="coerce")):
+            return {"error": f"❌ 잘못된 날짜: {value}"}
+    table = find_table(filename)
+    if not table or not table["date_column"]:
+        return {"error": f"❌ {filename}의 시계열 데이터를 찾을 수 없습니다."}
+    update_rollups(table)  # 마지막 갱신 이후 추가된 행 반영 (없으면 바로 반환)
+
+    available = numeric_columns(table)
+    sensors = [col for col in (sensors or available) if col in available]
+    conn = get_connection()
+    if start is None or end is None:  # 기간을 안 주면 전체 기간 (일 단위 집계의 처음 ~ 마지막 날 다음날)
+        first, last = conn.execute("SELECT MIN(ts), MAX(ts) FROM rollups WHERE table_name = ? AND bucket = '1d'",
+                                   (table["table"],)).fetchone()
+        if first is None:
+            return {"filename": filename, "interval": interval, "ts": [], "series": {}}
+        end = end or (datetime.datetime.strptime(last, DATE_FORMAT) + datetime.timedelta(days=1)).strftime(DATE_FORMAT)
+        if start is None and interval in BUCKET_SECONDS:  # 단위를 정했다면 최근 MAX_POINTS개 구간만
+            recent = datetime.datetime.strptime(_date_bounds(end, end)[0], DATE_FORMAT) - datetime.timedelta(
+                seconds=BUCKET_SECONDS[interval] * MAX_POINTS)
+            start = max(first, recent.strftime(DATE_FORMAT))
+        start = start or first
+    start_text, end_text = _date_bounds(start, end)
+    if interval == "auto":
+        interval = choose_interval(start_text, end_text)
+    if interval not in INTERVALS:
+        return {"error": f"❌ 지원하지 않는 집계 단위: {interval} (1m, 1h, 1d, auto)"}
+
+    length, fill = INTERVALS[interval]
+    placeholders = ",".join("?" * len(sensors))
+    rows = conn.execute(f"""
+        SELECT ts, column_name, count, sum, min, max, sumsq FROM rollups
+        WHERE table_name = ? AND bucket = ? AND column_name IN ({placeholders}) AND ts >= ? AND ts < ?
+        ORDER BY ts
+    """, [table["table"], interval, *sensors, start_text[:length] + fill, end_text]).fetchall()
+
+    timestamps = sorted({row[0] for row in rows})
+    position = {ts: i for i, ts in enumerate(timestamps)}
+    series = {col: {"mean": [None] * len(timestamps), "min": [None] * len(timestamps), "max": [None] * len(timestamps),
+                    "count": [0] * len(timestamps)} for col in sensors}
+    sums = {col: [(0, 0.0, 0.0)] * len(timestamps) for col in sensors}
+    for ts, col, count, total, low, high, sumsq in rows:
+        i = position[ts]
+        values = series[col]
+        values["mean"][i] = round(total / count, 3) if count else None
+        values["min"][i], values["max"][i], values["count"][i] = low, high, count
+        sums[col][i] = (count, total or 0.0, sumsq or 0.0)
+
+    if rolling and rolling > 1:
+        for col in sensors:
+            series[col]["rolling_mean"], series[col]["rolling_std"] = rolling_stats(sums[col], rolling)
+
+    return {"filename": filename, "interval": interval, "start": start_text, "end": end_text,
+            "ts": timestamps, "series": series}
+
+
+def rolling_stats(sums: list, window: int) -> tuple:
+    """구간별 (개수, 합, 제곱합) → 최근 window개 구간의 이동 평균/표준편차 (누적합으로 O(n))"""
+    means, stds = [], []
+    count = total = sumsq = 0.0
+    for i, (c, s, q) in enumerate(sums):
+        count, total, sumsq = count + c, total + s, sumsq + q
+        if i >= window:
+            old_c, old_s, old_q = sums[i - window]
+            count, total, sumsq = count - old_c, total - old_s, sumsq - old_q
+        if count:
+            mean = total / count
+            means.append(round(mean, 3))
+            stds.append(round(math.sqrt(max(sumsq / count - mean * mean, 0.0)), 3))
+        else:
+            means.append(None)
+            stds.append(None)
+    return means, stds
+
+
+def latest_values(filename: str = None) -> list:
+    """🕒 센서별 마지막 측정값과 시각 (날짜 인덱스를 역순으로 읽음)"""
+    conn = sensor_store.get_connection()
+    results = []
+    for table in sensor_store.list_tables():
+        if (filename and table["filename"] != filename) or not table["date_column"]:
+            continue
+        date_column = quote(table["date_column"])
+        sensors = {}
+        for col in numeric_columns(table):
+            row = conn.execute(f"SELECT {date_column}, {quote(col)} FROM {quote(table['table'])} "
+                               f"WHERE {quote(col)} IS NOT NULL ORDER BY {date_column} DESC LIMIT 1").fetchone()
+            if row:
+                sensors[col] = {"ts": row[0], "value": row[1]}
+        results.append({"filename": table["filename"], "sensors": sensors})
+    return results
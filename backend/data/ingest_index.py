@@ -0,0 +1,176 @@
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+from core.config import STORAGE_DIR
+
+# ✅ 업로드 파일 카탈로그 + 문서 조각 해시 색인 (SQLite, 서버 재시작 후에도 유지)
+#    - files: 저장 완료된 파일 목록 (해시, 컬렉션, 조각 수, 크기, 업로드 시각) → /files 조회, 같은 파일 재업로드 차단
+#    - chunks: 파일별 조각 id(내용 해시 기반) + 마지막으로 확인한 업로드(run_id) → 수정된 파일은 바뀐 조각만 임베딩,
+#              업로드가 끝나면 이번 run_id로 확인되지 않은 조각 = 파일에서 사라진 조각으로 삭제
+INGEST_DB_PATH = os.path.join(STORAGE_DIR, "ingest_index.db")
+
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+def get_connection() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(INGEST_DB_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(INGEST_DB_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                filename TEXT PRIMARY KEY,
+                file_hash TEXT NOT NULL,
+                collection TEXT NOT NULL,
+                chunk_count INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(files)")}
+        for column, column_type in (("size_bytes", "INTEGER"), ("uploaded_at", "REAL")):
+            if column not in columns:  # 카탈로그 항목이 추가되기 전에 만들어진 DB
+                conn.execute(f"ALTER TABLE files ADD COLUMN {column} {column_type}")
+        conn.execute("CREATE INDEX IF NOT EXISTS files_collection ON files (collection, updated_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS catalog_sync (collection TEXT PRIMARY KEY, synced_at REAL NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS files_hash ON files (file_hash)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                filename TEXT NOT NULL, chunk_id TEXT NOT NULL, run_id TEXT NOT NULL,
+                PRIMARY KEY (filename, chunk_id)
+            ) WITHOUT ROWID
+        """)
+        _local.conn = conn
+    return conn
+
+
+# ✅ 1️⃣ 조각 id (내용 기반 → 파일이 수정돼도 바뀌지 않은 조각은 같은 id, 파일 안의 같은 내용은 하나로 저장)
+def chunk_id(filename: str, text: str) -> str:
+    return f"{filename}#{hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]}"
+
+
+# ✅ 2️⃣ 파일 단위
+def find_file(file_hash: str):
+    """같은 내용으로 저장 완료된 파일명 (없으면 None)"""
+    row = get_connection().execute("SELECT filename FROM files WHERE file_hash = ?", (file_hash,)).fetchone()
+    return row[0] if row else None
+
+
+def record_file(filename: str, file_hash: str, collection: str, chunk_count: int, size_bytes: int = None):
+    """업로드 완료 시 카탈로그 갱신 (같은 이름 재업로드면 처음 업로드 시각은 유지)"""
+    now = time.time()
+    with _write_lock:
+        conn = get_connection()
+        conn.execute("""
+            INSERT INTO files (filename, file_hash, collection, chunk_count, size_bytes, uploaded_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (filename) DO UPDATE SET file_hash = excluded.file_hash, collection = excluded.collection,
+                chunk_count = excluded.chunk_count, size_bytes = excluded.size_bytes, updated_at = excluded.updated_at
+        """, (filename, file_hash, collection, chunk_count, size_bytes, now, now))
+        conn.commit()
+
+
+def list_files(collection: str = None, offset: int = 0, limit: int = 100) -> list:
+    """카탈로그 조회 (최근 업로드 순, 페이지 단위)"""
+    query = "SELECT filename, collection, file_hash, chunk_count, size_bytes, uploaded_at, updated_at FROM files"
+    params = []
+    if collection:
+        query += " WHERE collection = ?"
+        params.append(collection)
+    rows = get_connection().execute(query + " ORDER BY updated_at DESC, filename LIMIT ? OFFSET ?",
+                                    params + [limit, offset])
+    keys = ("filename", "collection", "hash", "chunks", "size_bytes", "uploaded_at", "updated_at")
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def count_files(collection: str = None) -> int:
+    if collection:
+        return get_connection().execute("SELECT COUNT(*) FROM files WHERE collection = ?", (collection,)).fetchone()[0]
+    return get_connection().execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+
+def sync_catalog(collection, name: str, page_size: int = 1000):
+    """📂 카탈로그가 생기기 전에 저장된 파일을 컬렉션 메타데이터로 한 번만 등록
+    (예전 메타데이터에 중복 저장된 조각 본문 "text"도 이때 제거)"""
+    conn = get_connection()
+    if conn.execute("SELECT 1 FROM catalog_sync WHERE collection = ?", (name,)).fetchone():
+        return
+
+    found = {}  # 파일명 → [파일 해시, 조각 수]
+    offset = 0
+    while True:
+        page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+        if not page["ids"]:
+            break
+        legacy_ids = []
+        for doc_id, meta in zip(page["ids"], page["metadatas"]):
+            if not meta or "filename" not in meta:
+                continue
+            entry = found.setdefault(meta["filename"], [meta.get("hash", ""), 0])
+            entry[1] += 1
+            if "text" in meta:
+                legacy_ids.append(doc_id)
+        if legacy_ids:
+            collection.update(ids=legacy_ids, metadatas=[{"text": None} for _ in legacy_ids])  # None → 키 삭제
+        offset += len(page["ids"])
+
+    now = time.time()
+    with _write_lock:
+        conn.executemany("""
+            INSERT OR IGNORE INTO files (filename, file_hash, collection, chunk_count, size_bytes, uploaded_at, updated_at)
+            VALUES (?, ?, ?, ?, NULL, ?, ?)
+        """, [(filename, file_hash, name, count, now, now) for filename, (file_hash, count) in found.items()])
+        conn.execute("INSERT OR REPLACE INTO catalog_sync (collection, synced_at) VALUES (?, ?)", (name, now))
+        conn.commit()
+    print(f"📂 파일 카탈로그 동기화 ({name}): {len(found)}개 파일, {offset}개 조각")
+
+
+def remove_file(filename: str):
+    with _write_lock:
+        conn = get_connection()
+        conn.execute("DELETE FROM files WHERE filename = ?", (filename,))
+        conn.execute("DELETE FROM chunks WHERE filename = ?", (filename,))
+        conn.commit()
+
+
+# ✅ 3️⃣ 조각 단위
+def has_chunks(filename: str) -> bool:
+    return get_connection().execute("SELECT 1 FROM chunks WHERE filename = ? LIMIT 1", (filename,)).fetchone() is not None
+
+
+def lookup_chunks(filename: str, ids: list) -> dict:
+    """저장된 조각 id → 마지막으로 확인한 run_id (없는 id는 제외)"""
+    placeholders = ",".join("?" * len(ids))
+    rows = get_connection().execute(
+        f"SELECT chunk_id, run_id FROM chunks WHERE filename = ? AND chunk_id IN ({placeholders})", [filename, *ids])
+    return dict(rows.fetchall())
+
+
+def mark_chunks(filename: str, ids: list, run_id: str):
+    """조각이 run_id 업로드에 포함됨을 기록 (새로 저장했거나 기존 조각을 재사용)"""
+    with _write_lock:
+        conn = get_connection()
+        conn.executemany("INSERT OR REPLACE INTO chunks (filename, chunk_id, run_id) VALUES (?, ?, ?)",
+                         [(filename, doc_id, run_id) for doc_id in ids])
+        conn.commit()
+
+
+def stale_chunks(filename: str, run_id: str) -> list:
+    """run_id 업로드에서 확인되지 않은 조각 id (파일에서 사라진 내용)"""
+    rows = get_connection().execute("SELECT chunk_id FROM chunks WHERE filename = ? AND run_id != ?", (filename, run_id))
+    return [row[0] for row in rows]
+
+
+def count_chunks(filename: str) -> int:
+    return get_connection().execute("SELECT COUNT(*) FROM chunks WHERE filename = ?", (filename,)).fetchone()[0]
+
+
+def remove_chunks(filename: str, ids: list):
+    with _write_lock:
+        conn = get_connection()
+        conn.executemany("DELETE FROM chunks WHERE filename = ? AND chunk_id = ?", [(filename, doc_id) for doc_id in ids])
+        conn.commit()
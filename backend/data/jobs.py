@@ -0,0 +1,205 @@
+import os
+import json
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from core.config import STORAGE_DIR, INGEST_WORKERS
+from data.file_handler import ingest_file, pending_hashes, target_collection_name
+from core.answer_cache import answer_cache
+from core.registry import get_collection
+
+# ✅ 업로드 작업 상태 저장 위치 (재시작 후 재개를 위해 디스크에 보관)
+JOBS_DIR = os.path.join(STORAGE_DIR, "jobs")
+
+# ✅ 작업 상태 값
+QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED = "queued", "running", "completed", "failed", "cancelled"
+
+
+class IngestJobManager:
+    """📦 업로드 파일을 즉시 접수하고 워커 스레드 풀에서 임베딩/저장을 처리하는 작업 큐"""
+
+    def __init__(self, max_workers: int = INGEST_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest")
+        self.jobs = {}  # job_id → 작업 상태 dict
+        self.cancel_events = {}  # job_id → threading.Event
+        self.stopping = threading.Event()  # 서버 종료 중 (작업은 취소하지 않고 대기/실행 상태로 남겨 재시작 때 재개)
+        self.lock = threading.Lock()
+        os.makedirs(JOBS_DIR, exist_ok=True)
+
+    # ✅ 1️⃣ 작업 등록 (incoming_path()에 저장해 둔 업로드 파일을 작업 원본으로 이동)
+    def incoming_path(self) -> str:
+        """업로드를 스트리밍으로 저장할 임시 경로 (작업 디렉터리와 같은 파일 시스템 → 이동 비용 없음)"""
+        return os.path.join(JOBS_DIR, f"incoming-{uuid.uuid4().hex}.part")
+
+    def submit(self, filename: str, upload_path: str, file_hash: str) -> dict:
+        job_id = uuid.uuid4().hex
+        os.replace(upload_path, self._upload_path(job_id))
+
+        job = {
+            "id": job_id,
+            "filename": filename,
+            "hash": file_hash,
+            "status": QUEUED,
+            "chunks_done": 0,
+            "chunks_total": None,
+            "eta_sec": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+        }
+        with self.lock:
+            self.jobs[job_id] = job
+            self._save(job)
+        self._schedule(job_id)
+        return dict(job)
+
+    # ✅ 2️⃣ 작업 조회
+    def get(self, job_id: str):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list(self) -> list:
+        with self.lock:
+            return sorted((dict(job) for job in self.jobs.values()), key=lambda job: job["created_at"], reverse=True)
+
+    # ✅ 3️⃣ 작업 취소 (대기 중이면 즉시, 실행 중이면 다음 배치 경계에서 중단)
+    def cancel(self, job_id: str):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job or job["status"] not in (QUEUED, RUNNING):
+                return None
+            self.cancel_events[job_id].set()
+            if job["status"] == QUEUED:
+                job["status"] = CANCELLED
+                job["finished_at"] = time.time()
+                pending_hashes.discard(job["hash"])  # 같은 파일 재업로드 허용 (재개하면 다시 등록)
+                self._save(job)
+            return dict(job)
+
+    # ✅ 4️⃣ 작업 재개 (취소/실패한 작업을 다시 처리, 이미 저장된 조각은 임베딩하지 않음)
+    def resume(self, job_id: str):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job or job["status"] not in (CANCELLED, FAILED) or not os.path.exists(self._upload_path(job_id)):
+                return None
+            if job["hash"] in pending_hashes:  # 취소 후 같은 파일이 다시 업로드되어 처리 중
+                return None
+            job["status"] = QUEUED
+            job["error"] = None
+            job["finished_at"] = None
+            pending_hashes.add(job["hash"])
+            self._save(job)
+        self._schedule(job_id)
+        return self.get(job_id)
+
+    # ✅ 5️⃣ 서버 재시작 시 디스크의 작업 목록 복구 → 미완료 작업 자동 재개
+    def recover(self):
+        for name in os.listdir(JOBS_DIR):
+            if name.endswith(".part"):
+                os.remove(os.path.join(JOBS_DIR, name))  # 업로드 도중 중단된 임시 파일
+                continue
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(JOBS_DIR, name), encoding="utf-8") as f:
+                    job = json.load(f)
+            except Exception as e:
+                print(f"❌ 작업 상태 파일 읽기 오류 ({name}): {e}")
+                continue
+
+            with self.lock:
+                self.jobs[job["id"]] = job
+
+            if job["status"] in (QUEUED, RUNNING):
+                print(f"🔁 업로드 작업 재개: {job['filename']} (저장된 {job['chunks_done']}개 조각은 재사용)")
+                with self.lock:
+                    job["status"] = QUEUED
+                    pending_hashes.add(job["hash"])  # 다시 처리하는 작업만 (완료된 파일은 ingest_index로 중복 확인)
+                    self._save(job)
+                self._schedule(job["id"])
+
+    def shutdown(self):
+        """워커 중지 (실행 중인 작업은 다음 배치 경계에서 멈추고 상태는 대기로 남김 → recover()에서 재개)"""
+        self.stopping.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # ✅ 내부 처리
+    def _schedule(self, job_id: str):
+        self.cancel_events[job_id] = threading.Event()
+        self.executor.submit(self._run, job_id)
+
+    def _run(self, job_id: str):
+        cancel_event = self.cancel_events[job_id]
+        with self.lock:
+            job = self.jobs[job_id]
+            if job["status"] != QUEUED or cancel_event.is_set() or self.stopping.is_set():
+                return
+            job["status"] = RUNNING
+            job["started_at"] = time.time()
+            self._save(job)
+        run_started = time.perf_counter()
+
+        def on_progress(done: int, total: int):
+            elapsed = time.perf_counter() - run_started
+            with self.lock:
+                job["chunks_done"] = done
+                job["chunks_total"] = total
+                job["eta_sec"] = round((total - done) * elapsed / done, 1) if done > 0 and total else None
+                self._save(job)
+
+        try:
+            result = ingest_file(job["filename"], None, job["hash"],
+                                 get_collection("documents"), get_collection("data_files"),
+                                 on_progress=on_progress,
+                                 should_cancel=lambda: cancel_event.is_set() or self.stopping.is_set(),
+                                 file_path=self._upload_path(job_id))
+        except Exception as e:
+            print(f"❌ 업로드 작업 실패 ({job['filename']}): {e}")
+            with self.lock:
+                job["status"] = FAILED
+                job["error"] = str(e)
+                job["finished_at"] = time.time()
+                pending_hashes.discard(job["hash"])
+                self._save(job)
+            answer_cache.invalidate(target_collection_name(job["filename"]))  # 일부 조각이 저장됐을 수 있음
+            return
+
+        with self.lock:
+            job["result"] = result
+            job["finished_at"] = time.time()
+            failed = (result.get("stats") or {}).get("failed", 0)  # 임베딩에 실패한 조각 수
+            job["eta_sec"] = 0 if "error" not in result and not failed else None
+            if "error" in result or failed:  # 업로드 원본은 남겨 두고 재개 시 실패한 조각만 다시 처리
+                job["status"] = FAILED
+                job["error"] = result.get("error") or f"조각 {failed}개 임베딩 실패"
+                pending_hashes.discard(job["hash"])
+            elif result["stats"]["cancelled"] and not cancel_event.is_set():  # 서버 종료로 중단 → 재시작 때 재개
+                job["status"] = QUEUED
+                job["finished_at"] = job["eta_sec"] = None
+            elif result["stats"]["cancelled"]:
+                job["status"] = CANCELLED
+                job["eta_sec"] = None
+                pending_hashes.discard(job["hash"])
+            else:
+                job["status"] = COMPLETED
+                pending_hashes.discard(job["hash"])  # 이후 중복 확인은 ingest_index가 담당
+            self._save(job)
+
+        # ✅ 컬렉션 내용이 바뀌었으므로 관련 캐시 답변 제거
+        answer_cache.invalidate(target_collection_name(job["filename"]))
+
+        if job["status"] == COMPLETED:
+            os.remove(self._upload_path(job_id))  # ✅ 완료된 작업은 업로드 원본 삭제
+
+    def _upload_path(self, job_id: str) -> str:
+        return os.path.join(JOBS_DIR, f"{job_id}.upload")
+
+    def _save(self, job: dict):
+        path = os.path.join(JOBS_DIR, f"{job['id']}.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
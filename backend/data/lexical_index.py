@@ -0,0 +1,149 @@
+import os
+import re
+import math
+import sqlite3
+import threading
+from collections import Counter
+from core.config import STORAGE_DIR
+
+# ✅ documents 컬렉션용 BM25 역색인 (SQLite에 영구 저장, 업로드/삭제 시 증분 갱신)
+LEXICAL_DB_PATH = os.path.join(STORAGE_DIR, "lexical_index.db")
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# ✅ 한국어 조사/어미 (어절 끝에서 제거 → "딸기는", "딸기의" → "딸기")
+KOREAN_SUFFIXES = sorted([
+    "으로부터", "에서부터", "이라는", "에서는", "으로는", "에게서", "까지는", "부터는",
+    "에서", "에게", "으로", "까지", "부터", "처럼", "보다", "이나", "라는", "이다", "입니다", "합니다", "하는", "하고",
+    "은", "는", "이", "가", "을", "를", "에", "의", "로", "와", "과", "도", "만", "나", "요",
+], key=len, reverse=True)
+
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+def get_connection() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(LEXICAL_DB_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(LEXICAL_DB_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS docs (doc_id TEXT PRIMARY KEY, filename TEXT NOT NULL, length INTEGER NOT NULL)")
+        conn.execute("CREATE INDEX IF NOT EXISTS docs_filename ON docs (filename)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL, doc_id TEXT NOT NULL, tf INTEGER NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id)")
+        _local.conn = conn
+    return conn
+
+
+# ✅ 1️⃣ 토큰화 (한글: 조사 제거 + 음절 bigram / 영문·숫자: 소문자 단어)
+def strip_suffix(word: str) -> str:
+    for suffix in KOREAN_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text: str) -> list:
+    tokens = []
+    for word in re.findall(r"[가-힣]+|[a-z0-9]+(?:\.[0-9]+)?", text.lower()):
+        if not ("가" <= word[0] <= "힣"):
+            tokens.append(word)
+            continue
+        stem = strip_suffix(word)
+        tokens.append(stem)
+        if len(stem) > 2:
+            tokens.extend(stem[i:i + 2] for i in range(len(stem) - 1))  # 복합명사 부분 일치용 ("잿빛곰팡이병" → "곰팡")
+    return tokens
+
+
+# ✅ 2️⃣ 색인 추가/삭제
+def add_documents(doc_ids: list, texts: list, filename: str):
+    rows_docs, rows_postings = [], []
+    for doc_id, text in zip(doc_ids, texts):
+        counts = Counter(tokenize(text))
+        rows_docs.append((doc_id, filename, sum(counts.values())))
+        rows_postings.extend((term, doc_id, tf) for term, tf in counts.items())
+
+    with _write_lock:
+        conn = get_connection()
+        placeholders = ",".join("?" * len(doc_ids))
+        conn.execute(f"DELETE FROM postings WHERE doc_id IN ({placeholders})", doc_ids)  # 같은 id 재색인 대비
+        conn.executemany("INSERT OR REPLACE INTO docs (doc_id, filename, length) VALUES (?, ?, ?)", rows_docs)
+        conn.executemany("INSERT OR REPLACE INTO postings (term, doc_id, tf) VALUES (?, ?, ?)", rows_postings)
+        conn.commit()
+
+
+def remove_file(filename: str):
+    with _write_lock:
+        conn = get_connection()
+        conn.execute("DELETE FROM postings WHERE doc_id IN (SELECT doc_id FROM docs WHERE filename = ?)", (filename,))
+        conn.execute("DELETE FROM docs WHERE filename = ?", (filename,))
+        conn.commit()
+
+
+def remove_documents(doc_ids: list):
+    """파일 재업로드로 사라진 조각만 제거"""
+    if not doc_ids:
+        return
+    with _write_lock:
+        conn = get_connection()
+        placeholders = ",".join("?" * len(doc_ids))
+        conn.execute(f"DELETE FROM postings WHERE doc_id IN ({placeholders})", doc_ids)
+        conn.execute(f"DELETE FROM docs WHERE doc_id IN ({placeholders})", doc_ids)
+        conn.commit()
+
+
+def document_count() -> int:
+    return get_connection().execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+
+def rebuild_from_collection(collection, page_size: int = 1000):
+    """기존 ChromaDB 컬렉션 내용으로 색인 재구성 (색인 도입 전 업로드된 문서용)"""
+    offset = 0
+    while True:
+        page = collection.get(include=["documents", "metadatas"], limit=page_size, offset=offset)
+        if not page["ids"]:
+            break
+        by_file = {}
+        for doc_id, doc, meta in zip(page["ids"], page["documents"], page["metadatas"]):
+            doc_ids, texts = by_file.setdefault((meta or {}).get("filename", ""), ([], []))
+            doc_ids.append(doc_id)
+            texts.append(doc or "")
+        for filename, (doc_ids, texts) in by_file.items():
+            add_documents(doc_ids, texts, filename)
+        offset += len(page["ids"])
+    print(f"🔤 BM25 색인 재구성 완료: {offset}개 문서")
+
+
+# ✅ 3️⃣ BM25 검색 → [(doc_id, score)] 점수 내림차순
+def search(query: str, top_k: int = 40) -> list:
+    terms = list(dict.fromkeys(tokenize(query)))
+    if not terms:
+        return []
+
+    conn = get_connection()
+    total_docs, total_length = conn.execute("SELECT COUNT(*), COALESCE(SUM(length), 0) FROM docs").fetchone()
+    if not total_docs:
+        return []
+    avg_length = total_length / total_docs
+
+    placeholders = ",".join("?" * len(terms))
+    rows = conn.execute(
+        f"SELECT p.term, p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON p.doc_id = d.doc_id WHERE p.term IN ({placeholders})",
+        terms,
+    ).fetchall()
+
+    doc_freq = Counter(term for term, *_ in rows)
+    scores = Counter()
+    for term, doc_id, tf, length in rows:
+        idf = math.log(1 + (total_docs - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+        scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+
+    return scores.most_common(top_k)
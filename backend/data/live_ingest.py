@@ -0,0 +1,171 @@
+import re
+import time
+import datetime
+import threading
+import pandas as pd
+from data import sensor_store, graph
+from core.answer_cache import answer_cache
+from core.config import LIVE_FLUSH_INTERVAL, LIVE_BATCH_ROWS, LIVE_QUEUE_ROWS
+
+# ✅ 실시간 센서 수집 (요청마다 바로 쓰지 않고 메모리에 모았다가 주기적으로 한 번에 저장)
+#    - 소스(센서 장치)별 테이블: live-{source}
+#    - 저장 후 시계열 집계 증분 갱신 + 센서 데이터 답변 캐시 무효화 → 오늘 데이터/대시보드에 바로 반영
+
+SOURCE_PATTERN = re.compile(r"^[\w.-]{1,64}$")
+DATE_KEY = "date"  # 날짜가 없는 측정값은 서버 수신 시각으로 채움
+SCALAR_TYPES = (str, int, float, bool, type(None))  # 테이블 한 칸에 들어갈 수 있는 값
+MAX_FLUSH_RETRIES = 3  # 같은 소스 저장이 연속으로 이만큼 실패하면 대기 행을 버리고 dropped로 집계
+
+
+class QueueFull(Exception):
+    """저장 대기 행이 상한을 넘음 (저장 속도보다 빠르게 들어오는 경우)"""
+
+
+def live_filename(source: str) -> str:
+    return f"live-{source}"
+
+
+def normalize_readings(readings: list) -> list:
+    """측정값 목록 검증 → 날짜를 채운 dict 목록 (숫자 날짜는 epoch 초로 해석)"""
+    now = datetime.datetime.now().strftime(sensor_store.DATE_FORMAT)
+    rows = []
+    for reading in readings:
+        if not isinstance(reading, dict) or not reading:
+            raise ValueError("측정값은 {컬럼: 값} 형식이어야 합니다.")
+        bad = [key for key, value in reading.items() if not isinstance(value, SCALAR_TYPES)]
+        if bad:
+            raise ValueError(f"측정값은 숫자/문자열이어야 합니다. (컬럼: {', '.join(map(str, bad))})")
+        row = dict(reading)
+        value = row.get(DATE_KEY)
+        if value is None:
+            row[DATE_KEY] = now
+        elif isinstance(value, (int, float)):
+            row[DATE_KEY] = datetime.datetime.fromtimestamp(value).strftime(sensor_store.DATE_FORMAT)
+        rows.append(row)
+    return rows
+
+
+class LiveIngestor:
+    """📡 측정값 버퍼 + 백그라운드 저장 스레드 (flush_interval마다 또는 batch_rows만큼 쌓이면 저장)"""
+
+    def __init__(self, flush_interval: float = LIVE_FLUSH_INTERVAL, batch_rows: int = LIVE_BATCH_ROWS,
+                 queue_rows: int = LIVE_QUEUE_ROWS):
+        self.flush_interval = flush_interval
+        self.batch_rows = batch_rows
+        self.queue_rows = queue_rows
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._pending = {}  # 파일명 → 행 목록
+        self._pending_rows = 0
+        self._oldest = None  # 대기 중인 가장 오래된 행의 수신 시각
+        self._failures = {}  # 파일명 → 연속 저장 실패 횟수
+        self._thread = None
+        self._running = False
+        self.stats = {"received": 0, "written": 0, "rejected": 0, "dropped": 0, "flushes": 0, "errors": 0,
+                      "last_flush_ms": 0.0, "max_flush_ms": 0.0, "last_lag_ms": 0.0, "max_lag_ms": 0.0}
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="live-ingest")
+        self._thread.start()
+
+    def stop(self):
+        """저장 스레드 종료 (남은 행은 저장)"""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def submit(self, source: str, readings: list) -> int:
+        """측정값을 버퍼에 추가 → 받은 행 수 (대기 행이 상한을 넘으면 QueueFull)"""
+        if not SOURCE_PATTERN.match(source or ""):
+            raise ValueError("source는 영문/숫자/._- 로 된 64자 이하 이름이어야 합니다.")
+        rows = normalize_readings(readings)
+        with self._cond:
+            if self._pending_rows + len(rows) > self.queue_rows:
+                self.stats["rejected"] += len(rows)
+                raise QueueFull(f"저장 대기 중인 행이 너무 많습니다. ({self._pending_rows}행)")
+            self._pending.setdefault(live_filename(source), []).extend(rows)
+            self._pending_rows += len(rows)
+            self._oldest = self._oldest or time.perf_counter()
+            self.stats["received"] += len(rows)
+            if self._pending_rows >= self.batch_rows:
+                self._cond.notify()
+        return len(rows)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._running and self._pending_rows < self.batch_rows:
+                    self._cond.wait(self.flush_interval)
+                if not self._running:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"❌ 실시간 센서 데이터 저장 실패: {e}")
+
+    def flush(self) -> int:
+        """버퍼를 비우고 파일별로 한 번에 저장 → 저장한 행 수"""
+        with self._flush_lock:
+            with self._cond:
+                pending, oldest = self._pending, self._oldest
+                self._pending, self._pending_rows, self._oldest = {}, 0, None
+            if not pending:
+                return 0
+
+            start = time.perf_counter()
+            written = 0
+            for filename, rows in pending.items():  # 소스별로 따로 저장 (한 소스 실패가 다른 소스 행을 버리지 않도록)
+                try:
+                    sensor_store.append_rows(filename, pd.DataFrame(rows))
+                except Exception as e:
+                    self._requeue(filename, rows, oldest, e)
+                    continue
+                self._failures.pop(filename, None)
+                written += len(rows)
+                try:
+                    table = graph.find_table(filename)
+                    if table:
+                        graph.update_rollups(table)
+                except Exception as e:  # 행은 저장됨 → 집계만 다음 저장 때 다시 갱신
+                    self.stats["errors"] += 1
+                    print(f"❌ 실시간 센서 집계 갱신 실패 ({filename}): {e}")
+            if written:
+                answer_cache.invalidate("data_files")
+
+            now = time.perf_counter()
+            flush_ms, lag_ms = (now - start) * 1000, (now - oldest) * 1000
+            self.stats.update(written=self.stats["written"] + written, flushes=self.stats["flushes"] + 1,
+                              last_flush_ms=round(flush_ms, 1), last_lag_ms=round(lag_ms, 1),
+                              max_flush_ms=round(max(self.stats["max_flush_ms"], flush_ms), 1),
+                              max_lag_ms=round(max(self.stats["max_lag_ms"], lag_ms), 1))
+            return written
+
+    def _requeue(self, filename: str, rows: list, oldest: float, error: Exception):
+        """저장 실패 → 대기 행 맨 앞에 되돌림 (연속 MAX_FLUSH_RETRIES번 실패하면 버리고 dropped로 집계)"""
+        self.stats["errors"] += 1
+        failures = self._failures[filename] = self._failures.get(filename, 0) + 1
+        if failures >= MAX_FLUSH_RETRIES:
+            self._failures.pop(filename)
+            self.stats["dropped"] += len(rows)
+            print(f"❌ 실시간 센서 데이터 저장 {failures}회 실패 → {filename} {len(rows)}행 버림: {error}")
+            return
+        print(f"⚠️ 실시간 센서 데이터 저장 실패 ({filename}, {failures}회) → 다음 저장 때 재시도: {error}")
+        with self._cond:
+            self._pending[filename] = rows + self._pending.get(filename, [])
+            self._pending_rows += len(rows)
+            self._oldest = min(self._oldest or oldest, oldest)
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            return {**self.stats, "pending": self._pending_rows, "running": self._running}
+
+
+live_ingestor = LiveIngestor()
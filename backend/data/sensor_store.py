@@ -0,0 +1,427 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+import warnings
+import datetime
+import pandas as pd
+from core.config import STORAGE_DIR
+
+# ✅ 센서 데이터 저장소 (SQLite, 파일별 테이블에 컬럼 타입 그대로 저장 + 날짜 인덱스)
+SENSOR_DB_PATH = os.path.join(STORAGE_DIR, "sensor_data.db")
+
+# ✅ 날짜 컬럼 후보 리스트 (자동 감지)
+POSSIBLE_DATE_COLUMNS = ["date", "날짜", "조사일자", "측정일", "기록일", "등록일", "실험일", "time", "시간", "일시"]
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"  # 날짜 컬럼 저장 형식 (문자열 비교 = 시간 순서)
+
+_local = threading.local()
+_write_lock = threading.Lock()
+
+
+def get_connection() -> sqlite3.Connection:
+    """스레드별 SQLite 연결 (WAL 모드 → 읽기와 쓰기 동시 진행)"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(SENSOR_DB_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(SENSOR_DB_PATH, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS sensor_tables (
+                table_name TEXT PRIMARY KEY,
+                filename TEXT UNIQUE NOT NULL,
+                columns TEXT NOT NULL,
+                date_column TEXT,
+                row_count INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        if "stats" not in {row[1] for row in conn.execute("PRAGMA table_info(sensor_tables)")}:
+            conn.execute("ALTER TABLE sensor_tables ADD COLUMN stats TEXT")  # 업로드 시 계산한 컬럼 통계 (JSON)
+        _local.conn = conn
+    return conn
+
+
+def quote(name: str) -> str:
+    """SQLite 식별자 인용 (한글/공백 컬럼명 지원)"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def table_name_for(filename: str) -> str:
+    return "sensor_" + hashlib.sha1(filename.encode("utf-8")).hexdigest()[:16]
+
+
+def parse_dates(series: pd.Series) -> pd.Series:
+    """날짜 문자열 → datetime (형식이 섞여 있으면 항목별로 해석, 실패 시 NaT)"""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            return pd.to_datetime(series, errors="coerce", format="mixed")
+        except (TypeError, ValueError):
+            return pd.to_datetime(series, errors="coerce")
+
+
+# ✅ 1️⃣ 날짜 컬럼 자동 감지 (컬럼명이 후보인 컬럼 → 나머지 컬럼 순서, 표본 값이 날짜여야 함, 저장 시 한 번만 실행)
+def looks_like_dates(series: pd.Series) -> bool:
+    """숫자가 아닌 값 대부분(90% 이상)이 날짜로 해석되는지 ("일조시간", "runtime" 같은 숫자 컬럼 제외)"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return True
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return False  # 숫자 컬럼은 날짜로 보지 않음
+    return len(series) > 0 and parse_dates(series).notna().mean() >= 0.9
+
+
+def detect_date_column(df: pd.DataFrame, sample_size: int = 200):
+    sample = df.head(sample_size)
+    named = [col for col in sample.columns if any(keyword in str(col).lower() for keyword in POSSIBLE_DATE_COLUMNS)]
+    for col in named + [col for col in sample.columns if col not in named]:
+        if looks_like_dates(sample[col]):
+            return col
+    return None
+
+
+# ✅ 2️⃣ 데이터프레임 저장 (같은 파일명이면 테이블 교체)
+class TableWriter:
+    """🗄️ 큰 파일을 청크 단위로 저장 (임시 테이블에 추가 → commit() 시 기존 테이블과 교체)
+
+    - 날짜 컬럼은 첫 청크에서 한 번만 감지
+    - 뒤 청크에 새 컬럼이 나오면 (JSON 등) 테이블에 컬럼 추가
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.table = table_name_for(filename)
+        self.loading_table = self.table + "_loading"
+        self.columns = []
+        self.date_column = None
+        self.rows = 0
+
+    def append(self, df: pd.DataFrame) -> pd.DataFrame:
+        """청크 저장 → 날짜 컬럼이 정규화된 DataFrame 반환"""
+        df = df.copy()
+        df.columns = [str(col) for col in df.columns]
+        first = not self.columns
+        if first:
+            self.date_column = detect_date_column(df)
+        if self.date_column and self.date_column in df.columns:
+            df[self.date_column] = parse_dates(df[self.date_column]).dt.strftime(DATE_FORMAT)
+
+        with _write_lock:
+            conn = get_connection()
+            if first:
+                conn.execute(f"DROP TABLE IF EXISTS {quote(self.loading_table)}")
+            for col in df.columns:
+                if not first and col not in self.columns:
+                    conn.execute(f"ALTER TABLE {quote(self.loading_table)} ADD COLUMN {quote(col)}")
+            df.to_sql(self.loading_table, conn, if_exists="append", index=False, chunksize=50000)
+            conn.commit()
+
+        self.columns.extend(col for col in df.columns if col not in self.columns)
+        self.rows += len(df)
+        return df
+
+    def commit(self) -> dict:
+        with _write_lock:
+            conn = get_connection()
+            conn.execute(f"DROP TABLE IF EXISTS {quote(self.table)}")
+            if not self.columns:  # 빈 파일
+                conn.execute("DELETE FROM sensor_tables WHERE table_name = ?", (self.table,))
+                conn.commit()
+                return {"table": self.table, "rows": 0, "date_column": None}
+            conn.execute(f"ALTER TABLE {quote(self.loading_table)} RENAME TO {quote(self.table)}")
+            if self.date_column:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {quote(self.table + '_date')} ON {quote(self.table)} ({quote(self.date_column)})")
+            stats = column_stats(self.table, self.columns, self.date_column)
+            conn.execute(
+                "INSERT OR REPLACE INTO sensor_tables (table_name, filename, columns, date_column, row_count, created_at, stats) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.table, self.filename, json.dumps(self.columns, ensure_ascii=False), self.date_column, self.rows, time.time(),
+                 json.dumps(stats, ensure_ascii=False)),
+            )
+            conn.commit()
+
+        print(f"🗄️ 센서 데이터 저장: {self.filename} → {self.table} ({self.rows}행, 날짜 컬럼: {self.date_column})")
+        return {"table": self.table, "rows": self.rows, "date_column": self.date_column}
+
+    def abort(self):
+        with _write_lock:
+            conn = get_connection()
+            conn.execute(f"DROP TABLE IF EXISTS {quote(self.loading_table)}")
+            conn.commit()
+
+
+def store_dataframe(filename: str, df: pd.DataFrame) -> dict:
+    writer = TableWriter(filename)
+    writer.append(df)
+    return writer.commit()
+
+
+def append_rows(filename: str, df: pd.DataFrame) -> dict:
+    """📥 실시간 수집 행을 기존 테이블 끝에 추가 (테이블이 없으면 새로 생성)
+
+    - 테이블 버전(created_at)은 그대로 → 오늘 데이터 캐시/시계열 집계는 새 행(rowid)만 읽음
+    - 업로드 시 계산한 컬럼 통계도 새 행만으로 갱신
+    """
+    table = table_name_for(filename)
+    conn = get_connection()
+    row = conn.execute("SELECT columns, date_column, row_count, stats FROM sensor_tables WHERE table_name = ?", (table,)).fetchone()
+    if row is None:
+        return store_dataframe(filename, df)
+
+    columns, date_column, row_count = json.loads(row[0]), row[1], row[2]
+    stats = json.loads(row[3]) if row[3] else None
+    df = df.copy()
+    df.columns = [str(col) for col in df.columns]
+    if date_column and date_column in df.columns:
+        df[date_column] = parse_dates(df[date_column]).dt.strftime(DATE_FORMAT)
+
+    with _write_lock:
+        for col in df.columns:
+            if col not in columns:  # 새 센서 → 숫자면 REAL 컬럼으로 추가 (시계열 집계 대상)
+                col_type = "REAL" if pd.api.types.is_numeric_dtype(df[col]) else "TEXT"
+                conn.execute(f"ALTER TABLE {quote(table)} ADD COLUMN {quote(col)} {col_type}")
+                columns.append(col)
+        df.to_sql(table, conn, if_exists="append", index=False)
+        if stats:
+            stats = _merge_stats(stats, df, _column_types(table), date_column)
+        conn.execute("UPDATE sensor_tables SET columns = ?, row_count = ?, stats = ? WHERE table_name = ?",
+                     (json.dumps(columns, ensure_ascii=False), row_count + len(df),
+                      json.dumps(stats, ensure_ascii=False) if stats else None, table))
+        conn.commit()
+    return {"table": table, "rows": len(df), "date_column": date_column}
+
+
+def _merge_stats(stats: dict, df: pd.DataFrame, types: dict, date_column) -> dict:
+    """기존 테이블 통계 + 새 행 → 전체 통계 (행 수로 가중 평균)"""
+    stats["rows"] += len(df)
+    if date_column and date_column in df.columns:
+        dates = df[date_column].dropna()
+        if len(dates):
+            stats["first"] = min(filter(None, [stats["first"], dates.min()]))
+            stats["last"] = max(filter(None, [stats["last"], dates.max()]))
+    for col in df.columns:
+        values = df[col].dropna()
+        stat = stats["columns"].setdefault(col, {"count": 0})
+        if types.get(col) in ("INTEGER", "REAL") and col != date_column and len(values):
+            values = pd.to_numeric(values, errors="coerce").dropna()
+            if len(values):
+                total = stat.get("mean", 0.0) * stat["count"] + float(values.sum())
+                stat["min"] = min(filter(lambda v: v is not None, [stat.get("min"), values.min().item()]))
+                stat["max"] = max(filter(lambda v: v is not None, [stat.get("max"), values.max().item()]))
+                stat["mean"] = round(total / (stat["count"] + len(values)), 2)
+        stat["count"] += len(values)
+    return stats
+
+
+def drop_file(filename: str):
+    """파일 삭제 시 센서 테이블 제거"""
+    with _write_lock:
+        conn = get_connection()
+        table = table_name_for(filename)
+        conn.execute(f"DROP TABLE IF EXISTS {quote(table)}")
+        conn.execute("DELETE FROM sensor_tables WHERE table_name = ?", (table,))
+        conn.commit()
+
+
+# ✅ 3️⃣ 조회
+def list_tables() -> list:
+    rows = get_connection().execute(
+        "SELECT table_name, filename, columns, date_column, row_count, stats FROM sensor_tables ORDER BY created_at"
+    ).fetchall()
+    return [
+        {"table": table, "filename": filename, "columns": json.loads(columns), "date_column": date_column, "rows": row_count,
+         "stats": json.loads(stats) if stats else None}
+        for table, filename, columns, date_column, row_count, stats in rows
+    ]
+
+
+def all_column_names() -> list:
+    names = []
+    for table in list_tables():
+        names.extend(col for col in table["columns"] if col not in names)
+    return names
+
+
+def _column_types(table: str) -> dict:
+    return {name: (col_type or "").upper() for _, name, col_type, *_ in get_connection().execute(f"PRAGMA table_info({quote(table)})")}
+
+
+def _ensure_index(table: str, column: str):
+    """값 조건으로 자주 조회되는 컬럼에 인덱스 생성 (처음 조회할 때 한 번, 파일을 다시 올리면 테이블과 함께 재생성)"""
+    index = f"{table}_{hashlib.sha1(column.encode('utf-8')).hexdigest()[:8]}"
+    conn = get_connection()
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index,)).fetchone():
+        return
+    with _write_lock:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {quote(index)} ON {quote(table)} ({quote(column)})")
+        conn.commit()
+
+
+def _where(table: dict, filters: dict, types: dict) -> tuple:
+    """컬럼 필터 → (WHERE 절, 파라미터) (값 조건 컬럼은 인덱스 사용)"""
+    clauses, params = [], []
+    for col, value in filters.items():
+        if value is None:
+            clauses.append(f"{quote(col)} IS NOT NULL")
+            continue
+        if types.get(col) in ("INTEGER", "REAL", "TEXT"):
+            _ensure_index(table["table"], col)
+            clauses.append(f"{quote(col)} = ?")
+            params.append(float(value) if types[col] != "TEXT" else str(value))
+        else:  # 타입이 정해지지 않은 컬럼 (JSON 뒤 청크에서 추가된 컬럼 등)
+            clauses.append(f"CAST({quote(col)} AS TEXT) = ?")
+            params.append(str(value))
+    return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def query_rows(filters: dict, limit: int = 1000) -> list:
+    """컬럼 필터({컬럼: 값 또는 None})로 모든 센서 테이블 조회 → 행 dict 목록 (최대 limit + 1행)
+
+    - 값이 있으면 같은 값인 행, None이면 해당 컬럼 값이 있는 행만 반환
+    - 필터 컬럼이 없는 테이블은 건너뜀 (필터가 비어 있으면 전체 테이블 대상)
+    """
+    conn = get_connection()
+    results = []
+    for table in list_tables():
+        if filters and not all(col in table["columns"] for col in filters):
+            continue
+
+        where, params = _where(table, filters, _column_types(table["table"]))
+        remaining = limit + 1 - len(results)
+        cursor = conn.execute(f"SELECT * FROM {quote(table['table'])} {where} LIMIT ?", (*params, remaining))
+        columns = [description[0] for description in cursor.description]
+        results.extend({col: value for col, value in zip(columns, row) if value is not None} for row in cursor)
+
+        if len(results) > limit:
+            break
+    return results
+
+
+def _aggregate(table: str, columns: list, numeric: list, date_column, where: str = "", params: list = ()) -> dict:
+    """조건에 맞는 행의 개수/기간 + 컬럼별 값 개수, 숫자 컬럼 최소/최대/평균 (한 번의 SQL)"""
+    selects = ["COUNT(*)"]
+    if date_column:
+        selects += [f"MIN({quote(date_column)})", f"MAX({quote(date_column)})"]
+    selects += [f"COUNT({quote(col)})" for col in columns]
+    for col in numeric:
+        selects += [f"MIN({quote(col)})", f"MAX({quote(col)})", f"AVG({quote(col)})"]
+    values = iter(get_connection().execute(f"SELECT {', '.join(selects)} FROM {quote(table)} {where}", params).fetchone())
+
+    result = {"rows": next(values), "first": None, "last": None, "columns": {}}
+    if date_column:
+        result["first"], result["last"] = next(values), next(values)
+    for col in columns:
+        result["columns"][col] = {"count": next(values)}
+    for col in numeric:
+        low, high, mean = next(values), next(values), next(values)
+        if mean is not None:
+            result["columns"][col].update(min=low, max=high, mean=round(mean, 2))
+    return result
+
+
+def column_stats(table: str, columns: list, date_column) -> dict:
+    """업로드 시 한 번 계산해 두는 전체 테이블 통계 (조건 없는 요약 질문은 테이블을 다시 읽지 않음)"""
+    types = _column_types(table)
+    numeric = [col for col in columns if types.get(col) in ("INTEGER", "REAL") and col != date_column]
+    return _aggregate(table, columns, numeric, date_column)
+
+
+def summarize(filters: dict, sample_rows: int = 5, start=None, end=None) -> list:
+    """📊 컬럼 필터에 맞는 행을 테이블별로 집계 (행을 읽어오지 않고 SQLite에서 계산)
+
+    - start/end: 날짜 컬럼이 [start, end) 범위인 행만 집계 (날짜 컬럼이 없는 테이블은 제외)
+    - 필터가 행을 줄이지 않으면 (값 조건 없음 + 빈 값 없는 컬럼) 업로드 시 계산한 통계 사용
+
+    → [{"filename", "rows", "date_column", "first", "last", "sensors": {컬럼: {"min", "max", "mean", "latest"}},
+        "recent": 최근 행 dict 목록 (최대 sample_rows개)}] (조건에 맞는 행이 없는 테이블은 제외)
+    """
+    conn = get_connection()
+    summaries = []
+    for table in list_tables():
+        if filters and not all(col in table["columns"] for col in filters):
+            continue
+        date_column = table["date_column"]
+        if start is not None and not date_column:
+            continue
+
+        types = _column_types(table["table"])
+        where, params = _where(table, filters, types)
+        if start is not None:
+            where += (" AND " if where else "WHERE ") + f"{quote(date_column)} >= ? AND {quote(date_column)} < ?"
+            params += list(_date_bounds(start, end))
+
+        stats = table["stats"]
+        if not (stats and start is None and all(
+                value is None and stats["columns"].get(col, {}).get("count") == stats["rows"] for col, value in filters.items())):
+            numeric = [col for col in table["columns"] if types.get(col) in ("INTEGER", "REAL") and col != date_column]
+            stats = _aggregate(table["table"], table["columns"], numeric, date_column, where, params)
+        if not stats["rows"]:
+            continue
+
+        order = f"{quote(date_column)} DESC" if date_column else "rowid DESC"
+        cursor = conn.execute(f"SELECT * FROM {quote(table['table'])} {where} ORDER BY {order} LIMIT ?",
+                              (*params, max(1, sample_rows)))
+        columns = [description[0] for description in cursor.description]
+        recent = [{col: value for col, value in zip(columns, row) if value is not None} for row in cursor]
+
+        sensors = {}
+        for col, stat in stats["columns"].items():
+            if "mean" in stat:
+                latest = next((row[col] for row in recent if col in row), None)
+                sensors[col] = {"min": stat["min"], "max": stat["max"], "mean": stat["mean"], "latest": latest}
+
+        summaries.append({"filename": table["filename"], "rows": stats["rows"], "date_column": date_column,
+                          "first": stats["first"], "last": stats["last"], "sensors": sensors,
+                          "recent": recent[:sample_rows]})
+    return summaries
+
+
+# ✅ 4️⃣ 날짜 범위 조회 (날짜 인덱스 사용 → 해당 기간 행만 읽음)
+def _date_bounds(start, end) -> tuple:
+    """date/datetime/문자열 → 저장 형식 문자열 경계 [start, end)"""
+    def to_text(value):
+        if isinstance(value, str):
+            value = pd.to_datetime(value)
+        if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+            value = datetime.datetime.combine(value, datetime.time())
+        return value.strftime(DATE_FORMAT)
+    return to_text(start), to_text(end)
+
+
+def query_date_range(start, end, limit: int = None, after_rowids: dict = None) -> list:
+    """날짜 컬럼이 [start, end) 범위인 행 조회 → [(테이블 정보, rowid, 행 dict)]
+
+    - after_rowids: {테이블명: rowid} 이후에 추가된 행만 조회 (증분 갱신용)
+    """
+    start_text, end_text = _date_bounds(start, end)
+    conn = get_connection()
+    results = []
+    for table in list_tables():
+        date_column = table["date_column"]
+        if not date_column:
+            continue
+
+        sql = f"SELECT rowid, * FROM {quote(table['table'])} WHERE {quote(date_column)} >= ? AND {quote(date_column)} < ?"
+        params = [start_text, end_text]
+        if after_rowids and table["table"] in after_rowids:
+            sql += " AND rowid > ?"
+            params.append(after_rowids[table["table"]])
+        sql += f" ORDER BY {quote(date_column)}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit - len(results))
+
+        cursor = conn.execute(sql, params)
+        columns = [description[0] for description in cursor.description][1:]
+        for rowid, *values in cursor:
+            results.append((table, rowid, {col: value for col, value in zip(columns, values) if value is not None}))
+
+        if limit is not None and len(results) >= limit:
+            break
+    return results
+
+
+def table_versions() -> dict:
+    """테이블별 버전(생성 시각) → 파일이 다시 업로드되면 값이 바뀜"""
+    return dict(get_connection().execute("SELECT table_name, created_at FROM sensor_tables").fetchall())
@@ -1,67 +1,61 @@
-import chromadb
-import pandas as pd
 import datetime
-from sentence_transformers import SentenceTransformer
+import threading
 from typing import List, Dict
-
-# ✅ ChromaDB 클라이언트 설정
-chroma_client = chromadb.HttpClient(host="localhost", port=8000)
-collection = chroma_client.get_or_create_collection(name="data_files")  # ChromaDB 컬렉션
-
-# ✅ 날짜 컬럼 후보 리스트 (자동 감지)
-POSSIBLE_DATE_COLUMNS = ["date", "날짜", "조사일자", "측정일", "기록일", "등록일", "실험일"]
+from data import sensor_store
 
 # ✅ 오늘 날짜 가져오기
 def get_today_date() -> str:
     return datetime.datetime.now().strftime("%Y-%m-%d")
 
-# ✅ 날짜 컬럼 자동 감지 함수
-def detect_date_column(df: pd.DataFrame) -> str:
-    """데이터프레임에서 날짜 형식의 컬럼을 자동으로 감지"""
-    for col in df.columns:
-        if any(keyword in col.lower() for keyword in POSSIBLE_DATE_COLUMNS):  # ✅ 컬럼명 매칭
-            return col
-
-    # ✅ 데이터 유형이 날짜 형식인 컬럼 찾기
-    for col in df.columns:
-        try:
-            pd.to_datetime(df[col])
-            return col  # 변환 가능하면 날짜 컬럼으로 판단
-        except Exception:
-            continue
-
-    return None  # 날짜 컬럼 없음
-
-# ✅ ChromaDB에서 오늘 날짜 데이터 검색
+# ✅ 오늘 데이터 캐시 (새로 추가된 행만 증분 조회)
+_today_lock = threading.Lock()
+_today_cache = {
+    "date": None,  # 캐시 기준 날짜
+    "versions": {},  # 테이블별 버전 (파일 재업로드/삭제 감지)
+    "last_rowids": {},  # 테이블별 마지막으로 읽은 rowid
+    "rows": [],  # (테이블명, 날짜 값, 행 문자열)
+}
+
+def format_row(row: Dict) -> str:
+    """행 dict → LLM이 이해할 수 있는 "컬럼: 값" 문자열"""
+    return ", ".join(f"{k}: {v}" for k, v in row.items())
+
+def refresh_today_cache():
+    """오늘 날짜 데이터 증분 갱신 (날짜가 바뀌거나 테이블이 교체되면 전체 재조회)"""
+    today = get_today_date()
+    versions = sensor_store.table_versions()
+
+    if _today_cache["date"] != today or any(
+        _today_cache["versions"].get(table) not in (None, version) for table, version in versions.items()
+    ) or set(_today_cache["versions"]) - set(versions):
+        _today_cache.update(date=today, versions={}, last_rowids={}, rows=[])
+
+    start = datetime.date.fromisoformat(today)
+    new_rows = sensor_store.query_date_range(start, start + datetime.timedelta(days=1),
+                                             after_rowids=_today_cache["last_rowids"])
+    for table, rowid, row in new_rows:
+        _today_cache["rows"].append((table["table"], row.get(table["date_column"], ""), format_row(row)))
+        _today_cache["last_rowids"][table["table"]] = max(rowid, _today_cache["last_rowids"].get(table["table"], 0))
+    if new_rows:
+        _today_cache["rows"].sort(key=lambda item: item[1])
+    _today_cache["versions"] = versions
+
+# ✅ 센서 저장소에서 오늘 날짜 데이터 검색 (날짜 인덱스 사용)
 def get_today_data() -> List[str]:
     try:
-        # ✅ ChromaDB에서 전체 데이터 가져오기
-        raw_data = collection.get()["documents"]
-
-        if not raw_data:
-            return []  # ✅ 데이터가 없으면 빈 리스트 반환
-
-        # ✅ 데이터를 JSON 형태로 변환
-        processed_data = [dict(entry.split(": ") for entry in doc.split(", ")) for doc in raw_data]
-        df = pd.DataFrame(processed_data)
-
-        # ✅ 날짜 컬럼 자동 감지
-        date_column = detect_date_column(df)
-
-        if not date_column:
+        tables = sensor_store.list_tables()
+        if tables and not any(table["date_column"] for table in tables):
             return ["❌ 날짜 컬럼을 찾을 수 없습니다."]
 
-        # ✅ 날짜 형식 변환 및 필터링
-        df[date_column] = pd.to_datetime(df[date_column], errors="coerce")  # 변환 실패 시 NaT 처리
-        df = df.dropna(subset=[date_column])  # NaT 값 제거
-
-        today_date = pd.to_datetime(get_today_date())
-        today_data = df[df[date_column].dt.date == today_date.date()]
-
-        # ✅ 데이터를 LLM이 이해할 수 있는 형식으로 변환
-        retrieved_docs = [", ".join(f"{k}: {v}" for k, v in row.items()) for row in today_data.to_dict(orient="records")]
-
-        return retrieved_docs if retrieved_docs else []  # ✅ LLM이 이해할 수 있도록 변환
+        with _today_lock:
+            refresh_today_cache()
+            return [text for _, _, text in _today_cache["rows"]]
+    except Exception as e:
+        return [f"❌ 오류 발생: {str(e)}"]
 
+# ✅ 임의 기간 데이터 검색 ([start, end) 범위)
+def get_range_data(start: str, end: str, limit: int = 1000) -> List[str]:
+    try:
+        return [format_row(row) for _, _, row in sensor_store.query_date_range(start, end, limit=limit)]
     except Exception as e:
         return [f"❌ 오류 발생: {str(e)}"]
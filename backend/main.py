@@ -1,11 +1,27 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse
 import os
-import chromadb
+import time
+import json
+import threading
 from pydantic import BaseModel
-from agents.agent import query_dual_agent
-from data.file_handler import process_uploaded_file
-from data.today_data import get_today_data
+from agents.agent import query_dual_agent, stream_dual_agent, get_streaming_stats
+from data.file_handler import register_file_hash, spool_upload
+from data.jobs import IngestJobManager
+from data import sensor_store, lexical_index, ingest_index, graph
+from data.today_data import get_today_data, get_range_data
+from data.live_ingest import live_ingestor, QueueFull
+from agents.router import get_router_stats
+from agents.rag_tool import get_rag_stats
+from agents.web_search import web_searcher
+from core.concurrency import run_blocking
+from core.answer_cache import answer_cache
+from core.config import WARMUP_MODELS, LLM_WARMUP
+from core.registry import get_collection, warm_up, warm_up_llms
+from core.llm_scheduler import llm_scheduler
+from core import context_compressor
+from core import query_embeddings, tracing
 
 app = FastAPI()
 
@@ -18,13 +34,74 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ✅ ChromaDB 설정
-chroma_client = chromadb.HttpClient(host="localhost", port=8000)
-collection_documents = chroma_client.get_or_create_collection(name="documents")
-collection_data_files = chroma_client.get_or_create_collection(name="data_files")
+# ✅ HTTP 요청 지연 시간 (경로는 매칭된 라우트 기준 → /timeseries/{filename}처럼 묶어서 기록)
+@app.middleware("http")
+async def record_request_latency(request, call_next):
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    tracing.HTTP_SECONDS.observe(time.perf_counter() - start, method=request.method,
+                                 path=route.path if route else "unmatched", status=response.status_code)
+    return response
+
+# ✅ ChromaDB 컬렉션/임베딩 모델은 core.registry에서 처음 사용할 때 로드 (빠른 서버 시작)
+
+# ✅ 업로드 작업 큐 (임베딩/저장은 워커 스레드에서 처리)
+job_manager = IngestJobManager()
+
+@app.on_event("startup")
+async def warm_up_models():
+    """🔥 WARMUP_MODELS=1이면 서버는 바로 응답하고, 모델 로드는 백그라운드에서 미리 진행"""
+    if WARMUP_MODELS:
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+@app.on_event("startup")
+async def warm_up_ollama_models():
+    """🦙 LLM_WARMUP=1이면 Ollama 모델을 백그라운드에서 미리 메모리에 올림 (첫 채팅의 모델 로드 대기 제거)"""
+    if LLM_WARMUP:
+        threading.Thread(target=warm_up_llms, name="llm-warm-up", daemon=True).start()
+
+@app.on_event("startup")
+async def recover_ingest_jobs():
+    """🔁 서버 재시작 시 미완료 업로드 작업 재개"""
+    job_manager.recover()
+
+@app.on_event("startup")
+async def build_lexical_index():
+    """🔤 BM25 색인이 비어 있으면 기존 documents 컬렉션으로 백그라운드 재구성"""
+    def rebuild():
+        try:
+            if lexical_index.document_count() == 0:
+                lexical_index.rebuild_from_collection(get_collection("documents"))
+        except Exception as e:
+            print(f"❌ BM25 색인 재구성 오류: {e}")
+    threading.Thread(target=rebuild, name="lexical-index", daemon=True).start()
+
+@app.on_event("startup")
+async def build_file_catalog():
+    """📂 카탈로그 도입 전에 저장된 파일을 백그라운드에서 한 번만 카탈로그에 등록"""
+    def sync():
+        for name in ("documents", "data_files"):
+            try:
+                ingest_index.sync_catalog(get_collection(name), name)
+            except Exception as e:
+                print(f"❌ 파일 카탈로그 동기화 오류 ({name}): {e}")
+    threading.Thread(target=sync, name="file-catalog", daemon=True).start()
+
+@app.on_event("startup")
+async def start_live_ingest():
+    """📡 실시간 센서 데이터 저장 스레드 시작"""
+    live_ingestor.start()
+
+@app.on_event("shutdown")
+async def stop_ingest_jobs():
+    job_manager.shutdown()
+    live_ingestor.stop()
+    web_searcher.close()
 
 class ChatRequest(BaseModel):
     message: str
+    include_stages: bool = True  # 스트리밍 시 context 단계 이벤트 포함 여부
     
 @app.post("/chat")
 async def chat(request: ChatRequest):
@@ -39,43 +116,132 @@ async def chat(request: ChatRequest):
     
     return {"response": response}
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """📡 응답 토큰을 생성되는 즉시 SSE(text/event-stream)로 전송"""
+    print("💬 사용자 입력 (스트리밍):", request.message)
+
+    async def event_stream():
+        async for event in stream_dual_agent(request.message, include_stages=request.include_stages):
+            yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/chat/stream/stats")
+async def chat_stream_stats():
+    """⏱️ 스트리밍 응답의 첫 토큰 지연(TTFT) 통계"""
+    return get_streaming_stats()
+
+@app.get("/router/stats")
+async def router_stats():
+    """🚦 사전 라우터 적중률 및 평균 지연 시간"""
+    return get_router_stats()
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """💾 답변 캐시 적중률 및 절약된 응답 시간"""
+    return answer_cache.get_stats()
+
+@app.get("/embeddings/stats")
+async def embedding_stats():
+    """🧮 질문 임베딩 캐시 적중률 및 채팅당 평균 인코딩 횟수"""
+    return query_embeddings.get_stats()
+
+@app.get("/llm/stats")
+async def llm_stats():
+    """🦙 모델별 생성 대기 시간, 모델 교체/재로드 횟수, 현재 올라와 있는 모델"""
+    return llm_scheduler.get_stats()
+
+@app.get("/context/stats")
+async def context_stats():
+    """🗜️ 응답 모델에 넘긴 컨텍스트 압축 통계 (요청당 평균 토큰 수, 압축 전 → 후)"""
+    return context_compressor.get_stats()
+
+@app.get("/rag/stats")
+async def rag_stats():
+    """📚 요청당 문서 컨텍스트 토큰 수 (재정렬/예산 적용 전후) 및 재정렬 캐시 적중률"""
+    return get_rag_stats()
+
+# ✅ 기존 통계도 /metrics에서 gauge로 함께 노출
+tracing.register_gauges("smartfarm_router", get_router_stats)
+tracing.register_gauges("smartfarm_answer_cache", answer_cache.get_stats)
+tracing.register_gauges("smartfarm_query_embeddings", query_embeddings.get_stats)
+tracing.register_gauges("smartfarm_rag", get_rag_stats)
+tracing.register_gauges("smartfarm_llm", llm_scheduler.get_stats)
+tracing.register_gauges("smartfarm_context", context_compressor.get_stats)
+tracing.register_gauges("smartfarm_streaming", get_streaming_stats)
+tracing.register_gauges("smartfarm_live_ingest", live_ingestor.get_stats)
+
+@app.get("/metrics")
+async def metrics():
+    """📈 Prometheus 지표 (채팅/단계별/HTTP 지연 히스토그램, LLM 토큰 수, 에이전트 반복 횟수, 각종 통계)"""
+    return PlainTextResponse(tracing.render_metrics(), media_type=tracing.CONTENT_TYPE)
+
+@app.get("/traces")
+async def traces(limit: int = 20, min_sec: float = 0.0):
+    """🧾 최근 채팅의 단계별 처리 시간 (min_sec 이상 걸린 요청만, 최신순)"""
+    return tracing.get_traces(limit, min_sec)
+
 @app.post("/upload")
 async def upload_file(file: UploadFile = File(...)):
-    """📂 모든 파일 업로드 가능 + CSV/JSON은 별도 컬렉션에 저장"""
-    
-    file_ext = file.filename.split(".")[-1].lower()
-    
-    if file_ext in ["csv", "json"]:
-        return await process_uploaded_file(file, collection_documents, collection_data_files)  # ✅ CSV/JSON → data_files 컬렉션
-    else:
-        return await process_uploaded_file(file, collection_documents, collection_data_files)  # ✅ 기타 파일 → documents 컬렉션
+    """📂 모든 파일 업로드 가능 → 즉시 접수 후 백그라운드 작업으로 임베딩 (CSV/JSON은 별도 컬렉션)"""
+    # ✅ 업로드를 조각 단위로 디스크에 저장하면서 해시 계산 (파일 전체를 메모리에 올리지 않음)
+    upload_path = job_manager.incoming_path()
+    try:
+        file_hash = await spool_upload(file, upload_path)
+        register_file_hash(file_hash)  # 중복 업로드 방지
+    except Exception:
+        os.remove(upload_path)
+        raise
+    job = job_manager.submit(file.filename, upload_path, file_hash)
 
+    return {"message": f"📥 {file.filename} 업로드 접수 완료! (작업 ID: {job['id']})", "job_id": job["id"]}
 
-@app.get("/files")
-async def get_uploaded_files():
-    """📂 ChromaDB에서 일반 문서와 CSV/JSON 파일 목록을 조회"""
-    try:
-        # ✅ 일반 문서 컬렉션에서 파일 조회
-        doc_results = collection_documents.get()
-        data_results = collection_data_files.get()
+@app.get("/jobs")
+async def list_jobs():
+    """📦 업로드 작업 목록 조회"""
+    return job_manager.list()
 
-        # ✅ 파일 목록 추출 함수
-        def extract_filenames(results):
-            if not results or "metadatas" not in results or not results["metadatas"]:
-                return []
-            return list(set(
-                meta["filename"] for meta in results["metadatas"] if isinstance(meta, dict) and "filename" in meta
-            ))
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """📦 업로드 작업 상태 조회 (상태, 처리된 조각 수, 예상 남은 시간)"""
+    job = job_manager.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
 
-        doc_files = extract_filenames(doc_results)
-        data_files = extract_filenames(data_results)
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """⏹ 대기 중이거나 실행 중인 업로드 작업 취소"""
+    job = job_manager.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=409, detail="취소할 수 있는 작업이 아닙니다.")
+    return job
 
-        print(f"📂 일반 문서 파일 목록: {doc_files}")
-        print(f"📊 CSV/JSON 파일 목록: {data_files}")
+@app.post("/jobs/{job_id}/resume")
+async def resume_job(job_id: str):
+    """🔁 취소/실패한 업로드 작업 재개 (이미 저장된 조각은 건너뜀)"""
+    job = job_manager.resume(job_id)
+    if not job:
+        raise HTTPException(status_code=409, detail="재개할 수 있는 작업이 아닙니다.")
+    return job
 
+@app.get("/files")
+async def get_uploaded_files(collection: str = None, offset: int = 0, limit: int = 100):
+    """📂 파일 카탈로그에서 일반 문서와 CSV/JSON 파일 목록을 조회 (최근 업로드 순, offset/limit 페이지 단위)"""
+    if collection not in (None, "documents", "data_files"):
+        raise HTTPException(status_code=400, detail="collection은 documents 또는 data_files만 가능합니다.")
+    limit = max(1, min(limit, 1000))
+    try:
+        files = ingest_index.list_files(collection, max(0, offset), limit)
         return {
-            "documents": doc_files,  # ✅ 일반 문서 파일
-            "data_files": data_files  # ✅ CSV/JSON 파일
+            "documents": [f["filename"] for f in files if f["collection"] == "documents"],  # ✅ 일반 문서 파일
+            "data_files": [f["filename"] for f in files if f["collection"] == "data_files"],  # ✅ CSV/JSON 파일
+            "files": files,  # ✅ 조각 수, 크기, 해시, 업로드 시각
+            "total": ingest_index.count_files(collection),
+            "offset": offset,
+            "limit": limit,
         }
     except Exception as e:
         print(f"❌ 파일 목록 조회 오류: {e}")
@@ -86,7 +252,10 @@ async def delete_document(filename: str):
     """📂 ChromaDB에서 특정 문서 삭제"""
     try:
         # ✅ documents 컬렉션에서 삭제
-        collection_documents.delete(where={"filename": filename})
+        get_collection("documents").delete(where={"filename": filename})
+        lexical_index.remove_file(filename)  # ✅ BM25 색인에서도 제거
+        ingest_index.remove_file(filename)  # ✅ 재업로드 시 처음부터 다시 저장
+        answer_cache.invalidate("documents")
         print(f"🗑 문서 삭제 완료: {filename}")
         return {"message": f"문서 '{filename}' 삭제 완료"}
     except Exception as e:
@@ -97,7 +266,11 @@ async def delete_document(filename: str):
 async def delete_file(filename: str):
     """📂 서버에서 파일 삭제"""
     try:
-        collection_data_files.delete(where={"filename": filename})
+        get_collection("data_files").delete(where={"filename": filename})
+        sensor_store.drop_file(filename)  # ✅ 센서 저장소 테이블도 함께 삭제
+        graph.drop_rollups(filename)
+        ingest_index.remove_file(filename)
+        answer_cache.invalidate("data_files")
         print(f"🗑 파일 삭제 완료: {filename}")
         return {"message": f"파일 '{filename}' 삭제 완료"}
         
@@ -109,7 +282,64 @@ async def delete_file(filename: str):
 @app.get("/today")
 async def today_data_api():
     """ChromaDB에서 오늘 날짜 데이터 반환"""
-    return get_today_data()
+    return await run_blocking("tool", get_today_data)
+
+@app.get("/data/range")
+async def range_data_api(start: str, end: str, limit: int = 1000):
+    """센서 저장소에서 [start, end) 기간 데이터 반환 (예: start=2025-01-01&end=2025-01-08)"""
+    return await run_blocking("tool", get_range_data, start, end, limit)
+
+@app.get("/timeseries")
+async def timeseries_list():
+    """📈 시계열로 볼 수 있는 센서 파일 목록 (센서 컬럼, 기간)"""
+    return await run_blocking("tool", graph.list_series)
+
+@app.get("/timeseries/latest")
+async def timeseries_latest(filename: str = None):
+    """🕒 센서별 마지막 측정값"""
+    return await run_blocking("tool", graph.latest_values, filename)
+
+@app.get("/timeseries/{filename}")
+async def timeseries(filename: str, sensors: str = None, start: str = None, end: str = None,
+                     interval: str = "auto", rolling: int = 0):
+    """📈 미리 계산한 집계로 [start, end) 구간 시계열 반환 (interval=1m|1h|1d|auto, rolling=N → 이동 평균/표준편차)"""
+    return await run_blocking("tool", graph.query_series, filename, sensors.split(",") if sensors else None,
+                              start, end, interval, rolling)
+
+class SensorBatch(BaseModel):
+    source: str  # 센서 장치 이름 → live-{source} 테이블에 저장
+    readings: list[dict]  # [{"date": ..., "온도": 24.1, ...}] (date가 없으면 수신 시각)
+
+@app.post("/sensors/ingest")
+async def ingest_sensor_batch(batch: SensorBatch):
+    """📡 실시간 센서 측정값 수신 (버퍼에 모았다가 LIVE_FLUSH_INTERVAL마다 한 번에 저장)"""
+    try:
+        accepted = live_ingestor.submit(batch.source, batch.readings)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except QueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {"accepted": accepted}
+
+@app.websocket("/sensors/ws/{source}")
+async def ingest_sensor_stream(websocket: WebSocket, source: str):
+    """📡 WebSocket으로 측정값 연속 수신 (메시지 = 측정값 1개 또는 목록, 메시지마다 받은 행 수 응답)"""
+    await websocket.accept()
+    try:
+        while True:
+            message = await websocket.receive_json()
+            readings = message if isinstance(message, list) else [message]
+            try:
+                await websocket.send_json({"accepted": live_ingestor.submit(source, readings)})
+            except (ValueError, QueueFull) as e:
+                await websocket.send_json({"error": str(e)})
+    except WebSocketDisconnect:
+        pass
+
+@app.get("/sensors/stats")
+async def sensor_ingest_stats():
+    """📊 실시간 수집 통계 (받은/저장한 행 수, 저장 지연 시간, 대기 행 수)"""
+    return live_ingestor.get_stats()
     
 if __name__ == "__main__":
     import uvicorn
@@ -2,22 +2,107 @@
 "use client";
 
 import Link from "next/link";
+import { useEffect, useState } from "react";
 import styles from "./page.module.css";
+import SensorChart from "../../components/SensorChart";
+
+const API = "http://localhost:7000";
+const INTERVALS = ["auto", "1m", "1h", "1d"];
+const LIVE_REFRESH_MS = 2000; // 실시간 수집 파일(live-*)은 주기적으로 다시 조회
+
+type SeriesInfo = { filename: string; sensors: string[]; first: string | null; last: string | null };
+type Latest = { filename: string; sensors: Record<string, { ts: string; value: number }> };
+type TimeSeries = {
+  interval: string;
+  ts: string[];
+  series: Record<string, { mean: (number | null)[]; min: (number | null)[]; max: (number | null)[]; rolling_mean?: (number | null)[] }>;
+};
 
 export default function Page() {
+  const [files, setFiles] = useState<SeriesInfo[]>([]);
+  const [selected, setSelected] = useState<string>("");
+  const [bucket, setBucket] = useState<string>("auto");
+  const [latest, setLatest] = useState<Latest | null>(null);
+  const [data, setData] = useState<TimeSeries | null>(null);
+  const [tick, setTick] = useState(0);
+
+  // ✅ 시계열로 볼 수 있는 센서 파일 목록
+  useEffect(() => {
+    fetch(`${API}/timeseries`)
+      .then((response) => response.json())
+      .then((list: SeriesInfo[]) => {
+        setFiles(list);
+        if (list.length) setSelected(list[0].filename);
+      })
+      .catch((error) => console.error("❌ 시계열 목록을 불러오는 중 오류 발생:", error));
+  }, []);
+
+  // ✅ 실시간 수집 파일을 보고 있으면 LIVE_REFRESH_MS마다 다시 조회
+  useEffect(() => {
+    if (!selected.startsWith("live-")) return;
+    const timer = setInterval(() => setTick((value) => value + 1), LIVE_REFRESH_MS);
+    return () => clearInterval(timer);
+  }, [selected]);
+
+  // ✅ 선택한 파일의 센서별 최신값 + 집계 시계열 (서버에서 미리 계산한 집계 사용)
+  useEffect(() => {
+    if (!selected) return;
+    const name = encodeURIComponent(selected);
+    fetch(`${API}/timeseries/latest?filename=${name}`)
+      .then((response) => response.json())
+      .then((list: Latest[]) => setLatest(list[0] || null))
+      .catch((error) => console.error("❌ 최신값을 불러오는 중 오류 발생:", error));
+    fetch(`${API}/timeseries/${name}?interval=${bucket}&rolling=24`)
+      .then((response) => response.json())
+      .then((result) => setData(result.error ? null : result))
+      .catch((error) => console.error("❌ 시계열을 불러오는 중 오류 발생:", error));
+  }, [selected, bucket, tick]);
+
   return (
     <div className={styles.page}>
       <div className={styles.topRightNav}>
         <Link href="/" className={styles.homeLink}>🏠 홈으로</Link>
       </div>
       <h1 className="text-2xl font-bold">모니터링</h1>
-      <nav className={styles.nav}>
-        <ul>
-          
-          
-        </ul>
-      </nav>
+
+      {files.length ? (
+        <div className="flex flex-col gap-4 w-full max-w-3xl">
+          <div className="flex gap-3">
+            <select value={selected} onChange={(e) => setSelected(e.target.value)} className="px-3 py-2 rounded-md shadow">
+              {files.map((file) => (
+                <option key={file.filename} value={file.filename}>{file.filename}</option>
+              ))}
+            </select>
+            <select value={bucket} onChange={(e) => setBucket(e.target.value)} className="px-3 py-2 rounded-md shadow">
+              {INTERVALS.map((value) => (
+                <option key={value} value={value}>{value}</option>
+              ))}
+            </select>
+          </div>
+
+          {/* ✅ 센서별 최신값 */}
+          {latest && (
+            <div className="flex flex-wrap gap-3">
+              {Object.entries(latest.sensors).map(([sensor, { ts, value }]) => (
+                <div key={sensor} className="px-3 py-2 bg-white rounded-md shadow text-sm">
+                  <div className="font-semibold">{sensor}: {value}</div>
+                  <div className="text-xs text-gray-500">{ts}</div>
+                </div>
+              ))}
+            </div>
+          )}
+
+          {/* ✅ 센서별 차트 (평균 + 최소/최대 + 24구간 이동 평균) */}
+          {data &&
+            Object.entries(data.series).map(([sensor, series]) => (
+              <SensorChart key={sensor} name={`${sensor} (${data.interval})`} ts={data.ts} series={series} />
+            ))}
+        </div>
+      ) : (
+        <p className="text-gray-700">📊 날짜 컬럼이 있는 센서 데이터 파일을 업로드하면 그래프가 표시됩니다.</p>
+      )}
+
       <footer className={styles.footer}>© 2025 OlLama Chatbot. All rights reserved.</footer>
     </div>
   );
-}
\ No newline at end of file
+}
@@ -8,6 +8,7 @@ export default function Chat({ onGraphGenerated }: { onGraphGenerated?: (graphDa
   const [messages, setMessages] = useState<{ role: string; content: string; graph?: string }[]>([]);
   const [input, setInput] = useState("");
   const [isLoading, setIsLoading] = useState(false);
+  const [loadingText, setLoadingText] = useState("⏳ 응답 생성 중...");
   const [isListening, setIsListening] = useState(false);
   const [recognition, setRecognition] = useState<any | null>(null);
   const [useRAG, setUseRAG] = useState(false);
@@ -43,7 +44,7 @@ export default function Chat({ onGraphGenerated }: { onGraphGenerated?: (graphDa
     }
   };
 
-  // ✅ 메시지 전송 함수
+  // ✅ 메시지 전송 함수 (SSE 스트리밍으로 토큰을 받는 즉시 화면에 표시)
   const sendMessage = async () => {
     if (!input.trim()) return;
 
@@ -53,31 +54,55 @@ export default function Chat({ onGraphGenerated }: { onGraphGenerated?: (graphDa
     setMessages(newMessages);
     setInput("");
     setIsLoading(true);
+    setLoadingText("⏳ 관련 정보 검색 중...");
+
+    let answer = "";
+    const showAnswer = (content: string) =>
+      setMessages([...newMessages, { role: "assistant", content }]);
 
     try {
-      const response = await axios.post("http://localhost:7000/chat", {
-        message: input,
-        use_rag: useRAG
+      const response = await fetch("http://localhost:7000/chat/stream", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ message: input, include_stages: true }),
       });
+      if (!response.ok || !response.body) {
+        throw new Error(`HTTP ${response.status}`);
+      }
 
-      if (response.data.graph) {
-        setMessages([
-          ...newMessages,
-          { role: "assistant", content: response.data.response, graph: response.data.graph }
-        ]);
-
-        // ✅ 그래프 데이터를 부모(Home.tsx)로 전달하여 표시
-        if (onGraphGenerated) {
-          onGraphGenerated(response.data.graph);
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // ✅ SSE 이벤트는 빈 줄("\n\n")로 구분
+        const events = buffer.split("\n\n");
+        buffer = events.pop() ?? "";
+
+        for (const raw of events) {
+          if (!raw.startsWith("data: ")) continue;
+          const event = JSON.parse(raw.slice(6));
+
+          if (event.type === "stage" && event.status === "done") {
+            setLoadingText("⏳ 응답 생성 중...");
+          } else if (event.type === "token") {
+            if (!answer) setIsLoading(false);
+            answer += event.text;
+            showAnswer(answer);
+          } else if (event.type === "error") {
+            answer = event.message;
+            showAnswer(answer);
+          } else if (event.type === "done") {
+            console.log(`⏱️ TTFT ${event.ttft_sec}s / 전체 ${event.total_sec}s`);
+          }
         }
-      } else {
-        setMessages([
-          ...newMessages,
-          { role: "assistant", content: response.data.response }
-        ]);
       }
 
-      speak(response.data.response);
+      if (answer) speak(answer);
     } catch (error) {
       console.error("Error sending message:", error);
     } finally {
@@ -148,7 +173,7 @@ export default function Chat({ onGraphGenerated }: { onGraphGenerated?: (graphDa
             )}
           </div>
         ))}
-        {isLoading && <div className={styles.loadingMessage}>⏳ 응답 생성 중...</div>}
+        {isLoading && <div className={styles.loadingMessage}>{loadingText}</div>}
       </div>
         
       {/* 입력 및 버튼 영역 */}
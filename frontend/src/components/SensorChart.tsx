@@ -0,0 +1,67 @@
+"use client";
+
+type SensorSeries = {
+  mean: (number | null)[];
+  min: (number | null)[];
+  max: (number | null)[];
+  rolling_mean?: (number | null)[];
+};
+
+const WIDTH = 640;
+const HEIGHT = 180;
+const PADDING = 24;
+
+// ✅ 값 배열 → SVG 좌표 문자열 (값이 없는 구간은 선을 끊음)
+function toPaths(values: (number | null)[], low: number, high: number): string[] {
+  const paths: string[] = [];
+  let current: string[] = [];
+  const step = values.length > 1 ? (WIDTH - PADDING * 2) / (values.length - 1) : 0;
+  values.forEach((value, i) => {
+    if (value === null) {
+      if (current.length) paths.push(current.join(" "));
+      current = [];
+      return;
+    }
+    const x = PADDING + i * step;
+    const y = HEIGHT - PADDING - ((value - low) / (high - low || 1)) * (HEIGHT - PADDING * 2);
+    current.push(`${x.toFixed(1)},${y.toFixed(1)}`);
+  });
+  if (current.length) paths.push(current.join(" "));
+  return paths;
+}
+
+export default function SensorChart({ name, ts, series }: { name: string; ts: string[]; series: SensorSeries }) {
+  const known = [...series.min, ...series.max].filter((v): v is number => v !== null);
+  if (!known.length) {
+    return <p className="text-gray-500">📈 {name}: 데이터가 없습니다.</p>;
+  }
+  const low = Math.min(...known);
+  const high = Math.max(...known);
+
+  return (
+    <div className="bg-white p-4 rounded-lg shadow-md w-full">
+      <h3 className="text-md font-semibold mb-2">📈 {name}</h3>
+      <svg viewBox={`0 0 ${WIDTH} ${HEIGHT}`} className="w-full h-auto">
+        {toPaths(series.max, low, high).map((points, i) => (
+          <polyline key={`max-${i}`} points={points} fill="none" stroke="#fca5a5" strokeWidth={1} />
+        ))}
+        {toPaths(series.min, low, high).map((points, i) => (
+          <polyline key={`min-${i}`} points={points} fill="none" stroke="#93c5fd" strokeWidth={1} />
+        ))}
+        {toPaths(series.mean, low, high).map((points, i) => (
+          <polyline key={`mean-${i}`} points={points} fill="none" stroke="#16a34a" strokeWidth={1.5} />
+        ))}
+        {series.rolling_mean &&
+          toPaths(series.rolling_mean, low, high).map((points, i) => (
+            <polyline key={`rolling-${i}`} points={points} fill="none" stroke="#111827" strokeWidth={1} strokeDasharray="4 3" />
+          ))}
+        <text x={PADDING} y={14} fontSize={11} fill="#6b7280">{high}</text>
+        <text x={PADDING} y={HEIGHT - 6} fontSize={11} fill="#6b7280">{low}</text>
+      </svg>
+      <div className="flex justify-between text-xs text-gray-500">
+        <span>{ts[0]}</span>
+        <span>{ts[ts.length - 1]}</span>
+      </div>
+    </div>
+  );
+}